@@ -0,0 +1 @@
+"""Standalone benchmarks for the ML service runtime."""
@@ -0,0 +1,69 @@
+"""
+Camera open time with and without a probe cache entry.
+
+For each camera index, the cache entry is dropped and the camera opened
+cold (every backend tried in order until one delivers a frame), then
+reopened `--runs` times with the cache pointing at the backend that worked.
+Reports per index:
+- backend: the backend that opened the camera
+- cold ms / attempts: the first open, walking the backend list
+- cached ms / attempts: median of the reopens, starting on the cached backend
+
+The cache used is a temporary copy, so the live
+`ml/config/camera_probe_cache.json` is untouched. Indices without a camera
+report the time spent failing, which is what enumeration pays per empty
+index when its failed probe has expired.
+
+Usage:
+    python -m ml.benchmarks.camera_open
+    python -m ml.benchmarks.camera_open --indices 0 1 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from ml.runtime.camera_manager import CameraManager
+from ml.runtime.camera_probe_cache import CameraProbeCache
+
+
+def _open_once(camera_index: int, probe_cache: CameraProbeCache) -> dict[str, Any]:
+    manager = CameraManager(camera_index=camera_index, probe_cache=probe_cache)
+    try:
+        manager.open()
+        return manager.get_open_stats()
+    finally:
+        manager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--indices", type=int, nargs="+", default=[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'index':>5} {'backend':<10} {'cold ms':>9} {'attempts':>8} "
+        f"{'cached ms':>10} {'attempts':>8} {'speed-up':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        probe_cache = CameraProbeCache(Path(directory) / "camera_probe_cache.json")
+        for camera_index in args.indices:
+            probe_cache.forget(camera_index)
+            cold = _open_once(camera_index, probe_cache)
+            cached = [_open_once(camera_index, probe_cache) for _ in range(max(1, args.runs))]
+            cached_ms = statistics.median(stats["open_ms"] for stats in cached)
+            backend = cold.get("backend_name", "none") if cold.get("ok") else "none"
+            print(
+                f"{camera_index:>5} {backend:<10} {cold['open_ms']:>9.1f} {cold['attempts']:>8} "
+                f"{cached_ms:>10.1f} {cached[-1]['attempts']:>8} "
+                f"{cold['open_ms'] / max(cached_ms, 1e-3):>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
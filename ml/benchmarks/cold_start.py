@@ -0,0 +1,149 @@
+"""
+Cold-start timeline of the ML service, from process spawn to first gesture.
+
+Each run spawns `ml/service.py` the way the engine does, connects as soon as
+the socket accepts, and timestamps (relative to spawn):
+
+- connect: the command socket accepted a connection
+- each warm-start component (camera, hand tracking, models) the first time
+  a `starting` status reports it finished
+- ready: the first `ready` status
+- first gesture: the first gesture event. Hold a gesture in front of the
+  camera during the run; without one this is reported as missing after
+  `--gesture-timeout` seconds
+
+The service's own timeline from GET_METRICS (seconds since its module
+loaded, including `first_frame`) is printed for the last run.
+
+Usage:
+    python -m ml.benchmarks.cold_start --runs 3 --gesture-timeout 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from ml.runtime.command_server import LineDecoder
+
+ML_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _send_command(conn: socket.socket, payload: dict[str, Any]) -> None:
+    conn.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+
+
+def _connect(port: int, started: float, timeout: float) -> tuple[socket.socket, float]:
+    deadline = started + timeout
+    while True:
+        try:
+            conn = socket.create_connection(("127.0.0.1", port), timeout=0.5)
+            return conn, time.monotonic() - started
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"service did not accept connections within {timeout:.0f}s")
+            time.sleep(0.01)
+
+
+def _run_once(port: int, gesture_timeout: float, start_timeout: float) -> dict[str, Any]:
+    env = dict(os.environ)
+    env["SPIDER_ML_SERVICE_PORT"] = str(port)
+    env.setdefault("SPIDER_ML_LOG_CONSOLE_LEVEL", "ERROR")
+    started = time.monotonic()
+    process = subprocess.Popen([sys.executable, "service.py"], cwd=ML_ROOT, env=env)
+    events: dict[str, float] = {}
+    metrics: dict[str, Any] | None = None
+    try:
+        conn, events["connect"] = _connect(port, started, start_timeout)
+        with conn:
+            conn.settimeout(0.2)
+            decoder = LineDecoder()
+            deadline = started + start_timeout
+            metrics_requested = False
+            while metrics is None and time.monotonic() < deadline:
+                settled_at = events.get("ready")
+                if not metrics_requested and (
+                    "first_gesture" in events
+                    or (settled_at is not None and time.monotonic() - started >= settled_at + gesture_timeout)
+                ):
+                    _send_command(conn, {"command": "GET_METRICS"})
+                    metrics_requested = True
+                    deadline = time.monotonic() + 5.0
+                try:
+                    chunk = conn.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                now = time.monotonic() - started
+                for line in decoder.feed(chunk):
+                    try:
+                        message = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    kind = message.get("type")
+                    if kind == "status":
+                        state = message.get("state")
+                        for component, outcome in (message.get("startup") or {}).items():
+                            if outcome != "pending":
+                                events.setdefault(f"{component}_{outcome}", now)
+                        if state == "ready":
+                            events.setdefault("ready", now)
+                        elif state == "error":
+                            events.setdefault(f"error:{message.get('message', '')}", now)
+                    elif kind == "gesture":
+                        events.setdefault("first_gesture", now)
+                    elif kind == "metrics":
+                        metrics = message
+            _send_command(conn, {"command": "SHUTDOWN"})
+    finally:
+        try:
+            process.wait(timeout=10.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return {"events": events, "startup": (metrics or {}).get("startup")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=50595)
+    parser.add_argument("--gesture-timeout", type=float, default=10.0)
+    parser.add_argument("--start-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    runs = [_run_once(args.port, args.gesture_timeout, args.start_timeout) for _ in range(max(1, args.runs))]
+
+    names: list[str] = []
+    for run in runs:
+        for name in sorted(run["events"], key=run["events"].get):
+            if name not in names:
+                names.append(name)
+    print(f"{'event (ms since spawn)':<40} {'median':>9} {'min':>9} {'max':>9} {'runs':>5}")
+    for name in names:
+        values = [run["events"][name] * 1000.0 for run in runs if name in run["events"]]
+        print(
+            f"{name:<40} {statistics.median(values):>9.0f} {min(values):>9.0f} "
+            f"{max(values):>9.0f} {len(values):>5}"
+        )
+    if not any("first_gesture" in run["events"] for run in runs):
+        print(f"first_gesture: none within {args.gesture_timeout:.0f}s of ready (no gesture performed?)")
+
+    startup = runs[-1].get("startup")
+    if startup:
+        print("\nservice timeline, last run (ms since module load):")
+        for name, value in sorted(startup.get("timeline_ms", {}).items(), key=lambda item: item[1]):
+            print(f"  {name:<28} {value:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Latency saved and accuracy cost of committing dynamic gestures early.
+
+Replays recorded dynamic sequences (the CSVs used for training) frame by
+frame through `DynamicPrefixStream` and, for each combination of
+commit confidence and minimum prefix length, reports:
+- early: sequences committed before their last frame
+- wrong: early commits whose label differs from the recorded one
+- accuracy: the label the user would get (the early commit, or else the
+  full-sequence result) against the recording, next to the full-sequence
+  baseline
+- saved: mean frames between the early commit and the end of the sequence,
+  and the same in ms at `--fps`
+
+The recommended setting is the one saving the most frames while losing at
+most `--max-accuracy-loss` against the baseline; it is re-checked through
+real streams. Recordings that were part of the training set give optimistic
+numbers, so calibrate on held-out recordings when there are some.
+
+It also times one frame of the stream against re-running `infer_sequence()`
+on the whole prefix.
+
+Usage:
+    python -m ml.benchmarks.dynamic_early_commit
+    python -m ml.benchmarks.dynamic_early_commit --data-dir ml/data/dynamic/custom \\
+        --model ml/models/dynamic/custom_model.pth --mapping ml/config/user_mapping.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from ml.runtime.dynamic_inference_runner import DynamicInferenceRunner
+from ml.training.train_dynamic import (
+    DEFAULT_MAPPING_PATH,
+    DYNAMIC_DATA_DIR,
+    MODEL_DIR,
+    _label_mapping,
+    _load_dynamic_folder_dataset,
+)
+
+_Trace = list[tuple[int, float]]
+
+
+def _prefix_traces(runner: DynamicInferenceRunner, sequences: list[list[list[float]]]) -> list[_Trace]:
+    """(label id or -1, confidence) of every prefix of every sequence."""
+
+    traces: list[_Trace] = []
+    for sequence in sequences:
+        stream = runner.open_stream(commit_confidence=2.0, min_frames=len(sequence))
+        trace: _Trace = []
+        for frame in sequence:
+            stream.push(frame)
+            result = stream.last_result
+            trace.append((result.label_idx, result.confidence))
+        traces.append(trace)
+    return traces
+
+
+def _commit(trace: _Trace, confidence: float, min_frames: int, stable_frames: int) -> tuple[int, int] | None:
+    """(frames, label id) of the early commit; the same rule as `DynamicPrefixStream.push`."""
+
+    streak_label = -1
+    streak = 0
+    for frames, (label_idx, prefix_confidence) in enumerate(trace[:-1], start=1):
+        if label_idx < 0 or prefix_confidence < confidence:
+            streak_label = -1
+            streak = 0
+            continue
+        streak = streak + 1 if label_idx == streak_label else 1
+        streak_label = label_idx
+        if frames >= min_frames and streak >= stable_frames:
+            return frames, label_idx
+    return None
+
+
+def _evaluate(
+    traces: list[_Trace],
+    labels: list[int],
+    full: list[int],
+    confidence: float,
+    min_frames: int,
+    stable_frames: int,
+) -> dict[str, float]:
+    early = 0
+    wrong = 0
+    correct = 0
+    saved: list[int] = []
+    for trace, label, full_label in zip(traces, labels, full):
+        commit = _commit(trace, confidence, min_frames, stable_frames)
+        if commit is None:
+            correct += full_label == label
+            saved.append(0)
+            continue
+        frames, committed_label = commit
+        early += 1
+        wrong += committed_label != label
+        correct += committed_label == label
+        saved.append(len(trace) - frames)
+    return {
+        "early": float(early),
+        "wrong": float(wrong),
+        "accuracy": correct / len(labels),
+        "saved_frames": statistics.mean(saved),
+    }
+
+
+def _per_frame_us(runner: DynamicInferenceRunner, sequences: list[list[list[float]]]) -> tuple[float, float]:
+    sample = sequences[: min(len(sequences), 20)]
+    frames = sum(len(sequence) for sequence in sample)
+
+    started = time.perf_counter()
+    for sequence in sample:
+        stream = runner.open_stream(commit_confidence=2.0, min_frames=len(sequence))
+        for frame in sequence:
+            stream.push(frame)
+    stream_us = (time.perf_counter() - started) * 1e6 / frames
+
+    started = time.perf_counter()
+    for sequence in sample:
+        for index in range(1, len(sequence) + 1):
+            runner.infer_sequence(sequence[:index])
+    rerun_us = (time.perf_counter() - started) * 1e6 / frames
+    return stream_us, rerun_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DYNAMIC_DATA_DIR / "default")
+    parser.add_argument("--model", type=Path, default=MODEL_DIR / "default_model.pth")
+    parser.add_argument("--mapping", type=Path, default=DEFAULT_MAPPING_PATH)
+    parser.add_argument("--confidence", type=float, nargs="+", default=[0.95, 0.98, 0.99, 0.995])
+    parser.add_argument("--min-frames", type=int, nargs="+", default=[8, 12, 16, 18, 20, 21, 22, 24, 26])
+    parser.add_argument("--stable-frames", type=int, default=2)
+    parser.add_argument("--max-accuracy-loss", type=float, default=0.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    label_map = _label_mapping("dynamic", args.mapping)
+    sequences, labels, _seen, _too_short = _load_dynamic_folder_dataset(args.data_dir, label_map)
+    runner = DynamicInferenceRunner(model_path=str(args.model), label_map=label_map)
+    if runner.open_stream(commit_confidence=1.0, min_frames=1) is None:
+        raise SystemExit(runner.get_last_error() or f"Could not load {args.model}")
+
+    full = [runner.infer_sequence(sequence).label_idx for sequence in sequences]
+    baseline = sum(predicted == label for predicted, label in zip(full, labels)) / len(labels)
+    traces = _prefix_traces(runner, sequences)
+    frame_ms = 1000.0 / args.fps
+
+    print(f"{len(sequences)} sequences from {args.data_dir}; full-sequence accuracy {baseline:.3f}")
+    print(
+        f"{'confidence':>10} {'min frames':>10} {'early':>9} {'wrong':>6} {'accuracy':>9} "
+        f"{'saved fr':>9} {'saved ms':>9}"
+    )
+    best: tuple[float, float, int] | None = None
+    for confidence in args.confidence:
+        for min_frames in args.min_frames:
+            result = _evaluate(traces, labels, full, confidence, min_frames, args.stable_frames)
+            early = f"{int(result['early'])}/{len(sequences)}"
+            print(
+                f"{confidence:>10.3f} {min_frames:>10} {early:>9} {int(result['wrong']):>6} "
+                f"{result['accuracy']:>9.3f} {result['saved_frames']:>9.2f} "
+                f"{result['saved_frames'] * frame_ms:>9.1f}"
+            )
+            if baseline - result["accuracy"] <= args.max_accuracy_loss + 1e-9:
+                if best is None or result["saved_frames"] > best[0]:
+                    best = (result["saved_frames"], confidence, min_frames)
+
+    if best is None:
+        print("\nno setting stays within the accuracy budget; leave early commit off")
+    else:
+        saved, confidence, min_frames = best
+        # Re-check the pick through real streams, not the replayed rule.
+        committed = [
+            next(
+                (
+                    (index, result.label_idx)
+                    for index, frame in enumerate(sequence, start=1)
+                    if (result := stream.push(frame)) is not None
+                ),
+                None,
+            )
+            for sequence in sequences
+            for stream in [runner.open_stream(confidence, min_frames, args.stable_frames)]
+        ]
+        stream_saved = statistics.mean(
+            len(sequence) - commit[0] if commit else 0 for sequence, commit in zip(sequences, committed)
+        )
+        print(
+            f"\nrecommended: SPIDER_ML_DYNAMIC_EARLY_CONF={confidence:g} "
+            f"SPIDER_ML_DYNAMIC_EARLY_MIN_FRAMES={min_frames} "
+            f"(saves {saved:.2f} frames / {saved * frame_ms:.0f} ms per gesture; "
+            f"stream check {stream_saved:.2f} frames)"
+        )
+
+    stream_us, rerun_us = _per_frame_us(runner, sequences)
+    print(f"\nper-frame cost: stream {stream_us:.0f} us, re-running the prefix {rerun_us:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
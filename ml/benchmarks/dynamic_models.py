@@ -0,0 +1,118 @@
+"""
+LSTM versus TCN dynamic gesture models on the same dataset.
+
+Trains each architecture with `train_dynamic_model` (same split, same
+epochs, checkpoints written to a temporary directory so the live models
+are untouched), then reports per model:
+- params: parameter count
+- train s: wall time for the whole training run
+- val acc: validation accuracy from training
+- acc@N: accuracy on the recordings resampled to N frames, through
+  `DynamicInferenceRunner` (recordings include the training split)
+- us@N: median CPU latency of one `infer_sequence()` of N frames
+
+Usage:
+    python -m ml.benchmarks.dynamic_models
+    python -m ml.benchmarks.dynamic_models --epochs 75 --threads 4 --lengths 12 20 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+
+from ml.runtime.dynamic_inference_runner import (
+    DYNAMIC_MODEL_TYPES,
+    DynamicInferenceRunner,
+    load_dynamic_checkpoint,
+)
+from ml.training.train_dynamic import (
+    DEFAULT_MAPPING_PATH,
+    DYNAMIC_DATA_DIR,
+    _label_mapping,
+    _load_dynamic_folder_dataset,
+    _resample,
+    train_dynamic_model,
+)
+
+
+def _latency_us(runner: DynamicInferenceRunner, sequence: list[list[float]], repeats: int) -> float:
+    runner.infer_sequence(sequence)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        runner.infer_sequence(sequence)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model-types", nargs="+", choices=list(DYNAMIC_MODEL_TYPES), default=list(DYNAMIC_MODEL_TYPES))
+    parser.add_argument("--epochs", type=int, default=40)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[12, 30])
+    parser.add_argument("--repeats", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=1, help="torch CPU threads for the latency runs")
+    args = parser.parse_args()
+
+    label_map = _label_mapping("dynamic", DEFAULT_MAPPING_PATH)
+    sequences, labels, _seen, _too_short = _load_dynamic_folder_dataset(DYNAMIC_DATA_DIR / "default", label_map)
+    lengths = [max(1, min(30, length)) for length in args.lengths]
+    resampled = {
+        length: [_resample(torch.tensor(sequence), min(length, len(sequence))).tolist() for sequence in sequences]
+        for length in lengths
+    }
+
+    header = f"{'model':<6} {'params':>8} {'train s':>8} {'val acc':>8}"
+    header += "".join(f" {f'acc@{length}':>8}" for length in lengths)
+    header += "".join(f" {f'us@{length}':>8}" for length in lengths)
+    rows = []
+    training_threads = torch.get_num_threads()
+    with tempfile.TemporaryDirectory() as directory:
+        for model_type in args.model_types:
+            model_path = Path(directory) / f"{model_type}.pth"
+            torch.manual_seed(0)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = train_dynamic_model(
+                    target="default",
+                    epochs=max(1, args.epochs),
+                    model_type=model_type,
+                    model_path=model_path,
+                )
+            train_seconds = time.perf_counter() - started
+
+            runner = DynamicInferenceRunner(model_path=str(model_path), label_map=label_map)
+            state, _header = load_dynamic_checkpoint(model_path)
+            params = sum(tensor.numel() for tensor in state.values())
+            accuracies = [
+                sum(
+                    runner.infer_sequence(sequence).label_idx == label
+                    for sequence, label in zip(resampled[length], labels)
+                ) / len(labels)
+                for length in lengths
+            ]
+            torch.set_num_threads(max(1, args.threads))
+            latencies = [_latency_us(runner, resampled[length][0], max(1, args.repeats)) for length in lengths]
+            torch.set_num_threads(training_threads)
+
+            row = f"{model_type:<6} {params:>8} {train_seconds:>8.1f} {result['val_accuracy']:>8.3f}"
+            row += "".join(f" {accuracy:>8.3f}" for accuracy in accuracies)
+            row += "".join(f" {latency:>8.0f}" for latency in latencies)
+            rows.append(row)
+
+    print(f"{len(sequences)} sequences, {args.epochs} epochs, {args.threads} latency thread(s)")
+    print(header)
+    for row in rows:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
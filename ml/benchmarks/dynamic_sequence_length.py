@@ -0,0 +1,141 @@
+"""
+Throughput of variable-length dynamic sequences against padding to 30 frames.
+
+Reports:
+- inference: `DynamicGestureModel` latency for one sequence of each length,
+  run unpadded (variable-length checkpoints) and padded with its last frame
+  to 30 (legacy checkpoints). The weights are random: only time matters
+- training: sequences per second for one epoch over the recorded
+  sequences plus their speed variants, packed with `pack_padded_sequence`
+  against every row running all 30 steps
+- accuracy: with `--model`, a checkpoint classifies the recordings resampled
+  to each length, as a faster performance of the same gesture, through
+  `DynamicInferenceRunner`; checkpoints of both kinds can be compared
+
+Usage:
+    python -m ml.benchmarks.dynamic_sequence_length
+    python -m ml.benchmarks.dynamic_sequence_length --model ml/models/dynamic/default_model.pth /tmp/variable.pth
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+import torch
+import torch.nn as nn
+
+from ml.runtime.dynamic_inference_runner import DynamicGestureModel, DynamicInferenceRunner
+from ml.training.dynamic_sequences import SEQUENCE_LENGTH
+from ml.training.train_dynamic import (
+    DEFAULT_MAPPING_PATH,
+    DYNAMIC_DATA_DIR,
+    SPEED_VARIANT_LENGTHS,
+    _label_mapping,
+    _load_dynamic_folder_dataset,
+    _pad_sequences,
+    _resample,
+    _speed_variants,
+)
+
+
+def _median_us(run: Callable[[], None], repeats: int) -> float:
+    run()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(timings)
+
+
+def _bench_inference(lengths: list[int], repeats: int) -> None:
+    model = DynamicGestureModel(num_classes=4).eval()
+    print(f"{'frames':>6} {'unpadded us':>12} {'padded us':>10} {'speed-up':>9}")
+    for length in lengths:
+        sequence = torch.randn(1, length, 126)
+        padded = torch.cat([sequence, sequence[:, -1:].expand(1, SEQUENCE_LENGTH - length, 126)], dim=1)
+        with torch.no_grad():
+            unpadded_us = _median_us(lambda: model(sequence), repeats)
+            padded_us = _median_us(lambda: model(padded), repeats)
+        print(f"{length:>6} {unpadded_us:>12.0f} {padded_us:>10.0f} {padded_us / unpadded_us:>8.2f}x")
+
+
+def _bench_training(X: torch.Tensor, lengths: torch.Tensor, y: torch.Tensor, batch_size: int) -> None:
+    variants = _speed_variants(X, lengths, y, list(range(len(y))), SPEED_VARIANT_LENGTHS)
+    if variants is not None:
+        X = torch.cat([X, variants.tensors[0]])
+        lengths = torch.cat([lengths, variants.tensors[1]])
+        y = torch.cat([y, variants.tensors[2]])
+    print(f"\ntraining epoch over {len(y)} sequences (mean {lengths.float().mean():.1f} frames)")
+    print(f"{'mode':>8} {'seq/s':>8} {'epoch s':>8}")
+    for mode in ("padded", "packed"):
+        torch.manual_seed(0)
+        model = DynamicGestureModel(num_classes=int(y.max()) + 1)
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+        criterion = nn.CrossEntropyLoss()
+        order = torch.randperm(len(y))
+        started = time.perf_counter()
+        for start in range(0, len(y), batch_size):
+            batch = order[start : start + batch_size]
+            optimizer.zero_grad()
+            outputs = model(X[batch], lengths[batch] if mode == "packed" else None)
+            criterion(outputs, y[batch]).backward()
+            optimizer.step()
+        elapsed = time.perf_counter() - started
+        print(f"{mode:>8} {len(y) / elapsed:>8.0f} {elapsed:>8.2f}")
+
+
+def _bench_accuracy(
+    paths: list[Path],
+    sequences: list[list[list[float]]],
+    labels: list[int],
+    label_map: dict[int, str],
+    lengths: list[int],
+) -> None:
+    print(f"\n{'checkpoint':<36} {'kind':>8} " + " ".join(f"{length:>6}" for length in lengths))
+    for path in paths:
+        runner = DynamicInferenceRunner(model_path=str(path), label_map=label_map)
+        if runner.get_last_error():
+            print(f"{path.name:<36} {runner.get_last_error()}")
+            continue
+        accuracies = []
+        for length in lengths:
+            correct = 0
+            for sequence, label in zip(sequences, labels):
+                resampled = _resample(torch.tensor(sequence), min(length, len(sequence))).tolist()
+                correct += runner.infer_sequence(resampled).label_idx == label
+            accuracies.append(correct / len(labels))
+        kind = "variable" if runner.is_variable_length() else "padded"
+        print(f"{path.name:<36} {kind:>8} " + " ".join(f"{accuracy:>6.3f}" for accuracy in accuracies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DYNAMIC_DATA_DIR / "default")
+    parser.add_argument("--mapping", type=Path, default=DEFAULT_MAPPING_PATH)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[8, 12, 16, 20, 25, 30])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--model", type=Path, nargs="*", default=[],
+                        help="checkpoints to score on recordings resampled to each length")
+    args = parser.parse_args()
+
+    lengths = [max(1, min(SEQUENCE_LENGTH, length)) for length in args.lengths]
+    torch.set_num_threads(1)
+    _bench_inference(lengths, max(1, args.repeats))
+
+    label_map = _label_mapping("dynamic", args.mapping)
+    sequences, labels, _seen, _too_short = _load_dynamic_folder_dataset(args.data_dir, label_map)
+    X, sequence_lengths = _pad_sequences(sequences)
+    _bench_training(X, sequence_lengths, torch.tensor(labels, dtype=torch.long), max(1, args.batch_size))
+
+    if args.model:
+        _bench_accuracy(args.model, sequences, labels, label_map, lengths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Ping-pong latency of the local IPC transports: TCP, Unix socket, shm ring.
+
+A child process echoes every message back; the parent measures round-trip
+time for a binary gesture record. `--load N` starts N busy processes first so
+the numbers reflect a machine that is also running MediaPipe and inference.
+
+Linux only (Unix sockets, fork, eventfd).
+
+Usage:
+    python -m ml.benchmarks.ipc_transports --rounds 20000 --load 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import socket
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from ml.runtime.shm_ring import ShmRing, create_wakeup_fd
+from ml.runtime.wire_protocol import WireEncoder
+
+_ENCODER = WireEncoder()
+_GESTURE = (
+    {
+        "type": "gesture",
+        "label": "Pinch",
+        "class": "Pinch",
+        "action": "Mode:Volume",
+        "mode": "HAND",
+        "confidence": 1.0,
+        "value": 0.12,
+        "index_tip": {"x": 0.4, "y": 0.5},
+        "thumb_tip": {"x": 0.35, "y": 0.55},
+    }
+)
+# The first encoding carries the string definitions; steady-state traffic is
+# the bare gesture record.
+_ENCODER.encode(_GESTURE)
+_MESSAGE = _ENCODER.encode(_GESTURE)
+
+
+def _busy_loop() -> None:
+    while True:
+        pass
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("peer closed")
+        data += chunk
+    return bytes(data)
+
+
+def _socket_echo(family: int, address: object, ready: multiprocessing.Event) -> None:
+    with socket.socket(family, socket.SOCK_STREAM) as server:
+        if family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(address)
+        server.listen(1)
+        ready.set()
+        conn, _ = server.accept()
+        with conn:
+            if family == socket.AF_INET:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                while True:
+                    conn.sendall(_recv_exact(conn, len(_MESSAGE)))
+            except ConnectionError:
+                return
+
+
+def _bench_socket(family: int, address: object, rounds: int) -> list[float]:
+    ready = multiprocessing.Event()
+    child = multiprocessing.Process(target=_socket_echo, args=(family, address, ready), daemon=True)
+    child.start()
+    ready.wait(5.0)
+    samples: list[float] = []
+    with socket.socket(family, socket.SOCK_STREAM) as conn:
+        conn.connect(address)
+        if family == socket.AF_INET:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for _ in range(rounds):
+            started = time.perf_counter()
+            conn.sendall(_MESSAGE)
+            _recv_exact(conn, len(_MESSAGE))
+            samples.append((time.perf_counter() - started) * 1e6)
+    child.join(timeout=2.0)
+    return samples
+
+
+def _shm_echo(ping_name: str, pong_name: str, ping_fd: int, pong_fd: int, rounds: int) -> None:
+    ping = ShmRing.attach(ping_name, wakeup_fd=ping_fd, shared_tracker=True)
+    pong = ShmRing.attach(pong_name, wakeup_fd=pong_fd, shared_tracker=True)
+    for _ in range(rounds):
+        record = ping.wait(timeout=5.0)
+        if record is None:
+            break
+        pong.push(record)
+    ping.close()
+    pong.close()
+
+
+def _bench_shm(rounds: int) -> list[float]:
+    ping_fd = create_wakeup_fd()
+    pong_fd = create_wakeup_fd()
+    if ping_fd is not None:
+        os.set_inheritable(ping_fd, True)
+    if pong_fd is not None:
+        os.set_inheritable(pong_fd, True)
+    ping = ShmRing.create(wakeup_fd=ping_fd)
+    pong = ShmRing.create(wakeup_fd=pong_fd)
+    child = multiprocessing.Process(
+        target=_shm_echo,
+        args=(ping.name, pong.name, ping_fd, pong_fd, rounds),
+        daemon=True,
+    )
+    child.start()
+    samples: list[float] = []
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            ping.push(_MESSAGE)
+            if pong.wait(timeout=5.0) is None:
+                raise RuntimeError("shm echo timed out")
+            samples.append((time.perf_counter() - started) * 1e6)
+    finally:
+        child.join(timeout=2.0)
+        ping.close()
+        pong.close()
+    return samples
+
+
+def _summarize(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[max(0, int(len(ordered) * 0.99) - 1)]
+    return (
+        f"p50 {statistics.median(ordered):8.1f} us  "
+        f"p99 {p99:8.1f} us  mean {statistics.fmean(ordered):8.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--load", type=int, default=0, help="busy processes to run alongside")
+    parser.add_argument("--port", type=int, default=50655)
+    args = parser.parse_args()
+
+    multiprocessing.set_start_method("fork", force=True)
+    load = [multiprocessing.Process(target=_busy_loop, daemon=True) for _ in range(args.load)]
+    for process in load:
+        process.start()
+
+    uds_path = os.path.join(tempfile.mkdtemp(prefix="octave-ipc-"), "bench.sock")
+    transports: list[tuple[str, Callable[[], list[float]]]] = [
+        ("tcp", lambda: _bench_socket(socket.AF_INET, ("127.0.0.1", args.port), args.rounds)),
+        ("uds", lambda: _bench_socket(socket.AF_UNIX, uds_path, args.rounds)),
+        ("shm", lambda: _bench_shm(args.rounds)),
+    ]
+    try:
+        print(f"{len(_MESSAGE)}-byte message, {args.rounds} round trips, load={args.load}")
+        for name, run in transports:
+            print(f"{name:<4} {_summarize(run())}")
+    finally:
+        for process in load:
+            process.terminate()
+        if os.path.exists(uds_path):
+            os.unlink(uds_path)
+        os.rmdir(os.path.dirname(uds_path))
+
+
+if __name__ == "__main__":
+    main()
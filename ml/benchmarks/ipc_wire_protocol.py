@@ -0,0 +1,163 @@
+"""
+Compare the JSON and binary wire protocols for ML service events.
+
+Measures, for a stream of continuous-control gesture events:
+- encode throughput and bytes per message
+- decode throughput using each protocol's reference decoder
+- one-way delivery latency over a local socket pair
+
+Usage:
+    python -m ml.benchmarks.ipc_wire_protocol --messages 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import statistics
+import threading
+import time
+from typing import Any, Callable
+
+from ml.runtime.command_server import LineDecoder
+from ml.runtime.wire_protocol import WireDecoder, WireEncoder
+
+
+def _sample_payloads(count: int) -> list[dict[str, Any]]:
+    labels = ["Pinch", "Two_Fingers_Extended", "Open_Palm", "Fist"]
+    actions = ["Mode:Volume", "Mode:Scroll", "Mode:Cursor", "Click"]
+    payloads = []
+    for index in range(count):
+        slot = index % len(labels)
+        payloads.append(
+            {
+                "type": "gesture",
+                "label": labels[slot],
+                "class": labels[slot],
+                "mode": "HAND",
+                "confidence": 1.0,
+                "index_tip": {"x": 0.25 + (index % 100) * 0.001, "y": 0.5},
+                "thumb_tip": {"x": 0.2, "y": 0.55 - (index % 50) * 0.001},
+                "action": actions[slot],
+                "value": 0.01 * (index % 7),
+            }
+        )
+    return payloads
+
+
+def _encode_json(payload: dict[str, Any]) -> bytes:
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+def _json_decoder() -> Callable[[bytes], list[dict[str, Any]]]:
+    decoder = LineDecoder()
+    return lambda data: [json.loads(line) for line in decoder.feed(data)]
+
+
+def _binary_decoder() -> Callable[[bytes], list[dict[str, Any]]]:
+    return WireDecoder().feed
+
+
+def _bench_codec(
+    payloads: list[dict[str, Any]],
+    encode: Callable[[dict[str, Any]], bytes],
+    make_decoder: Callable[[], Callable[[bytes], list[dict[str, Any]]]],
+) -> dict[str, float]:
+    started = time.perf_counter()
+    encoded = [encode(payload) for payload in payloads]
+    encode_sec = time.perf_counter() - started
+
+    decode = make_decoder()
+    started = time.perf_counter()
+    decoded = 0
+    for message in encoded:
+        decoded += len(decode(message))
+    decode_sec = time.perf_counter() - started
+    if decoded != len(payloads):
+        raise RuntimeError(f"Decoded {decoded} of {len(payloads)} messages")
+
+    total_bytes = sum(len(message) for message in encoded)
+    return {
+        "encode_msgs_per_sec": len(payloads) / encode_sec,
+        "decode_msgs_per_sec": len(payloads) / decode_sec,
+        "bytes_per_msg": total_bytes / len(payloads),
+    }
+
+
+def _bench_latency(
+    payloads: list[dict[str, Any]],
+    encode: Callable[[dict[str, Any]], bytes],
+    make_decoder: Callable[[], Callable[[bytes], list[dict[str, Any]]]],
+) -> dict[str, float]:
+    """Send one message at a time; measure encode-to-decoded latency."""
+
+    sender, receiver = socket.socketpair()
+    decode = make_decoder()
+    latencies_us: list[float] = []
+    sent_at: list[float] = []
+    received = threading.Event()
+
+    def reader() -> None:
+        done = 0
+        while done < len(payloads):
+            data = receiver.recv(65536)
+            if not data:
+                break
+            for _ in decode(data):
+                latencies_us.append((time.perf_counter() - sent_at[done]) * 1e6)
+                done += 1
+                received.set()
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        for payload in payloads:
+            received.clear()
+            sent_at.append(time.perf_counter())
+            sender.sendall(encode(payload))
+            received.wait(1.0)
+    finally:
+        thread.join(timeout=2.0)
+        sender.close()
+        receiver.close()
+
+    ordered = sorted(latencies_us)
+    return {
+        "latency_p50_us": statistics.median(ordered),
+        "latency_p99_us": ordered[int(len(ordered) * 0.99) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--latency-messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    payloads = _sample_payloads(args.messages)
+    latency_payloads = payloads[: args.latency_messages]
+
+    rows = []
+    for name, make_encode, make_decoder in (
+        ("json", lambda: _encode_json, _json_decoder),
+        ("binary", lambda: WireEncoder().encode, _binary_decoder),
+    ):
+        result = _bench_codec(payloads, make_encode(), make_decoder)
+        result.update(_bench_latency(latency_payloads, make_encode(), make_decoder))
+        rows.append((name, result))
+
+    print(
+        f"{'protocol':<8} {'bytes/msg':>10} {'encode/s':>12} {'decode/s':>12}"
+        f" {'p50 us':>9} {'p99 us':>9}"
+    )
+    for name, result in rows:
+        print(
+            f"{name:<8} {result['bytes_per_msg']:>10.1f}"
+            f" {result['encode_msgs_per_sec']:>12.0f} {result['decode_msgs_per_sec']:>12.0f}"
+            f" {result['latency_p50_us']:>9.1f} {result['latency_p99_us']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
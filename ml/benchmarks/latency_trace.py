@@ -0,0 +1,103 @@
+"""
+Attribute gesture latency to pipeline hops using a running ML service.
+
+Connects to the service, turns on `latency_tracing` so gesture events carry
+their frame trace, and collects events while you perform gestures in front
+of the camera. Each event's monotonic stamps (capture, ingested, inferred,
+sent) are extended with the time this client received it; the service and
+this script must run on the same host for that last hop to be meaningful.
+
+Usage:
+    python -m ml.benchmarks.latency_trace --seconds 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import statistics
+import time
+from typing import Any
+
+from ml.runtime.command_server import LineDecoder
+
+HOPS = (
+    ("capture -> ingested", "capture", "ingested"),
+    ("ingested -> inferred", "ingested", "inferred"),
+    ("inferred -> sent", "inferred", "sent"),
+    ("sent -> received", "sent", "received"),
+    ("capture -> received", "capture", "received"),
+)
+
+
+def _percentile(ordered: list[float], quantile: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, int(round(quantile * len(ordered))) - 1))]
+
+
+def _send_command(conn: socket.socket, payload: dict[str, Any]) -> None:
+    conn.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=50555)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    traces: list[dict[str, Any]] = []
+    metrics: dict[str, Any] | None = None
+    decoder = LineDecoder()
+    with socket.create_connection((args.host, args.port)) as conn:
+        _send_command(conn, {"command": "SUBSCRIBE", "topics": ["gesture", "metrics"]})
+        _send_command(conn, {"command": "SET_SETTINGS", "latency_tracing": True})
+        conn.settimeout(0.5)
+        print(f"Collecting gesture events for {args.seconds:.0f}s...")
+        try:
+            collect_until = time.monotonic() + args.seconds
+            metrics_requested = False
+            give_up_at = collect_until + 5.0
+            while metrics is None and time.monotonic() < give_up_at:
+                if not metrics_requested and time.monotonic() >= collect_until:
+                    _send_command(conn, {"command": "GET_METRICS"})
+                    metrics_requested = True
+                try:
+                    chunk = conn.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                received_at = time.monotonic()
+                for line in decoder.feed(chunk):
+                    payload = json.loads(line)
+                    if payload.get("type") == "gesture" and "trace" in payload:
+                        traces.append({**payload["trace"], "received": received_at})
+                    elif payload.get("type") == "metrics":
+                        metrics = payload
+        finally:
+            _send_command(conn, {"command": "SET_SETTINGS", "latency_tracing": False})
+
+    print(f"{len(traces)} traced gesture events")
+    if traces:
+        print(f"{'hop':<22} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'mean ms':>8}")
+        for name, start, end in HOPS:
+            values = sorted(
+                (trace[end] - trace[start]) * 1000.0
+                for trace in traces
+                if trace.get(start) is not None and trace.get(end) is not None
+            )
+            if not values:
+                continue
+            print(
+                f"{name:<22} {len(values):>5} {_percentile(values, 0.5):>8.2f}"
+                f" {_percentile(values, 0.95):>8.2f} {values[-1]:>8.2f}"
+                f" {statistics.fmean(values):>8.2f}"
+            )
+    if metrics:
+        print("Service-side capture_to_sent (all events since start):")
+        print(json.dumps(metrics.get("latency", {}).get("hops_ms", {}).get("capture_to_sent"), indent=2))
+
+
+if __name__ == "__main__":
+    main()
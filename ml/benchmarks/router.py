@@ -0,0 +1,164 @@
+"""
+Per-frame routing cost of `PriorityRouter`.
+
+For the live config and for synthetic mappings with more custom gestures,
+measures per call:
+- the static pipeline step: `route_id` (resolve, name and action by id)
+- the string API used elsewhere: `resolve` + `get_action`
+- the linear scans `resolve`/`get_action` did before the tables were
+  compiled, as a reference
+- `reload()`-equivalent compile time for the tables
+
+A fraction of the frames resolve to a hijacked default so the blacklist
+branch is exercised too.
+
+Usage:
+    python -m ml.benchmarks.router --frames 200000 --gestures 0 50 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable
+
+from ml.runtime.config_store import CONFIG_STORE
+from ml.runtime.priority_router import (
+    DEFAULT_MAPPING_PATH,
+    OVERRIDE_STATE_PATH,
+    USER_MAPPING_PATH,
+    PriorityRouter,
+    compile_routing_tables,
+)
+
+
+def _synthetic_config(extra_gestures: int) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    default_mapping = CONFIG_STORE.get(DEFAULT_MAPPING_PATH, default={})
+    user_mapping = CONFIG_STORE.get(USER_MAPPING_PATH, default={})
+    override_state = CONFIG_STORE.get(OVERRIDE_STATE_PATH, default={})
+    if not isinstance(default_mapping.get("static"), dict) or not default_mapping["static"]:
+        default_mapping["static"] = {"0": {"name": "Fist", "action": "Click"}}
+    if not isinstance(user_mapping.get("static"), dict):
+        user_mapping["static"] = {}
+    floor = max(int(key) for key in default_mapping["static"]) + 1
+    for index in range(extra_gestures):
+        user_mapping["static"][str(floor + index)] = {
+            "name": f"Custom_{index}",
+            "action": f"Custom action {index}",
+        }
+    # Hijack the last default's action so that label is blacklisted.
+    last_default = default_mapping["static"][str(floor - 1)]
+    override_state = dict(override_state)
+    override_state["hijacked_actions"] = {last_default.get("action", ""): "Custom_0"}
+    return default_mapping, user_mapping, override_state
+
+
+def _linear_action(mapping: dict[str, Any], label: str, gesture_type: str) -> str | None:
+    for entry in mapping.get(gesture_type, {}).values():
+        if isinstance(entry, dict) and entry.get("name") == label:
+            return entry.get("action")
+    return None
+
+
+def _linear_reference(
+    default_mapping: dict[str, Any],
+    user_mapping: dict[str, Any],
+    override_state: dict[str, Any],
+) -> Callable[[str, float], str]:
+    hijacked = override_state.get("hijacked_actions", {})
+    disabled = override_state.get("disabled_defaults", [])
+
+    def step(label: str, confidence: float) -> str:
+        if label == "UNKNOWN" or confidence < 0.6 or label in disabled:
+            return "Unknown"
+        default_action = _linear_action(default_mapping, label, "static")
+        if default_action and default_action in hijacked:
+            return "Unknown"
+        for entry in user_mapping.get("static", {}).values():
+            if isinstance(entry, dict) and entry.get("name") == label and entry.get("action"):
+                return entry["action"]
+        return default_action or "Unknown"
+
+    return step
+
+
+def _per_call_ns(run: Callable[[int], None], frames: int, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter_ns()
+        run(frames)
+        timings.append((time.perf_counter_ns() - started) / frames)
+    return statistics.median(timings)
+
+
+def _bench(extra_gestures: int, frames: int, repeats: int) -> dict[str, float]:
+    default_mapping, user_mapping, override_state = _synthetic_config(extra_gestures)
+    router = PriorityRouter()
+
+    compile_ns = []
+    for _ in range(max(3, repeats)):
+        started = time.perf_counter_ns()
+        tables = compile_routing_tables(default_mapping, user_mapping, override_state)
+        compile_ns.append(time.perf_counter_ns() - started)
+    router.swap_tables(tables)
+
+    static_table = tables.table("static")
+    ids = [label_id for label_id, name in enumerate(static_table.names) if name]
+    names = [static_table.names[label_id] for label_id in ids]
+    confidences = [0.55 if index % 10 == 0 else 0.9 for index in range(len(ids))]
+    count = len(ids)
+
+    def run_ids(n: int) -> None:
+        route_id = router.route_id
+        for index in range(n):
+            slot = index % count
+            route_id(ids[slot], confidences[slot], None, None, "static")
+
+    def run_names(n: int) -> None:
+        resolve = router.resolve
+        get_action = router.get_action
+        for index in range(n):
+            slot = index % count
+            label, _ = resolve(names[slot], confidences[slot], None, None, "static")
+            if label != "UNKNOWN":
+                get_action(label, "static")
+
+    linear = _linear_reference(default_mapping, user_mapping, override_state)
+
+    def run_linear(n: int) -> None:
+        for index in range(n):
+            slot = index % count
+            linear(names[slot], confidences[slot])
+
+    return {
+        "labels": float(count),
+        "ids_ns": _per_call_ns(run_ids, frames, repeats),
+        "names_ns": _per_call_ns(run_names, frames, repeats),
+        "linear_ns": _per_call_ns(run_linear, frames, repeats),
+        "compile_us": statistics.median(compile_ns) / 1000.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--gestures", type=int, nargs="+", default=[0, 50, 500],
+                        help="extra synthetic custom static gestures per run")
+    args = parser.parse_args()
+
+    print(
+        f"{'extra':>6} {'labels':>7} {'ids ns/frame':>13} {'names ns/frame':>15} "
+        f"{'linear ns/frame':>16} {'compile us':>11}"
+    )
+    for extra in args.gestures:
+        result = _bench(max(0, extra), max(1, args.frames), max(1, args.repeats))
+        print(
+            f"{extra:>6} {int(result['labels']):>7} {result['ids_ns']:>13.0f} "
+            f"{result['names_ns']:>15.0f} {result['linear_ns']:>16.0f} {result['compile_us']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Accuracy, latency and per-frame cost of always-on sliding-window recognition.
+
+Builds a continuous hand stream from the recorded dynamic sequences: each
+gesture is preceded by an idle stretch (the hand moves linearly from the
+previous gesture's last pose to this one's first pose, then holds it, with
+gaussian tracking noise of `--noise` in feature units), so there are no
+episode boundaries to lean on. The stream is replayed through
+`SlidingWindowRecognizer` for each motion gate, confidence, stride and
+batch size, and reports:
+- correct: gestures whose first overlapping event has the right label
+- dup: extra events for a gesture that already had one (NMS misses)
+- wrong: first events with the wrong label
+- false: events that overlap no gesture
+- latency: frames (and ms at `--fps`) from a gesture's last frame to its event
+- cost: mean and max time of one `push()` per frame, which includes the
+  batched model call on the frames that run one
+
+Usage:
+    python -m ml.benchmarks.sliding_window
+    python -m ml.benchmarks.sliding_window --strides 3 5 --batches 1 2 --min-motion 0 0.4 --noise 0.02 \\
+        --model ml/models/dynamic/custom_model.pth --mapping ml/config/user_mapping.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+from ml.runtime.dynamic_inference_runner import DynamicInferenceRunner
+from ml.runtime.sliding_window_recognizer import SlidingWindowRecognizer
+from ml.training.train_dynamic import (
+    DEFAULT_MAPPING_PATH,
+    DYNAMIC_DATA_DIR,
+    MODEL_DIR,
+    _label_mapping,
+    _load_dynamic_folder_dataset,
+)
+
+_Gesture = tuple[int, int, int]
+
+
+def _build_stream(
+    sequences: list[list[list[float]]],
+    labels: list[int],
+    gestures: int,
+    noise: float,
+    seed: int,
+) -> tuple[list[list[float]], list[_Gesture]]:
+    """Frames plus (first frame, last frame, label) of each gesture, 1-based."""
+
+    rng = random.Random(seed)
+    frames: list[list[float]] = []
+    spans: list[_Gesture] = []
+    for _ in range(gestures):
+        index = rng.randrange(len(sequences))
+        sequence = sequences[index]
+        target = sequence[0]
+        origin = frames[-1] if frames else target
+        idle = rng.randint(20, 60)
+        moving = rng.randint(6, 10)
+        for step in range(idle):
+            blend = min(1.0, (step + 1) / moving)
+            pose = [a + (b - a) * blend for a, b in zip(origin, target)]
+            # Absent-hand slots stay zero, as `extract_features` leaves them.
+            frames.append([value + rng.gauss(0.0, noise) if value else 0.0 for value in pose])
+        start = len(frames) + 1
+        frames.extend(sequence)
+        spans.append((start, len(frames), labels[index]))
+    return frames, spans
+
+
+def _evaluate(
+    runner: DynamicInferenceRunner,
+    frames: list[list[float]],
+    spans: list[_Gesture],
+    *,
+    stride: int,
+    batch_windows: int,
+    confidence: float,
+    min_motion: float,
+) -> dict[str, float]:
+    recognizer = SlidingWindowRecognizer(
+        runner.infer_batch,
+        stride=stride,
+        batch_windows=batch_windows,
+        min_confidence=confidence,
+        min_motion=min_motion,
+    )
+    push_us: list[float] = []
+    events: list[tuple[int, int, int, int]] = []
+    for frame_index, features in enumerate(frames, start=1):
+        started = time.perf_counter()
+        detections = recognizer.push(features)
+        push_us.append((time.perf_counter() - started) * 1e6)
+        for detection in detections:
+            events.append((detection.start_frame, detection.end_frame, detection.result.label_idx, frame_index))
+
+    matched: set[int] = set()
+    correct = duplicates = wrong = false = 0
+    latencies: list[int] = []
+    for start_frame, end_frame, label, emitted_at in events:
+        gesture = next(
+            (
+                index
+                for index, (first, last, _label) in enumerate(spans)
+                # At least half the gesture inside the event's window.
+                if min(end_frame, last) - max(start_frame, first) + 1 >= (last - first + 1) / 2
+            ),
+            None,
+        )
+        if gesture is None:
+            false += 1
+        elif gesture in matched:
+            duplicates += 1
+        else:
+            matched.add(gesture)
+            if label == spans[gesture][2]:
+                correct += 1
+                latencies.append(emitted_at - spans[gesture][1])
+            else:
+                wrong += 1
+    stats = recognizer.stats()
+    return {
+        "correct": float(correct),
+        "duplicates": float(duplicates),
+        "wrong": float(wrong),
+        "false": float(false),
+        "latency_frames": statistics.mean(latencies) if latencies else 0.0,
+        "mean_us": statistics.mean(push_us),
+        "max_us": max(push_us),
+        "batches": float(stats["batches"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DYNAMIC_DATA_DIR / "default")
+    parser.add_argument("--model", type=Path, default=MODEL_DIR / "default_model.pth")
+    parser.add_argument("--mapping", type=Path, default=DEFAULT_MAPPING_PATH)
+    parser.add_argument("--gestures", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--strides", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--confidence", type=float, nargs="+", default=[0.95, 0.99])
+    parser.add_argument("--min-motion", type=float, nargs="+", default=[0.0, 0.4])
+    parser.add_argument("--noise", type=float, default=0.01)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    label_map = _label_mapping("dynamic", args.mapping)
+    sequences, labels, _seen, _too_short = _load_dynamic_folder_dataset(args.data_dir, label_map)
+    runner = DynamicInferenceRunner(model_path=str(args.model), label_map=label_map)
+    if runner.get_last_error():
+        raise SystemExit(runner.get_last_error())
+    frames, spans = _build_stream(sequences, labels, max(1, args.gestures), args.noise, args.seed)
+    frame_ms = 1000.0 / args.fps
+
+    print(f"{len(frames)} frames, {len(spans)} gestures, {runner.get_model_type()} model")
+    print(
+        f"{'motion':>6} {'conf':>5} {'stride':>6} {'batch':>5} {'correct':>9} {'dup':>4} {'wrong':>5} {'false':>5} "
+        f"{'lat fr':>7} {'lat ms':>7} {'mean us':>8} {'max us':>8} {'batches':>7}"
+    )
+    settings = [
+        (min_motion, confidence, stride, batch_windows)
+        for min_motion in args.min_motion
+        for confidence in args.confidence
+        for stride in args.strides
+        for batch_windows in args.batches
+    ]
+    for min_motion, confidence, stride, batch_windows in settings:
+        result = _evaluate(
+            runner,
+            frames,
+            spans,
+            stride=max(1, stride),
+            batch_windows=max(1, batch_windows),
+            confidence=confidence,
+            min_motion=min_motion,
+        )
+        correct = f"{int(result['correct'])}/{len(spans)}"
+        print(
+            f"{min_motion:>6.2f} {confidence:>5.2f} {stride:>6} {batch_windows:>5} {correct:>9} "
+            f"{int(result['duplicates']):>4} {int(result['wrong']):>5} {int(result['false']):>5} "
+            f"{result['latency_frames']:>7.1f} {result['latency_frames'] * frame_ms:>7.0f} "
+            f"{result['mean_us']:>8.0f} {result['max_us']:>8.0f} {int(result['batches']):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
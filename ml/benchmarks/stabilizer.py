@@ -0,0 +1,240 @@
+"""
+Latency versus false positives of GestureStabilizer policies.
+
+Replays the router output (label and confidence per frame) from flight
+recorder dumps through each stabilizer policy. Every frame has a "truth"
+label and truth runs are gesture episodes. Per policy it reports:
+- detected: episodes with at least one commit of the right label
+- latency: frames (and ms, from capture timestamps) from an episode's first
+  frame to its first correct commit
+- false positives: commits of a label that is not the truth on that frame,
+  in total and per 1000 frames
+
+Recordings have no ground truth, so a frame's truth is its router label
+when that label holds for at least `--hold-frames` consecutive frames and
+UNKNOWN otherwise: real gestures are held, one- or two-frame blips are
+model noise. Without dump files a seeded synthetic session is generated
+instead, with exact truth: held gestures with per-frame confidence noise and
+label flicker, separated by idle stretches that occasionally produce
+confident wrong labels.
+
+It also times the per-frame cost of the ring-buffer stabilizer against the
+list-based filter it replaced.
+
+Usage:
+    python -m ml.benchmarks.stabilizer ml/flight_recordings/*.bin
+    python -m ml.benchmarks.stabilizer --synthetic-frames 200000 --immediate 0.95 0.97 0.99
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ml.runtime.flight_recorder import load_flight_recording
+from ml.runtime.gesture_stabilizer import GestureStabilizer, InferenceResult
+
+_MIN_CONFIDENCE = 0.72
+_FRAME_MS = 1000.0 / 30.0
+
+
+@dataclass(slots=True)
+class _Frame:
+    label: str
+    confidence: float
+    ts: float
+    truth: str | None = None
+
+
+def _load_sessions(paths: list[str]) -> list[list[_Frame]]:
+    sessions: list[list[_Frame]] = []
+    for path in paths:
+        recording = load_flight_recording(path)
+        frames = [
+            _Frame(
+                label=row["router_label"] or "UNKNOWN",
+                confidence=float(row["router_confidence"]),
+                ts=float(row["capture_ts"]),
+            )
+            for row in recording.rows()
+        ]
+        if frames:
+            sessions.append(frames)
+    return sessions
+
+
+def _synthetic_session(frames: int, seed: int) -> list[_Frame]:
+    rng = random.Random(seed)
+    labels = ["Fist", "Index_Pointing", "OK_Sign", "Thumb", "Pinch_Closed"]
+    session: list[_Frame] = []
+    while len(session) < frames:
+        for _ in range(rng.randint(15, 90)):
+            # Idle: mostly UNKNOWN, sometimes a confident wrong label.
+            if rng.random() < 0.08:
+                session.append(_Frame(rng.choice(labels), rng.uniform(0.6, 0.99), 0.0, "UNKNOWN"))
+            else:
+                session.append(_Frame("UNKNOWN", 0.0, 0.0, "UNKNOWN"))
+        held = rng.choice(labels)
+        # Each gesture has its own typical confidence, as real classes do.
+        centre = rng.uniform(0.78, 0.99)
+        for _ in range(rng.randint(8, 45)):
+            if rng.random() < 0.1:
+                session.append(_Frame(rng.choice(labels), rng.uniform(0.6, 0.95), 0.0, held))
+            else:
+                confidence = min(1.0, max(0.0, rng.gauss(centre, 0.04)))
+                session.append(_Frame(held, confidence, 0.0, held))
+    for index, frame in enumerate(session[:frames]):
+        frame.ts = index * _FRAME_MS / 1000.0
+    return session[:frames]
+
+
+def _proxy_truth(frames: list[_Frame], hold_frames: int) -> None:
+    raw = [frame.label if frame.confidence >= _MIN_CONFIDENCE else "UNKNOWN" for frame in frames]
+    start = 0
+    for index in range(1, len(raw) + 1):
+        if index == len(raw) or raw[index] != raw[start]:
+            truth = raw[start] if index - start >= hold_frames else "UNKNOWN"
+            for frame in frames[start:index]:
+                frame.truth = truth
+            start = index
+
+
+def _evaluate(sessions: list[list[_Frame]], make: Any) -> dict[str, float]:
+    latencies_frames: list[int] = []
+    latencies_ms: list[float] = []
+    episodes = 0
+    false_positives = 0
+    frame_count = 0
+    for frames in sessions:
+        frame_count += len(frames)
+        stabilizer = make()
+        previous = "UNKNOWN"
+        episode_start = -1
+        detected = False
+        for index, frame in enumerate(frames):
+            truth = frame.truth or "UNKNOWN"
+            if truth != "UNKNOWN" and (index == 0 or frames[index - 1].truth != truth):
+                episodes += 1
+                episode_start = index
+                detected = False
+            label = stabilizer(InferenceResult(frame.label, frame.confidence)).label
+            if label != "UNKNOWN" and label != previous:
+                if label != truth:
+                    false_positives += 1
+                elif not detected:
+                    detected = True
+                    latencies_frames.append(index - episode_start)
+                    latencies_ms.append((frame.ts - frames[episode_start].ts) * 1000.0)
+            previous = label
+    return {
+        "episodes": float(episodes),
+        "detected": float(len(latencies_frames)),
+        "false_positives": float(false_positives),
+        "fp_per_1k": 1000.0 * false_positives / frame_count if frame_count else 0.0,
+        "latency_frames": statistics.mean(latencies_frames) if latencies_frames else 0.0,
+        "latency_ms": statistics.mean(latencies_ms) if latencies_ms else 0.0,
+        "latency_p95_ms": (
+            statistics.quantiles(latencies_ms, n=20)[-1] if len(latencies_ms) >= 20 else max(latencies_ms, default=0.0)
+        ),
+    }
+
+
+class _ListStabilizer:
+    """The list-based 2-of-N filter the ring buffer replaced, for timing."""
+
+    def __init__(self, window_size: int) -> None:
+        self.window_size = window_size
+        self.history: list[str] = []
+
+    def __call__(self, result: InferenceResult) -> InferenceResult:
+        if result.label == "UNKNOWN" or result.confidence < _MIN_CONFIDENCE:
+            self.history.append("UNKNOWN")
+            if len(self.history) > self.window_size:
+                self.history.pop(0)
+            return InferenceResult(label="UNKNOWN", confidence=result.confidence)
+        self.history.append(result.label)
+        if len(self.history) > self.window_size:
+            self.history.pop(0)
+        counts = {label: self.history.count(label) for label in set(self.history)}
+        if counts.get(result.label, 0) >= 2:
+            return result
+        return InferenceResult(label="UNKNOWN", confidence=result.confidence)
+
+
+def _per_frame_ns(stabilizer: Any, results: list[InferenceResult]) -> float:
+    started = time.perf_counter_ns()
+    for result in results:
+        stabilizer(result)
+    return (time.perf_counter_ns() - started) / len(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="flight recorder dumps to replay")
+    parser.add_argument("--synthetic-frames", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--hold-frames", type=int, default=4)
+    parser.add_argument("--immediate", type=float, nargs="*", default=[0.95, 0.97, 0.99])
+    parser.add_argument("--weighted", type=float, nargs="*", default=[1.8],
+                        help="min_weighted_score values, tried with a 3-frame count policy")
+    args = parser.parse_args()
+
+    if args.paths:
+        sessions = _load_sessions(args.paths)
+        for frames in sessions:
+            _proxy_truth(frames, max(1, args.hold_frames))
+        source = f"{sum(len(frames) for frames in sessions)} frames from {len(sessions)} recording(s)"
+    else:
+        sessions = [_synthetic_session(max(1, args.synthetic_frames), args.seed)]
+        source = f"{len(sessions[0])} synthetic frames (seed {args.seed})"
+
+    policies: list[tuple[str, Any]] = [
+        ("2-of-5 (baseline)", lambda: GestureStabilizer(min_confidence=_MIN_CONFIDENCE)),
+    ]
+    for threshold in args.immediate:
+        policies.append(
+            (
+                f"2-of-5 + immediate>={threshold:.2f}",
+                lambda threshold=threshold: GestureStabilizer(
+                    min_confidence=_MIN_CONFIDENCE, immediate_confidence=threshold
+                ),
+            )
+        )
+    for score in args.weighted:
+        policies.append(
+            (
+                f"3-of-5 or score>={score:.2f}",
+                lambda score=score: GestureStabilizer(
+                    min_confirmation_frames=3, min_confidence=_MIN_CONFIDENCE, min_weighted_score=score
+                ),
+            )
+        )
+
+    print(source)
+    print(
+        f"{'policy':<30} {'detected':>13} {'lat frames':>11} {'lat ms':>8} {'p95 ms':>8} "
+        f"{'false pos':>10} {'FP/1k fr':>9}"
+    )
+    for name, make in policies:
+        result = _evaluate(sessions, make)
+        detected = f"{int(result['detected'])}/{int(result['episodes'])}"
+        print(
+            f"{name:<30} {detected:>13} {result['latency_frames']:>11.2f} "
+            f"{result['latency_ms']:>8.1f} {result['latency_p95_ms']:>8.1f} "
+            f"{int(result['false_positives']):>10} {result['fp_per_1k']:>9.2f}"
+        )
+
+    results = [InferenceResult(frame.label, frame.confidence) for frames in sessions for frame in frames]
+    print(f"\n{'per-frame cost':<30} {'window':>8} {'list ns':>9} {'ring ns':>9}")
+    for window in (5, 30):
+        list_ns = _per_frame_ns(_ListStabilizer(window), results)
+        ring_ns = _per_frame_ns(GestureStabilizer(window_size=window, min_confidence=_MIN_CONFIDENCE), results)
+        print(f"{'':<30} {window:>8} {list_ns:>9.0f} {ring_ns:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
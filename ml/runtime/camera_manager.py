@@ -4,8 +4,25 @@ import threading
 import time
 from typing import Any
 
+from ml.runtime.camera_probe_cache import CameraProbeCache
+from ml.runtime.capture_formats import (
+    DEFAULT_FORMAT_CANDIDATES,
+    CaptureFormat,
+    apply_format,
+    choose_format,
+    probe_formats,
+    read_fourcc,
+    result_to_dict,
+)
+from ml.runtime.frame_pool import FrameBufferPool
+from ml.runtime.span_tracer import TRACER
 from ml.runtime.types import CameraFrame
 
+# Format negotiation runs inside `open()`, so it uses a shorter probe than
+# the standalone `capture_formats` tool.
+_NEGOTIATION_FRAMES = 8
+_NEGOTIATION_WARMUP_FRAMES = 2
+
 cv2_error = ""
 try:
     import cv2
@@ -38,6 +55,11 @@ class CameraManager:
         camera_index: int = 0,
         width: int = 640,
         height: int = 480,
+        frame_pool: FrameBufferPool | None = None,
+        probe_cache: CameraProbeCache | None = None,
+        target_fps: float = 30.0,
+        negotiate_format: bool = True,
+        format_candidates: tuple[CaptureFormat, ...] = DEFAULT_FORMAT_CANDIDATES,
     ) -> None:
         # Diagnostic note: keep this as a plain variable so multi-camera users
         # can switch to camera_index=1 for OBS Virtual Camera or a second webcam
@@ -48,6 +70,22 @@ class CameraManager:
 
         self._capture: Any | None = None
         self._capture_lock = threading.Lock()
+        # Serializes start/stop/index switches. The pipeline thread and the
+        # command thread can both try to (re)start capture after a switch.
+        self._lifecycle_lock = threading.RLock()
+        self._probe_cache = probe_cache
+        self._open_stats: dict[str, Any] = {}
+
+        self._target_fps = float(target_fps)
+        self._negotiate_format = bool(negotiate_format)
+        self._format_candidates = tuple(format_candidates)
+        self._format_stats: dict[str, Any] = {}
+
+        # Mirrored frames are written into pooled buffers instead of fresh
+        # allocations. The raw read buffer is private to the capture handle
+        # and is handed back to `capture.read()` on every call.
+        self._frame_pool = frame_pool or FrameBufferPool(capacity=4, name="camera")
+        self._read_buffer: Any | None = None
 
         self._latest_frame: CameraFrame | None = None
         self._latest_frame_lock = threading.Lock()
@@ -71,6 +109,9 @@ class CameraManager:
         (`CAP_DSHOW`) or Media Foundation (`CAP_MSMF`) is used. Some webcams
         open under one backend and fail under another. Trying a small set of
         backends up front gives us a much better chance of a clean startup.
+
+        When a probe cache is attached, the backend that worked last time for
+        this index is tried first, so the common case is a single attempt.
         """
 
         with self._capture_lock:
@@ -95,12 +136,24 @@ class CameraManager:
                 backend_candidates.append(int(cv2.CAP_MSMF))
             backend_candidates.append(None)
 
+            cache_hit = False
+            if self._probe_cache is not None:
+                found, cached_backend = self._probe_cache.preferred_backend(self._camera_index)
+                if found and cached_backend in backend_candidates:
+                    backend_candidates.remove(cached_backend)
+                    backend_candidates.insert(0, cached_backend)
+                    cache_hit = True
+
+            open_started_at = time.perf_counter()
+            attempts = 0
             last_error = (
                 f"Failed to open camera index {self._camera_index}. "
                 "No backend attempt has succeeded yet."
             )
 
             for backend in backend_candidates:
+                attempts += 1
+                self._format_stats = {}
                 try:
                     capture = self._create_capture(backend)
                 except Exception as exc:
@@ -126,7 +179,7 @@ class CameraManager:
                         capture.release()
                         continue
 
-                    self._configure_capture(capture)
+                    self._configure_capture(capture, backend)
 
                     # Read a warm-up frame before declaring success. A camera can
                     # report "opened" and still fail to deliver frames. We want
@@ -138,19 +191,30 @@ class CameraManager:
                             backend=backend,
                             message="Opened device but could not read initial frame",
                         )
+                        self._forget_cached_format(backend)
                         capture.release()
                         continue
 
                     self._capture = capture
                     self._last_error = ""
                     self._frame_counter = 0
+                    self._read_buffer = frame
                     self._store_frame_locked(frame)
+                    self._record_open_success(
+                        capture=capture,
+                        backend=backend,
+                        frame=frame,
+                        open_ms=(time.perf_counter() - open_started_at) * 1000.0,
+                        attempts=attempts,
+                        cache_hit=cache_hit and attempts == 1,
+                    )
                     return True
                 except Exception as exc:
                     last_error = self._format_backend_error(
                         backend=backend,
                         message=f"Initialization failed after open: {exc}",
                     )
+                    self._forget_cached_format(backend)
                     try:
                         capture.release()
                     except Exception:
@@ -158,6 +222,15 @@ class CameraManager:
 
             self._capture = None
             self._last_error = last_error
+            self._open_stats = {
+                "camera_index": self._camera_index,
+                "ok": False,
+                "open_ms": round((time.perf_counter() - open_started_at) * 1000.0, 2),
+                "attempts": attempts,
+                "cache_hit": False,
+            }
+            if self._probe_cache is not None:
+                self._probe_cache.record_failure(self._camera_index, last_error)
             return False
 
     def close(self) -> None:
@@ -173,7 +246,10 @@ class CameraManager:
         with self._capture_lock:
             self._release_capture_locked()
         with self._latest_frame_lock:
+            previous = self._latest_frame
             self._latest_frame = None
+        if previous is not None:
+            self._frame_pool.release(previous.frame_bgr)
 
     def is_open(self) -> bool:
         """Return True when the underlying camera handle is open."""
@@ -208,7 +284,14 @@ class CameraManager:
                 return None
 
             try:
-                ok, frame = self._capture.read()
+                # Passing the previous buffer lets OpenCV decode in place. If
+                # the frame size changed, OpenCV allocates a new array and we
+                # simply keep that one for the next read.
+                with TRACER.span("camera.read", "capture"):
+                    if self._read_buffer is not None:
+                        ok, frame = self._capture.read(self._read_buffer)
+                    else:
+                        ok, frame = self._capture.read()
             except Exception as exc:
                 self._last_error = f"Camera read raised an exception: {exc}"
                 return None
@@ -220,6 +303,7 @@ class CameraManager:
                 )
                 return None
 
+            self._read_buffer = frame
             self._last_error = ""
             return self._store_frame_locked(frame)
 
@@ -235,21 +319,22 @@ class CameraManager:
         continuous capture is still part of camera ownership.
         """
 
-        if self._running:
-            return True
+        with self._lifecycle_lock:
+            if self._running:
+                return True
 
-        if not self.open():
-            return False
+            if not self.open():
+                return False
 
-        self._stop_event.clear()
-        self._running = True
-        self._thread = threading.Thread(
-            target=self._capture_loop,
-            name="CameraManagerCapture",
-            daemon=True,
-        )
-        self._thread.start()
-        return True
+            self._stop_event.clear()
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._capture_loop,
+                name="CameraManagerCapture",
+                daemon=True,
+            )
+            self._thread.start()
+            return True
 
     def stop(self) -> None:
         """
@@ -259,17 +344,18 @@ class CameraManager:
         `close()` is the stronger operation that also tears down the device.
         """
 
-        if not self._running:
-            return
+        with self._lifecycle_lock:
+            if not self._running:
+                return
 
-        self._stop_event.set()
-        thread = self._thread
-        self._thread = None
+            self._stop_event.set()
+            thread = self._thread
+            self._thread = None
 
-        if thread is not None and thread.is_alive():
-            thread.join(timeout=2.0)
+            if thread is not None and thread.is_alive():
+                thread.join(timeout=2.0)
 
-        self._running = False
+            self._running = False
 
     def is_running(self) -> bool:
         """Return True when the background capture thread is active."""
@@ -288,6 +374,42 @@ class CameraManager:
         with self._latest_frame_lock:
             return self._latest_frame
 
+    def acquire_frame(self) -> CameraFrame | None:
+        """
+        Return the newest frame with a reference held for the caller.
+
+        Falls back to a synchronous read when the background loop has not
+        produced anything yet. The caller owns one reference on the frame
+        buffer and must hand it back with `release_frame()`; until then the
+        capture thread cannot recycle the buffer underneath it.
+        """
+
+        with self._latest_frame_lock:
+            frame = self._latest_frame
+            if frame is not None:
+                self._frame_pool.retain(frame.frame_bgr)
+                return frame
+
+        if self.read_frame() is None:
+            return None
+
+        with self._latest_frame_lock:
+            frame = self._latest_frame
+            if frame is not None:
+                self._frame_pool.retain(frame.frame_bgr)
+            return frame
+
+    def release_frame(self, frame: CameraFrame | None) -> None:
+        """Return a frame obtained from `acquire_frame()` to the buffer pool."""
+
+        if frame is not None:
+            self._frame_pool.release(frame.frame_bgr)
+
+    def get_frame_pool_stats(self) -> dict[str, Any]:
+        """Return occupancy and reuse counters for the capture buffer pool."""
+
+        return self._frame_pool.stats()
+
     def set_camera_index(self, camera_index: int) -> None:
         """
         Switch to a different camera index.
@@ -297,12 +419,13 @@ class CameraManager:
         a new index is opened.
         """
 
-        was_running = self._running
-        self.close()
-        self._camera_index = int(camera_index)
-        self._last_error = ""
-        if was_running:
-            self.start()
+        with self._lifecycle_lock:
+            was_running = self._running
+            self.close()
+            self._camera_index = int(camera_index)
+            self._last_error = ""
+            if was_running:
+                self.start()
 
     def get_last_error(self) -> str:
         """Return the most recent human-readable camera error message."""
@@ -319,6 +442,11 @@ class CameraManager:
 
         return self._width, self._height
 
+    def get_open_stats(self) -> dict[str, Any]:
+        """Return timing and backend details for the most recent open attempt."""
+
+        return dict(self._open_stats)
+
     def _capture_loop(self) -> None:
         """
         Continuously read frames while the camera manager is running.
@@ -362,7 +490,7 @@ class CameraManager:
             return cv2.VideoCapture(self._camera_index)
         return cv2.VideoCapture(self._camera_index, backend)
 
-    def _configure_capture(self, capture: Any) -> None:
+    def _configure_capture(self, capture: Any, backend: int | None) -> None:
         """
         Apply conservative capture settings.
 
@@ -392,6 +520,88 @@ class CameraManager:
             except Exception:
                 pass
 
+        if self._negotiate_format:
+            self._negotiate_capture_format(capture, backend)
+
+    def _negotiate_capture_format(self, capture: Any, backend: int | None) -> None:
+        """
+        Select a FOURCC/FPS pair that reaches the target frame rate cheaply.
+
+        Probing costs a fraction of a second per candidate and stops at the
+        first one that reaches the target, so it only runs the first time a
+        camera index is opened on a backend. After that the chosen format is
+        read back from the probe cache and applied directly. Formats are kept
+        per backend because DirectShow and Media Foundation expose different
+        modes for the same device.
+        """
+
+        backend_name = self._backend_name(backend)
+        formats: dict[str, Any] = {}
+        cached = None
+        if self._probe_cache is not None:
+            entry = self._probe_cache.get(self._camera_index) or {}
+            if isinstance(entry.get("formats"), dict):
+                formats = dict(entry["formats"])
+            cached = formats.get(backend_name)
+            # A format measured at another requested resolution says little
+            # about this one, so re-probe instead of trusting it.
+            if not isinstance(cached, dict) or (
+                cached.get("width"),
+                cached.get("height"),
+            ) != (self._width, self._height):
+                cached = None
+
+        if isinstance(cached, dict) and cached.get("requested_fps"):
+            negotiated = apply_format(
+                capture,
+                CaptureFormat(
+                    fourcc=str(cached.get("requested_fourcc", "")),
+                    fps=float(cached.get("requested_fps", self._target_fps)),
+                ),
+            )
+            self._format_stats = dict(cached)
+            self._format_stats.pop("probe", None)
+            self._format_stats["negotiated_fourcc"] = negotiated
+            self._format_stats["from_cache"] = True
+            return
+
+        results = probe_formats(
+            capture,
+            self._format_candidates,
+            frames=_NEGOTIATION_FRAMES,
+            warmup_frames=_NEGOTIATION_WARMUP_FRAMES,
+            target_fps=self._target_fps,
+        )
+        chosen = choose_format(results, self._target_fps)
+        if chosen is None:
+            self._format_stats = {}
+            return
+
+        apply_format(
+            capture,
+            CaptureFormat(fourcc=chosen.requested_fourcc, fps=chosen.requested_fps),
+        )
+        self._format_stats = result_to_dict(chosen)
+        self._format_stats["from_cache"] = False
+        if self._probe_cache is not None:
+            formats[backend_name] = {
+                **result_to_dict(chosen),
+                "width": self._width,
+                "height": self._height,
+                "probe": [result_to_dict(result) for result in results],
+            }
+            self._probe_cache.update(self._camera_index, formats=formats)
+
+    def _forget_cached_format(self, backend: int | None) -> None:
+        """Drop a cached format that was just applied and failed to stream."""
+
+        if self._probe_cache is None or not self._format_stats.get("from_cache"):
+            return
+        entry = self._probe_cache.get(self._camera_index) or {}
+        formats = dict(entry.get("formats") or {})
+        if formats.pop(self._backend_name(backend), None) is not None:
+            self._probe_cache.update(self._camera_index, formats=formats)
+
     def _store_frame_locked(self, frame_bgr: Any) -> CameraFrame:
         """
         Normalize a raw OpenCV frame into the shared `CameraFrame` contract.
@@ -400,24 +610,26 @@ class CameraManager:
         workflow expect selfie-style feedback. Doing that once here keeps later
         modules from each making their own inconsistent decision.
 
-        We make a defensive copy of the frame before any processing because
-        some OpenCV backends reuse internal buffers across consecutive reads.
-        Without the copy, the stored frame_bgr reference could silently point
-        at stale or partially-overwritten memory by the next capture cycle.
+        The raw frame lives in the reused read buffer, so it must never be
+        stored directly. Flipping into a pooled destination doubles as the
+        defensive copy: the stored `frame_bgr` is owned by the pool and stays
+        stable until every holder has released it.
         """
 
         if cv2 is not None:
+            pooled = self._frame_pool.acquire(frame_bgr.shape, frame_bgr.dtype)
             try:
-                # Defensive copy: some camera backends reuse the internal
-                # frame buffer on the next read(), which silently corrupts
-                # any reference we hold.  Copying once up front is cheap
-                # and guarantees downstream code sees a stable snapshot.
-                frame_bgr = frame_bgr.copy()
-                frame_bgr = cv2.flip(frame_bgr, 1)
+                if pooled is not None:
+                    frame_bgr = cv2.flip(frame_bgr, 1, dst=pooled)
+                else:
+                    frame_bgr = cv2.flip(frame_bgr, 1)
             except Exception:
                 # Mirroring improves UX, but capture should still succeed even if
                 # the flip operation fails for an unusual frame object.
-                pass
+                self._frame_pool.release(pooled)
+                frame_bgr = frame_bgr.copy()
+        else:
+            frame_bgr = frame_bgr.copy()
 
         self._frame_counter += 1
         frame = CameraFrame(
@@ -429,10 +641,62 @@ class CameraManager:
         )
 
         with self._latest_frame_lock:
+            previous = self._latest_frame
             self._latest_frame = frame
+            if previous is not None:
+                self._frame_pool.release(previous.frame_bgr)
 
         return frame
 
+    def _record_open_success(
+        self,
+        *,
+        capture: Any,
+        backend: int | None,
+        frame: Any,
+        open_ms: float,
+        attempts: int,
+        cache_hit: bool,
+    ) -> None:
+        """Remember how this open succeeded, in memory and in the probe cache."""
+
+        height, width = (int(dim) for dim in frame.shape[:2])
+        backend_name = self._backend_name(backend)
+        fourcc = read_fourcc(capture)
+        self._open_stats = {
+            "camera_index": self._camera_index,
+            "ok": True,
+            "backend": backend,
+            "backend_name": backend_name,
+            "width": width,
+            "height": height,
+            "fourcc": fourcc,
+            "open_ms": round(open_ms, 2),
+            "attempts": attempts,
+            "cache_hit": cache_hit,
+            "format": dict(self._format_stats),
+        }
+        if self._probe_cache is not None:
+            self._probe_cache.record_success(
+                self._camera_index,
+                backend=backend,
+                backend_name=backend_name,
+                width=width,
+                height=height,
+                fourcc=fourcc,
+                open_ms=open_ms,
+            )
+
+    def _backend_name(self, backend: int | None) -> str:
+        """Return OpenCV's readable backend name, falling back to the id."""
+
+        if backend is None:
+            return "default"
+        try:
+            return str(cv2.videoio_registry.getBackendName(backend))
+        except Exception:
+            return str(backend)
+
     def _release_capture_locked(self) -> None:
         """Release the current OpenCV capture handle, ignoring secondary errors."""
 
@@ -442,6 +706,7 @@ class CameraManager:
             except Exception:
                 pass
         self._capture = None
+        self._read_buffer = None
 
     def _is_capture_open_locked(self) -> bool:
         """Check whether the current capture handle is alive and open."""
@@ -467,3 +732,37 @@ class CameraManager:
             f"Camera open failed for index {self._camera_index} using backend "
             f"{backend_name}: {message}"
         )
+
+
+def enumerate_cameras(
+    probe_cache: CameraProbeCache,
+    indices: range | list[int] = range(4),
+    *,
+    skip: set[int] | None = None,
+    max_age_sec: float = 7 * 24 * 3600.0,
+) -> dict[int, bool]:
+    """
+    Probe camera indices once and record the results in `probe_cache`.
+
+    Indices in `skip` (usually the camera that is already streaming) and
+    indices probed within `max_age_sec` are left alone, so repeated calls are
+    cheap. Failed probes expire much sooner (see `CameraProbeCache.is_fresh`),
+    so a camera plugged in later is found by the next enumeration. Each probe
+    is a full `open()` followed by `close()`, which means the cache ends up
+    holding the backend and format to use for a later camera switch.
+
+    Returns:
+        A mapping of every probed index to whether it opened successfully.
+    """
+
+    results: dict[int, bool] = {}
+    skipped = skip or set()
+    for camera_index in indices:
+        if camera_index in skipped or probe_cache.is_fresh(camera_index, max_age_sec):
+            continue
+        manager = CameraManager(camera_index=camera_index, probe_cache=probe_cache)
+        try:
+            results[camera_index] = manager.open()
+        finally:
+            manager.close()
+    return results
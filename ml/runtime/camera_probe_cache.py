@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_DIR = ROOT / "config"
+CAMERA_PROBE_CACHE_PATH = CONFIG_DIR / "camera_probe_cache.json"
+# A failed probe only stands for this long: a camera plugged in afterwards
+# must show up at the next enumeration, not a week later.
+FAILED_PROBE_MAX_AGE_SEC = 300.0
+
+
+class CameraProbeCache:
+    """
+    Remember which OpenCV backend and format worked for each camera index.
+
+    Why this exists:
+    `CameraManager.open()` walks DirectShow, Media Foundation and the default
+    backend in order, and every failed attempt opens the device, configures it
+    and waits for a test frame. On machines where only the last backend works
+    that costs seconds on every startup and every camera switch.
+
+    The cache is a small JSON file keyed by camera index. A successful open
+    records the backend and the resolution the driver actually delivered, so
+    the next open can try that backend first. Negotiated pixel formats are
+    kept per backend under `formats`, since each backend exposes its own
+    modes. A failed open is recorded too, which lets background enumeration
+    skip indices that were empty a few minutes ago (`FAILED_PROBE_MAX_AGE_SEC`).
+
+    The file is machine-specific runtime state, not configuration. It is safe
+    to delete at any time; the next open simply probes again.
+    """
+
+    def __init__(self, path: Path | str = CAMERA_PROBE_CACHE_PATH) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = self._load()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, camera_index: int) -> dict[str, Any] | None:
+        """Return a copy of the cached entry for `camera_index`, if any."""
+
+        with self._lock:
+            entry = self._entries.get(str(int(camera_index)))
+            return dict(entry) if entry is not None else None
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Return a copy of every cached entry keyed by camera index."""
+
+        with self._lock:
+            return {key: dict(value) for key, value in self._entries.items()}
+
+    def preferred_backend(self, camera_index: int) -> tuple[bool, int | None]:
+        """
+        Return `(found, backend)` for the last backend that opened this index.
+
+        `backend` is `None` for OpenCV's default backend, which is why the
+        separate `found` flag is needed.
+        """
+
+        entry = self.get(camera_index)
+        if not entry or not entry.get("available"):
+            return False, None
+        backend = entry.get("backend")
+        return True, (int(backend) if backend is not None else None)
+
+    def is_fresh(
+        self,
+        camera_index: int,
+        max_age_sec: float,
+        failure_max_age_sec: float = FAILED_PROBE_MAX_AGE_SEC,
+    ) -> bool:
+        """
+        Return True when the index was probed recently enough to skip.
+
+        A working camera stays fresh for `max_age_sec`; a failed probe only
+        for `failure_max_age_sec`, since devices get plugged in.
+        """
+
+        entry = self.get(camera_index)
+        if not entry:
+            return False
+        max_age = max_age_sec if entry.get("available") else min(max_age_sec, failure_max_age_sec)
+        return (time.time() - float(entry.get("updated_at", 0.0))) <= max_age
+
+    def update(self, camera_index: int, **fields: Any) -> None:
+        """
+        Merge `fields` into the entry for `camera_index` and persist.
+
+        An update that changes nothing only refreshes `updated_at` in memory,
+        so a camera that keeps failing the same way does not rewrite the file
+        on every retry.
+        """
+
+        with self._lock:
+            key = str(int(camera_index))
+            current = self._entries.get(key, {})
+            entry = dict(current)
+            entry.update(fields)
+            changed = entry != current
+            entry["updated_at"] = time.time()
+            self._entries[key] = entry
+            if changed:
+                self._save_locked()
+
+    def record_success(
+        self,
+        camera_index: int,
+        *,
+        backend: int | None,
+        backend_name: str,
+        width: int,
+        height: int,
+        fourcc: str,
+        open_ms: float,
+    ) -> None:
+        """Store the backend and format that just produced a valid frame."""
+
+        self.update(
+            camera_index,
+            available=True,
+            backend=backend,
+            backend_name=backend_name,
+            width=int(width),
+            height=int(height),
+            fourcc=fourcc,
+            open_ms=round(float(open_ms), 2),
+            error="",
+        )
+
+    def record_failure(self, camera_index: int, error: str) -> None:
+        """
+        Mark an index as unusable so enumeration can skip it next time.
+
+        Negotiated formats are kept: most failures are a busy or unplugged
+        device, and the formats are still right once it comes back.
+        """
+
+        self.update(camera_index, available=False, error=str(error))
+
+    def forget(self, camera_index: int) -> None:
+        """Drop one cached entry, forcing a full probe on the next open."""
+
+        with self._lock:
+            if self._entries.pop(str(int(camera_index)), None) is not None:
+                self._save_locked()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if not self._path.exists():
+            return {}
+        try:
+            with self._path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        cameras = data.get("cameras", {}) if isinstance(data, dict) else {}
+        if not isinstance(cameras, dict):
+            return {}
+        return {
+            str(key): value
+            for key, value in cameras.items()
+            if isinstance(value, dict)
+        }
+
+    def _save_locked(self) -> None:
+        # Write-then-rename so a crash mid-write never leaves a truncated
+        # cache behind. A failed save is not fatal; the cache is an
+        # optimization and the camera already opened.
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump({"cameras": self._entries}, handle, indent=2)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            pass
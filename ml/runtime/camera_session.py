@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from ml.runtime.camera_manager import CameraManager
+from ml.runtime.camera_probe_cache import CameraProbeCache
+from ml.runtime.gates import InferenceGatePipeline
+from ml.runtime.gesture_stabilizer import GestureStabilizer, InferenceResult
+from ml.runtime.hand_ingestion import HandIngestion
+from ml.runtime.priority_router import PriorityRouter
+from ml.runtime.types import (
+    CameraFrame,
+    DynamicInferenceResult,
+    NormalizedHandFrame,
+    StaticInferenceResult,
+)
+
+
+@dataclass(slots=True)
+class SessionLimits:
+    """
+    Resource caps for one additional camera session.
+
+    `max_fps` bounds how often the session runs MediaPipe and inference, which
+    is what actually costs CPU. Capture itself keeps running at the device
+    rate; the session simply processes the newest frame at most this often.
+    """
+
+    max_fps: float = 15.0
+    width: int = 640
+    height: int = 480
+
+
+class CameraSession:
+    """
+    One extra camera with its own capture, ingestion and gate state.
+
+    Why this exists:
+    lab stations run a front and a side camera. Each view needs its own
+    MediaPipe graph, clutch gate and stabilizer history, because a clutch
+    armed in front of one camera says nothing about the other. What the views
+    should *not* duplicate is the model: both share the service's static and
+    dynamic runners through the `infer_static` / `infer_dynamic` callables,
+    which also own the model lock.
+
+    The primary camera keeps running through `MlService.run_pipeline`, which
+    also drives the preview, recording and continuous-control modes. A
+    session runs the smaller discrete-gesture path: gates, static inference,
+    bounded dynamic episodes, stabilizer and cooldown. Events carry the
+    session id and camera index so the engine can tell the views apart.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        camera_index: int,
+        *,
+        infer_static: Callable[[list[NormalizedHandFrame]], list[StaticInferenceResult]],
+        infer_dynamic: Callable[[list[list[float]]], DynamicInferenceResult],
+        router: PriorityRouter,
+        emit: Callable[[dict[str, Any]], None],
+        mode_provider: Callable[[], str],
+        limits: SessionLimits | None = None,
+        probe_cache: CameraProbeCache | None = None,
+        min_detection_confidence: float = 0.5,
+        clutch_session_duration_sec: float = 25.0,
+        action_cooldown_sec: float = 1.5,
+        stabilizer_immediate_confidence: float | None = None,
+    ) -> None:
+        self._session_id = str(session_id)
+        self._camera_index = int(camera_index)
+        self._limits = limits or SessionLimits()
+        self._infer_static = infer_static
+        self._infer_dynamic = infer_dynamic
+        self._router = router
+        self._emit = emit
+        self._mode_provider = mode_provider
+
+        self._camera = CameraManager(
+            camera_index=self._camera_index,
+            width=self._limits.width,
+            height=self._limits.height,
+            probe_cache=probe_cache,
+        )
+        self._ingestion = HandIngestion(min_detection_confidence=min_detection_confidence)
+        self._gates = InferenceGatePipeline(min_confidence=0.75, required_hold_frames=1)
+        self._stabilizer = GestureStabilizer(
+            min_confidence=0.72,
+            immediate_confidence=stabilizer_immediate_confidence,
+        )
+
+        self._clutch_session_duration_sec = float(clutch_session_duration_sec)
+        self._clutch_expires_at = 0.0
+        self._clutch_armed = False
+        self._action_cooldown_sec = float(action_cooldown_sec)
+        self._last_action_time = 0.0
+
+        self._prev_wrist: tuple[float, float] | None = None
+        self._dynamic_frames: list[list[float]] = []
+        self._dynamic_active = False
+        self._dynamic_last_motion_at = 0.0
+        self._dynamic_motion_threshold = 0.020
+        self._dynamic_idle_timeout_sec = 0.14
+        self._dynamic_min_frames = 8
+
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._metrics_lock = threading.Lock()
+        self._metrics: dict[str, Any] = {
+            "frames_processed": 0,
+            "frames_with_hands": 0,
+            "duplicate_frames": 0,
+            "over_budget_frames": 0,
+            "static_inferences": 0,
+            "dynamic_inferences": 0,
+            "gestures_emitted": 0,
+            "ingest_ms_avg": 0.0,
+            "inference_ms_avg": 0.0,
+            "fps": 0.0,
+        }
+        self._last_error = ""
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
+    @property
+    def camera_index(self) -> int:
+        return self._camera_index
+
+    def start(self) -> None:
+        """Start the session thread. Camera open happens inside the thread."""
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"CameraSession-{self._session_id}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the session thread and release the camera and MediaPipe."""
+
+        self._stop_event.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=2.0)
+        self._camera.close()
+        self._ingestion.close()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_last_error(self) -> str:
+        return self._last_error
+
+    def metrics(self) -> dict[str, Any]:
+        """Return a snapshot of this session's counters and caps."""
+
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        snapshot.update(
+            {
+                "session_id": self._session_id,
+                "camera_index": self._camera_index,
+                "running": self.is_running(),
+                "camera_open": self._camera.is_open(),
+                "clutch_active": self._clutch_armed,
+                "max_fps": self._limits.max_fps,
+                "last_error": self._last_error,
+                "frame_pool": self._camera.get_frame_pool_stats(),
+            }
+        )
+        return snapshot
+
+    def _run(self) -> None:
+        frame_interval = 1.0 / max(1.0, float(self._limits.max_fps))
+        last_frame_id: int | None = None
+        last_loop_at = time.perf_counter()
+
+        while not self._stop_event.is_set():
+            if self._mode_provider() != "HAND":
+                self._camera.close()
+                self._reset()
+                time.sleep(0.2)
+                continue
+
+            if not self._camera.is_running() and not self._camera.start():
+                self._last_error = self._camera.get_last_error()
+                time.sleep(0.5)
+                continue
+
+            loop_started = time.perf_counter()
+            frame = self._camera.acquire_frame()
+            if frame is None:
+                time.sleep(0.02)
+                continue
+            try:
+                if frame.frame_id == last_frame_id:
+                    self._bump("duplicate_frames")
+                    time.sleep(0.005)
+                    continue
+                last_frame_id = frame.frame_id
+                self._process(frame)
+            except Exception as exc:  # pragma: no cover - defensive path
+                self._last_error = f"Session processing failed: {exc}"
+            finally:
+                self._camera.release_frame(frame)
+
+            elapsed = time.perf_counter() - loop_started
+            if elapsed > frame_interval:
+                self._bump("over_budget_frames")
+            else:
+                time.sleep(frame_interval - elapsed)
+
+            now = time.perf_counter()
+            instant_fps = 1.0 / max(now - last_loop_at, 1e-6)
+            last_loop_at = now
+            with self._metrics_lock:
+                self._metrics["fps"] = self._metrics["fps"] * 0.9 + instant_fps * 0.1
+
+        self._camera.close()
+
+    def _process(self, frame: CameraFrame) -> None:
+        ingest_started = time.perf_counter()
+        detection = self._ingestion.process_frame(frame)
+        normalized = self._ingestion.normalize_hand(detection)
+        ingest_ms = (time.perf_counter() - ingest_started) * 1000.0
+        trace: dict[str, Any] = {
+            "frame_id": int(frame.frame_id),
+            "capture": float(frame.timestamp),
+            "ingested": time.monotonic(),
+        }
+        with self._metrics_lock:
+            self._metrics["frames_processed"] += 1
+            if detection.hand_present:
+                self._metrics["frames_with_hands"] += 1
+            self._metrics["ingest_ms_avg"] = self._metrics["ingest_ms_avg"] * 0.9 + ingest_ms * 0.1
+
+        now = time.monotonic()
+        gate_decision = self._gates.evaluate(normalized)
+        if gate_decision.clutch_active and not self._clutch_armed:
+            self._clutch_armed = True
+            self._clutch_expires_at = now + self._clutch_session_duration_sec
+        if self._clutch_armed and now >= self._clutch_expires_at:
+            self._reset()
+            return
+
+        if normalized is None or not gate_decision.gate1_passed or not self._clutch_armed:
+            if normalized is None:
+                self._prev_wrist = None
+            return
+
+        motion = self._measure_motion(normalized)
+        if motion >= self._dynamic_motion_threshold:
+            if not self._dynamic_active:
+                self._dynamic_active = True
+                self._dynamic_frames = []
+            self._dynamic_last_motion_at = now
+
+        if self._dynamic_active:
+            self._dynamic_frames.append(list(normalized.normalized_features))
+            capture_complete = len(self._dynamic_frames) >= 30 or (
+                len(self._dynamic_frames) >= self._dynamic_min_frames
+                and now - self._dynamic_last_motion_at >= self._dynamic_idle_timeout_sec
+            )
+            if capture_complete:
+                started = time.perf_counter()
+                result = self._infer_dynamic(self._dynamic_frames)
+                self._record_inference("dynamic_inferences", started)
+                trace["inferred"] = time.monotonic()
+                if not result.is_unknown:
+                    self._emit_gesture(
+                        result.label_name, result.confidence, "dynamic", normalized, now, trace
+                    )
+                self._dynamic_active = False
+                self._dynamic_frames = []
+                self._stabilizer.reset()
+            return
+
+        started = time.perf_counter()
+        static_result = self._infer_static([normalized])[0]
+        self._record_inference("static_inferences", started)
+        trace["inferred"] = time.monotonic()
+
+        label, confidence = self._router.resolve(
+            static_result.label_name,
+            static_result.confidence,
+            None,
+            None,
+            gesture_type="static",
+        )
+        stable = self._stabilizer(InferenceResult(label=label, confidence=confidence))
+        if stable.label == "UNKNOWN":
+            return
+        # Continuous control modes stay with the primary camera; a second
+        # view only contributes discrete gestures.
+        if self._router.get_action(stable.label, "static").startswith("Mode:"):
+            return
+        if now - self._last_action_time < self._action_cooldown_sec:
+            return
+        self._emit_gesture(stable.label, stable.confidence, "static", normalized, now, trace)
+        self._stabilizer.reset()
+
+    def _emit_gesture(
+        self,
+        label: str,
+        confidence: float,
+        gesture_type: str,
+        normalized: NormalizedHandFrame,
+        now: float,
+        trace: dict[str, Any],
+    ) -> None:
+        self._last_action_time = now
+        payload: dict[str, Any] = {
+            "type": "gesture",
+            "label": label,
+            "class": label,
+            "action": self._router.get_action(label, gesture_type),
+            "mode": self._mode_provider(),
+            "confidence": float(confidence),
+            "value": 0.0,
+            "session": self._session_id,
+            "camera_index": self._camera_index,
+            # Completed and stripped by the service's outbound writer.
+            "_trace": {**trace, "kind": gesture_type},
+        }
+        if len(normalized.landmarks_xyz) >= 21:
+            payload["index_tip"] = {
+                "x": float(normalized.landmarks_xyz[8][0]),
+                "y": float(normalized.landmarks_xyz[8][1]),
+            }
+            payload["thumb_tip"] = {
+                "x": float(normalized.landmarks_xyz[4][0]),
+                "y": float(normalized.landmarks_xyz[4][1]),
+            }
+        self._bump("gestures_emitted")
+        self._emit(payload)
+
+    def _measure_motion(self, normalized: NormalizedHandFrame) -> float:
+        wrist_x, wrist_y = normalized.landmarks_xyz[0][0], normalized.landmarks_xyz[0][1]
+        previous = self._prev_wrist
+        self._prev_wrist = (wrist_x, wrist_y)
+        if previous is None:
+            return 0.0
+        return ((wrist_x - previous[0]) ** 2 + (wrist_y - previous[1]) ** 2) ** 0.5
+
+    def _record_inference(self, counter: str, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._metrics_lock:
+            self._metrics[counter] += 1
+            self._metrics["inference_ms_avg"] = (
+                self._metrics["inference_ms_avg"] * 0.9 + elapsed_ms * 0.1
+            )
+
+    def _bump(self, counter: str) -> None:
+        with self._metrics_lock:
+            self._metrics[counter] += 1
+
+    def _reset(self) -> None:
+        self._gates.reset()
+        self._stabilizer.reset()
+        self._clutch_armed = False
+        self._clutch_expires_at = 0.0
+        self._prev_wrist = None
+        self._dynamic_active = False
+        self._dynamic_frames = []
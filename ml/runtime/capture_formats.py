@@ -0,0 +1,321 @@
+"""
+Capture format negotiation for USB webcams.
+
+Many UVC webcams come up in an uncompressed YUYV mode by default. At 640x480
+and above that mode is often capped at 10-15 fps by USB bandwidth, while the
+same camera delivers a steady 30 or 60 fps as MJPEG. MJPEG in turn costs a
+JPEG decode per frame inside `VideoCapture.retrieve()`.
+
+This module asks the driver for each candidate FOURCC/FPS pair, measures what
+actually arrives, and picks the cheapest candidate that still meets the target
+frame rate. "Cheapest" is the mean time spent in `retrieve()`, which is where
+OpenCV decodes and colour-converts the frame; `grab()` time is mostly waiting
+for the device and is reported separately.
+
+The probe only needs an object with `set`, `get`, `grab` and `retrieve`, so it
+runs unchanged against a v4l2loopback device or a video file on Linux:
+
+    python -m ml.runtime.capture_formats --source /dev/video4
+    python -m ml.runtime.capture_formats --source sample.avi --target-fps 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable
+
+cv2_error = ""
+try:
+    import cv2
+except ImportError as exc:  # pragma: no cover - depends on local runtime
+    cv2 = None  # type: ignore[assignment]
+    cv2_error = str(exc)
+
+
+@dataclass(slots=True)
+class CaptureFormat:
+    """One FOURCC/FPS pair to request from the driver. Empty FOURCC means "leave as is"."""
+
+    fourcc: str
+    fps: float
+
+
+@dataclass(slots=True)
+class FormatProbeResult:
+    """
+    What a capture actually delivered after requesting one `CaptureFormat`.
+
+    `negotiated_fourcc` can differ from the request because drivers silently
+    fall back to a supported mode. The result is still useful: it tells us
+    what the request really buys.
+    """
+
+    requested_fourcc: str
+    requested_fps: float
+    negotiated_fourcc: str
+    reported_fps: float
+    achieved_fps: float
+    decode_ms: float
+    grab_ms: float
+    frames: int
+    ok: bool
+    error: str = ""
+
+
+# Highest frame rate first so a camera that can do MJPEG@60 is measured at 60.
+DEFAULT_FORMAT_CANDIDATES: tuple[CaptureFormat, ...] = (
+    CaptureFormat("MJPG", 60.0),
+    CaptureFormat("MJPG", 30.0),
+    CaptureFormat("YUYV", 30.0),
+    CaptureFormat("", 30.0),
+)
+
+
+def fourcc_code(fourcc: str) -> int:
+    """Pack a four-character code into OpenCV's integer representation."""
+
+    padded = (fourcc + "    ")[:4]
+    return (
+        ord(padded[0])
+        | (ord(padded[1]) << 8)
+        | (ord(padded[2]) << 16)
+        | (ord(padded[3]) << 24)
+    )
+
+
+def fourcc_string(code: float | int) -> str:
+    """Decode OpenCV's integer FOURCC, returning "" when none is reported."""
+
+    value = int(code)
+    if value <= 0:
+        return ""
+    chars = [chr((value >> (8 * shift)) & 0xFF) for shift in range(4)]
+    return "".join(chars).strip("\x00 ")
+
+
+def read_fourcc(capture: Any) -> str:
+    """Return the FOURCC a capture currently reports, or ""."""
+
+    if cv2 is None or not hasattr(cv2, "CAP_PROP_FOURCC"):
+        return ""
+    try:
+        return fourcc_string(capture.get(cv2.CAP_PROP_FOURCC))
+    except Exception:
+        return ""
+
+
+def apply_format(capture: Any, capture_format: CaptureFormat) -> str:
+    """
+    Request `capture_format` from the driver and return the negotiated FOURCC.
+
+    The FOURCC has to be set before the frame rate: several backends reset the
+    rate when the pixel format changes.
+    """
+
+    if cv2 is None:
+        return ""
+    if capture_format.fourcc and hasattr(cv2, "CAP_PROP_FOURCC"):
+        try:
+            capture.set(cv2.CAP_PROP_FOURCC, fourcc_code(capture_format.fourcc))
+        except Exception:
+            pass
+    if capture_format.fps > 0 and hasattr(cv2, "CAP_PROP_FPS"):
+        try:
+            capture.set(cv2.CAP_PROP_FPS, float(capture_format.fps))
+        except Exception:
+            pass
+    return read_fourcc(capture)
+
+
+def probe_format(
+    capture: Any,
+    capture_format: CaptureFormat,
+    *,
+    frames: int = 15,
+    warmup_frames: int = 3,
+) -> FormatProbeResult:
+    """
+    Apply one format, read `frames` frames and measure fps and decode cost.
+
+    The first `warmup_frames` reads are discarded because drivers usually
+    deliver a few stale or slow frames right after a mode switch.
+    """
+
+    negotiated = apply_format(capture, capture_format)
+    reported_fps = 0.0
+    if cv2 is not None and hasattr(cv2, "CAP_PROP_FPS"):
+        try:
+            reported_fps = float(capture.get(cv2.CAP_PROP_FPS))
+        except Exception:
+            reported_fps = 0.0
+
+    def _failed(message: str) -> FormatProbeResult:
+        return FormatProbeResult(
+            requested_fourcc=capture_format.fourcc,
+            requested_fps=capture_format.fps,
+            negotiated_fourcc=negotiated,
+            reported_fps=reported_fps,
+            achieved_fps=0.0,
+            decode_ms=0.0,
+            grab_ms=0.0,
+            frames=0,
+            ok=False,
+            error=message,
+        )
+
+    try:
+        for _ in range(max(0, int(warmup_frames))):
+            capture.grab()
+
+        grab_total = 0.0
+        decode_total = 0.0
+        captured = 0
+        started_at = time.perf_counter()
+        for _ in range(max(1, int(frames))):
+            grab_started = time.perf_counter()
+            if not capture.grab():
+                break
+            decode_started = time.perf_counter()
+            ok, frame = capture.retrieve()
+            decode_done = time.perf_counter()
+            if not ok or frame is None:
+                break
+            grab_total += decode_started - grab_started
+            decode_total += decode_done - decode_started
+            captured += 1
+        elapsed = time.perf_counter() - started_at
+    except Exception as exc:
+        return _failed(f"Probe read raised: {exc}")
+
+    if captured == 0:
+        return _failed("No frames delivered in this format")
+
+    return FormatProbeResult(
+        requested_fourcc=capture_format.fourcc,
+        requested_fps=capture_format.fps,
+        negotiated_fourcc=negotiated,
+        reported_fps=reported_fps,
+        achieved_fps=captured / max(elapsed, 1e-9),
+        decode_ms=(decode_total / captured) * 1000.0,
+        grab_ms=(grab_total / captured) * 1000.0,
+        frames=captured,
+        ok=True,
+    )
+
+
+def probe_formats(
+    capture: Any,
+    candidates: Iterable[CaptureFormat] = DEFAULT_FORMAT_CANDIDATES,
+    *,
+    frames: int = 15,
+    warmup_frames: int = 3,
+    target_fps: float | None = None,
+    tolerance: float = 0.9,
+) -> list[FormatProbeResult]:
+    """
+    Probe candidates on the same open capture, in order.
+
+    With `target_fps`, stop at the first candidate that reaches `tolerance`
+    of it. Candidates are listed in order of preference, so the rest would
+    rarely win and each one costs a few hundred milliseconds of capture.
+    """
+
+    results: list[FormatProbeResult] = []
+    for candidate in candidates:
+        result = probe_format(capture, candidate, frames=frames, warmup_frames=warmup_frames)
+        results.append(result)
+        if target_fps is not None and result.ok and result.achieved_fps >= target_fps * tolerance:
+            break
+    return results
+
+
+def choose_format(
+    results: Iterable[FormatProbeResult],
+    target_fps: float,
+    *,
+    tolerance: float = 0.9,
+) -> FormatProbeResult | None:
+    """
+    Pick the cheapest format that meets the target frame rate.
+
+    A format "meets" the target when it achieves at least `tolerance` of it,
+    since a 30 fps camera typically measures 29.x over a short probe. When
+    nothing meets the target we fall back to the fastest format, because a
+    low frame rate hurts gesture latency more than decode cost does.
+    """
+
+    usable = [result for result in results if result.ok]
+    if not usable:
+        return None
+
+    meeting = [
+        result for result in usable
+        if result.achieved_fps >= target_fps * tolerance
+    ]
+    if meeting:
+        return min(meeting, key=lambda result: (result.decode_ms, -result.achieved_fps))
+    return max(usable, key=lambda result: result.achieved_fps)
+
+
+def result_to_dict(result: FormatProbeResult) -> dict[str, Any]:
+    """Return a JSON-friendly copy of a probe result with rounded timings."""
+
+    data = asdict(result)
+    for key in ("reported_fps", "achieved_fps", "decode_ms", "grab_ms"):
+        data[key] = round(float(data[key]), 3)
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Probe capture formats and report achieved fps and decode cost."
+    )
+    parser.add_argument(
+        "--source",
+        default="0",
+        help="Camera index, device path (/dev/videoN) or video file.",
+    )
+    parser.add_argument("--target-fps", type=float, default=30.0)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    if cv2 is None:
+        raise SystemExit(f"OpenCV is not available: {cv2_error}")
+
+    source: int | str = int(args.source) if args.source.isdigit() else args.source
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise SystemExit(f"Could not open capture source {args.source!r}")
+
+    try:
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, args.width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, args.height)
+        results = probe_formats(capture, frames=args.frames)
+    finally:
+        capture.release()
+
+    print(f"{'request':<12} {'negotiated':<10} {'fps':>8} {'decode_ms':>10} {'grab_ms':>9}  status")
+    for result in results:
+        request = f"{result.requested_fourcc or 'default'}@{result.requested_fps:g}"
+        status = "ok" if result.ok else result.error
+        print(
+            f"{request:<12} {result.negotiated_fourcc or '-':<10} "
+            f"{result.achieved_fps:>8.1f} {result.decode_ms:>10.3f} {result.grab_ms:>9.3f}  {status}"
+        )
+
+    chosen = choose_format(results, args.target_fps)
+    if chosen is None:
+        print("No usable format found.")
+    else:
+        print(
+            f"Selected {chosen.requested_fourcc or 'default'}@{chosen.requested_fps:g} "
+            f"({chosen.achieved_fps:.1f} fps, {chosen.decode_ms:.3f} ms decode)"
+        )
+
+
+if __name__ == "__main__":
+    main()
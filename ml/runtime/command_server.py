@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import stat
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator
+
+from ml.runtime.wire_protocol import (
+    PROTOCOL_BINARY,
+    PROTOCOL_JSON,
+    PROTOCOL_VERSION,
+    WireEncoder,
+    leading_string_frames,
+)
+
+# Every outbound payload carries a "type". Clients subscribe to topics, and a
+# few related types share one topic so a dashboard that only wants training
+# progress does not have to know every message name.
+TOPIC_BY_TYPE: dict[str, str] = {
+    "gesture": "gesture",
+    "voice": "gesture",
+    "status": "status",
+    "mode": "status",
+    "labels": "status",
+    "session": "status",
+    "training": "training",
+    "training_progress": "training",
+    "metrics": "metrics",
+    "sessions": "metrics",
+    "trace": "metrics",
+    "flight_recorder": "metrics",
+    "profile": "metrics",
+}
+ALL_TOPICS: frozenset[str] = frozenset(TOPIC_BY_TYPE.values())
+
+
+def topic_for(payload: dict[str, Any]) -> str:
+    """Return the subscription topic for an outbound payload."""
+
+    payload_type = str(payload.get("type", ""))
+    return TOPIC_BY_TYPE.get(payload_type, payload_type or "status")
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Unlink a socket file left at `path`; refuse anything else.
+
+    The path comes from the environment, so a typo must not delete a
+    regular file that happens to live there.
+    """
+
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket; refusing to replace it")
+    os.unlink(path)
+
+
+class LineDecoder:
+    """
+    Incremental newline-delimited frame decoder.
+
+    Why this exists:
+    the old loop kept a `str` buffer and re-split the whole remainder on every
+    chunk, which also decoded UTF-8 before a multi-byte character was
+    complete. This keeps raw bytes in a `bytearray`, only scans the bytes
+    that just arrived for a newline, and drops a line that grows past
+    `max_line_bytes` instead of buffering it forever.
+    """
+
+    def __init__(self, max_line_bytes: int = 1 << 20) -> None:
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self._max_line_bytes = int(max_line_bytes)
+        self._discarding = False
+        self.oversized_lines = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Append `data` and return every complete line it finished."""
+
+        self._buffer += data
+        lines: list[bytes] = []
+        while True:
+            newline = self._buffer.find(b"\n", self._scan_from)
+            if newline < 0:
+                self._scan_from = len(self._buffer)
+                if len(self._buffer) > self._max_line_bytes:
+                    # Keep reading until the newline, but stop storing.
+                    self._buffer.clear()
+                    self._scan_from = 0
+                    if not self._discarding:
+                        self.oversized_lines += 1
+                    self._discarding = True
+                return lines
+
+            line = bytes(self._buffer[:newline])
+            del self._buffer[: newline + 1]
+            self._scan_from = 0
+            if self._discarding:
+                self._discarding = False
+                continue
+            line = line.strip()
+            if line:
+                lines.append(line)
+
+
+class _ClientConnection:
+    """Per-client writer state: topics, protocol, bounded outbound queue."""
+
+    def __init__(
+        self,
+        client_id: int,
+        writer: asyncio.StreamWriter,
+        max_queue: int,
+    ) -> None:
+        self.client_id = client_id
+        self.writer = writer
+        self.topics: set[str] = set(ALL_TOPICS)
+        self.encoder: WireEncoder | None = None
+        self.queue: deque[bytes] = deque()
+        # Command responses, kept apart so a backlog of events cannot evict
+        # the one message a waiting requester needs.
+        self.replies: deque[bytes] = deque()
+        self.max_queue = max_queue
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        peer = writer.get_extra_info("peername")
+        self.peer = f"{peer[0]}:{peer[1]}" if isinstance(peer, tuple) else str(peer)
+
+    @property
+    def protocol(self) -> str:
+        return PROTOCOL_BINARY if self.encoder is not None else PROTOCOL_JSON
+
+    def enqueue(self, message: bytes) -> None:
+        # A slow client loses its oldest pending message, never blocks the
+        # publisher and never slows down the other clients.
+        if len(self.queue) >= self.max_queue:
+            dropped = self.queue.popleft()
+            self.dropped += 1
+            if self.encoder is not None:
+                # Later binary frames may refer to string ids this message
+                # defined; keep the definitions and send them first.
+                definitions = leading_string_frames(dropped)
+                if definitions:
+                    if self.queue:
+                        self.queue[0] = definitions + self.queue[0]
+                    else:
+                        message = definitions + message
+        self.queue.append(message)
+        self.ready.set()
+
+    def enqueue_reply(self, message: bytes) -> None:
+        self.replies.append(message)
+        self.ready.set()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "client_id": self.client_id,
+            "peer": self.peer,
+            "protocol": self.protocol,
+            "topics": sorted(self.topics),
+            "queued": len(self.queue) + len(self.replies),
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+
+class CommandServer:
+    """
+    Asyncio TCP server for newline-delimited JSON commands and events.
+
+    Why this exists:
+    the engine and the Electron dashboard both want live events from the same
+    service. The previous blocking socket accepted one client at a time, so
+    the second one either waited forever or raced the first on reconnect.
+
+    Design:
+    - the event loop owns every socket; each client has a reader task and a
+      writer task with its own bounded queue
+    - `publish()` is thread-safe and encodes a payload once, then fans the
+      bytes out to every client subscribed to its topic
+    - commands run one at a time on a single worker thread, so service
+      command handlers keep the same serial ordering they always had
+    - `reply()` answers the client that sent a command, whatever its
+      subscriptions, so one client's requests never land in another's stream
+    - `SUBSCRIBE` / `UNSUBSCRIBE` are handled here because they are per-client
+      state the service itself does not need to know about
+
+    Every new client is subscribed to all topics, which keeps older clients
+    that never send `SUBSCRIBE` working unchanged.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        handle_command: Callable[[dict[str, Any]], None],
+        on_connect: Callable[[], Iterable[dict[str, Any]]] | None = None,
+        on_last_disconnect: Callable[[], None] | None = None,
+        max_queue: int = 256,
+        read_chunk_bytes: int = 4096,
+        unix_path: str | None = None,
+    ) -> None:
+        self._host = host
+        self._port = int(port)
+        self._unix_path = unix_path or None
+        self._handle_command = handle_command
+        self._on_connect = on_connect
+        self._on_last_disconnect = on_last_disconnect
+        self._max_queue = max(1, int(max_queue))
+        self._read_chunk_bytes = int(read_chunk_bytes)
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._servers: list[asyncio.AbstractServer] = []
+        self._stopped: asyncio.Event | None = None
+        self._clients: dict[int, _ClientConnection] = {}
+        self._client_ids = itertools.count(1)
+        self._clients_lock = threading.Lock()
+        self._command_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="MlServiceCommand",
+        )
+        self._malformed_commands = 0
+        # Client whose command the worker is running; only the worker writes it.
+        self._requester: int | None = None
+
+    # ------------------------------------------------------------------
+    # Thread-safe API
+    # ------------------------------------------------------------------
+    def has_clients(self) -> bool:
+        with self._clients_lock:
+            return bool(self._clients)
+
+    def publish(self, payload: dict[str, Any]) -> None:
+        """Send `payload` to every client subscribed to its topic."""
+
+        loop = self._loop
+        if loop is None or not self.has_clients():
+            return
+        message = (json.dumps(payload) + "\n").encode("utf-8")
+        try:
+            loop.call_soon_threadsafe(self._fan_out, topic_for(payload), payload, message)
+        except RuntimeError:
+            # Loop already closed during shutdown.
+            pass
+
+    def requester(self) -> int | None:
+        """Id of the client whose command is running, or None off the command worker."""
+
+        return self._requester
+
+    def reply(self, client_id: int, payload: dict[str, Any]) -> None:
+        """Send a command's response to `client_id` only, if it is still connected."""
+
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._reply_to, client_id, payload)
+        except RuntimeError:
+            pass
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """Run `task` on the command worker, after the commands already queued."""
+
+        try:
+            self._command_executor.submit(task)
+        except RuntimeError:
+            # Executor shut down with the server.
+            pass
+
+    @contextmanager
+    def acting_for(self, client_id: int | None) -> Iterator[None]:
+        """On the command worker: attribute the commands run inside to `client_id`."""
+
+        previous = self._requester
+        self._requester = client_id
+        try:
+            yield
+        finally:
+            self._requester = previous
+
+    def stop(self) -> None:
+        """Ask `serve_forever()` to return. Safe to call from any thread."""
+
+        loop = self._loop
+        stopped = self._stopped
+        if loop is None or stopped is None:
+            return
+        try:
+            loop.call_soon_threadsafe(stopped.set)
+        except RuntimeError:
+            pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._clients_lock:
+            clients = [client.stats() for client in self._clients.values()]
+        return {
+            "clients": clients,
+            "malformed_commands": self._malformed_commands,
+        }
+
+    # ------------------------------------------------------------------
+    # Event loop side
+    # ------------------------------------------------------------------
+    def serve_forever(self, on_listening: Callable[[], None] | None = None) -> None:
+        """Bind, serve until `stop()` is called, then close every client."""
+
+        asyncio.run(self._serve(on_listening))
+
+    async def _serve(self, on_listening: Callable[[], None] | None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        if self._unix_path is not None:
+            # A socket file left over from a crash would make bind fail.
+            _remove_stale_socket(self._unix_path)
+        self._servers = [
+            await asyncio.start_server(
+                self._handle_client,
+                self._host,
+                self._port,
+                reuse_address=True,
+            )
+        ]
+        if self._unix_path is not None:
+            # Same protocol and clients as TCP, minus the loopback TCP stack.
+            self._servers.append(
+                await asyncio.start_unix_server(self._handle_client, self._unix_path)
+            )
+        if on_listening is not None:
+            on_listening()
+        try:
+            await self._stopped.wait()
+        finally:
+            for server in self._servers:
+                server.close()
+            with self._clients_lock:
+                clients = list(self._clients.values())
+            for client in clients:
+                client.writer.close()
+            for server in self._servers:
+                await server.wait_closed()
+            if self._unix_path is not None:
+                _remove_stale_socket(self._unix_path)
+            self._command_executor.shutdown(wait=False)
+            self._loop = None
+
+    def _fan_out(self, topic: str, payload: dict[str, Any], message: bytes) -> None:
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            if topic not in client.topics:
+                continue
+            if client.encoder is None:
+                client.enqueue(message)
+            else:
+                client.enqueue(client.encoder.encode(payload))
+
+    def _reply_to(self, client_id: int, payload: dict[str, Any]) -> None:
+        with self._clients_lock:
+            client = self._clients.get(client_id)
+        if client is None:
+            return
+        if client.encoder is not None:
+            client.enqueue_reply(client.encoder.encode(payload))
+        else:
+            client.enqueue_reply((json.dumps(payload) + "\n").encode("utf-8"))
+
+    def _send_to(self, client: _ClientConnection, payload: dict[str, Any]) -> None:
+        if client.encoder is not None:
+            client.enqueue(client.encoder.encode(payload))
+        else:
+            client.enqueue((json.dumps(payload) + "\n").encode("utf-8"))
+
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        client = _ClientConnection(next(self._client_ids), writer, self._max_queue)
+        with self._clients_lock:
+            self._clients[client.client_id] = client
+        writer_task = asyncio.create_task(self._write_loop(client))
+        loop = asyncio.get_running_loop()
+        shutting_down = False
+
+        try:
+            if self._on_connect is not None:
+                for payload in await loop.run_in_executor(
+                    self._command_executor,
+                    lambda: list(self._on_connect()),
+                ):
+                    self._send_to(client, payload)
+
+            decoder = LineDecoder()
+            while True:
+                try:
+                    chunk = await reader.read(self._read_chunk_bytes)
+                except (ConnectionError, OSError):
+                    break
+                if not chunk:
+                    break
+                for line in decoder.feed(chunk):
+                    await self._dispatch(client, line)
+        except asyncio.CancelledError:
+            # Server shutdown cancels every handler; that is a normal exit.
+            shutting_down = True
+        finally:
+            with self._clients_lock:
+                self._clients.pop(client.client_id, None)
+                last_client = not self._clients
+            writer_task.cancel()
+            writer.close()
+            # Clients closed by `stop()` see EOF rather than cancellation, and
+            # the command executor is already shut down by then.
+            if self._stopped is not None and self._stopped.is_set():
+                shutting_down = True
+            if last_client and not shutting_down and self._on_last_disconnect is not None:
+                await loop.run_in_executor(self._command_executor, self._on_last_disconnect)
+
+    async def _dispatch(self, client: _ClientConnection, line: bytes) -> None:
+        try:
+            payload = json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._malformed_commands += 1
+            return
+        if not isinstance(payload, dict):
+            self._malformed_commands += 1
+            return
+
+        command = str(payload.get("command", "")).strip().upper()
+        if command in ("SUBSCRIBE", "UNSUBSCRIBE"):
+            topics = payload.get("topics", [])
+            if isinstance(topics, str):
+                topics = [topics]
+            requested = {str(topic).strip().lower() for topic in topics}
+            if command == "SUBSCRIBE":
+                # An explicit subscribe replaces the default "everything".
+                client.topics = requested or set(ALL_TOPICS)
+            else:
+                client.topics -= requested
+            self._send_to(
+                client,
+                {"type": "subscription", "topics": sorted(client.topics)},
+            )
+            return
+
+        if command == "SET_PROTOCOL":
+            protocol = str(payload.get("protocol", PROTOCOL_JSON)).strip().lower()
+            if protocol not in (PROTOCOL_JSON, PROTOCOL_BINARY):
+                self._send_to(client, {"type": "protocol", "error": f"unsupported:{protocol}"})
+                return
+            # The acknowledgement still uses the old framing so the client
+            # knows exactly where the switch happens.
+            self._send_to(
+                client,
+                {"type": "protocol", "protocol": protocol, "version": PROTOCOL_VERSION},
+            )
+            client.encoder = WireEncoder() if protocol == PROTOCOL_BINARY else None
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._command_executor, self._run_command, client.client_id, payload)
+
+    def _run_command(self, client_id: int, payload: dict[str, Any]) -> None:
+        with self.acting_for(client_id):
+            self._handle_command(payload)
+
+    async def _write_loop(self, client: _ClientConnection) -> None:
+        writer = client.writer
+        try:
+            while True:
+                await client.ready.wait()
+                client.ready.clear()
+                # Write everything already queued, then drain once.
+                while client.replies or client.queue:
+                    writer.write((client.replies or client.queue).popleft())
+                    client.sent += 1
+                await writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            return
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import copy as copy_module
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+_Signature = tuple[int, int, int]
+
+
+class ConfigStore:
+    """
+    Parsed JSON config files held in memory and shared across the service.
+
+    Why this exists:
+    the mapping helpers in `service.py`, `PriorityRouter.reload()` and the
+    training loaders each opened and parsed `default_mapping.json` and
+    `user_mapping.json` on every call, several times per command. The store
+    parses a file once and re-reads it only when its (mtime, size, inode)
+    signature changes, so an edit from outside the service is still picked
+    up on the next read at the cost of one `stat()`.
+
+    `get()` returns a deep copy by default so callers may edit and `save()`
+    the result. Read-only callers pass `copy=False` and receive the shared
+    cached object, which they must not mutate.
+
+    `save()` writes to a temporary file in the same directory and renames it
+    over the target, so readers (including other processes) only ever see
+    the old or the new file, never a truncated one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # path -> (signature or None when missing/unreadable, parsed value)
+        self._entries: dict[Path, tuple[_Signature | None, Any]] = {}
+        self._hits = 0
+        self._loads = 0
+        self._saves = 0
+
+    @staticmethod
+    def _signature(path: Path) -> _Signature | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _read(self, path: Path) -> Any:
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, path: str | Path, default: Any = None, *, copy: bool = True) -> Any:
+        """
+        Return the parsed contents of `path`, or `default` when the file is
+        missing or not valid JSON.
+        """
+
+        key = Path(path)
+        signature = self._signature(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and signature is not None and entry[0] == signature:
+                self._hits += 1
+                value = entry[1]
+            else:
+                value = self._read(key) if signature is not None else None
+                self._loads += 1
+                self._entries[key] = (signature, value)
+        if value is None:
+            return default
+        return copy_module.deepcopy(value) if copy else value
+
+    def save(self, path: str | Path, payload: Any) -> None:
+        """Atomically replace `path` with `payload` as indented JSON."""
+
+        key = Path(path)
+        key.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps(payload, indent=2)
+        descriptor, tmp_name = tempfile.mkstemp(prefix=f".{key.name}.", suffix=".tmp", dir=key.parent)
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                handle.write(text)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_name, key)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        # Cache what a reader would parse back (JSON turns int keys into
+        # strings), so cached and fresh reads agree.
+        with self._lock:
+            self._entries[key] = (self._signature(key), json.loads(text))
+            self._saves += 1
+
+    def version(self, path: str | Path) -> _Signature | None:
+        """Current on-disk signature of `path`; None when it does not exist."""
+
+        return self._signature(Path(path))
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        """Drop one cached file, or all of them, forcing a re-read."""
+
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path), None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "hits": self._hits,
+                "loads": self._loads,
+                "saves": self._saves,
+            }
+
+
+# One store per process: the service, the router and in-process training all
+# read the same files and should share one parsed copy.
+CONFIG_STORE = ConfigStore()
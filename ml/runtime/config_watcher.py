@@ -0,0 +1,234 @@
+"""
+Watch a handful of config files and report edits, debounced.
+
+Why this exists:
+edits to `user_mapping.json` or `override_state.json` from the dashboard (or
+a text editor) used to wait for the next retrain or delete before the router
+saw them. The watcher calls back shortly after a file settles so the service
+can rebuild its routing tables in the background.
+
+Backends:
+- `inotify` (Linux): watches the files' directories through libc via
+  ctypes, so atomic write-then-rename saves are seen as well as in-place
+  writes. No third-party dependency
+- `poll` (everywhere else, or if inotify is unavailable): compares each
+  file's (mtime_ns, size, inode) every `poll_interval_sec`
+
+Either way a burst of events (an editor's temp file, write, rename) is
+collapsed into one callback `debounce_sec` after the last event.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from ml.runtime.service_logging import get_logger
+
+_LOG = get_logger("config_watcher")
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+# struct inotify_event: int wd; uint32 mask; uint32 cookie; uint32 len; char name[len]
+_EVENT_HEADER = struct.Struct("iIII")
+# Upper bound on how long stop() waits for the watcher thread to notice.
+_WAKE_INTERVAL_SEC = 0.25
+
+_Signature = tuple[int, int, int]
+
+
+def _signature(path: Path) -> _Signature | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class _Inotify:
+    """Minimal ctypes binding: one fd, directory watches, event parsing."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._add_watch.restype = ctypes.c_int
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.fd = fd
+        self._directories: dict[int, Path] = {}
+
+    def watch_directory(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(directory))
+        self._directories[wd] = directory
+
+    def read_paths(self) -> list[Path]:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths: list[Path] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+            directory = self._directories.get(wd)
+            if directory is not None and name:
+                paths.append(directory / os.fsdecode(name))
+        return paths
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class ConfigWatcher:
+    """
+    Call `on_change(paths)` from a background thread when watched files change.
+
+    `paths` is the set of watched files touched since the last callback. The
+    callback runs on the watcher thread; exceptions are logged and the watcher
+    keeps going.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str | Path],
+        on_change: Callable[[set[Path]], None],
+        *,
+        debounce_sec: float = 0.05,
+        poll_interval_sec: float = 0.5,
+        backend: str = "auto",
+    ) -> None:
+        self._paths = {Path(path).resolve() for path in paths}
+        self._on_change = on_change
+        self._debounce = max(0.0, float(debounce_sec))
+        self._poll_interval = max(0.01, float(poll_interval_sec))
+        self._requested_backend = backend
+        self._backend = ""
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._events = 0
+        self._batches = 0
+        self._errors = 0
+        self._last_batch: list[str] = []
+        self._last_batch_at = 0.0
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        inotify = None
+        if self._requested_backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                inotify = _Inotify()
+                for directory in sorted({path.parent for path in self._paths}):
+                    directory.mkdir(parents=True, exist_ok=True)
+                    inotify.watch_directory(directory)
+            except (OSError, AttributeError) as exc:
+                if inotify is not None:
+                    inotify.close()
+                inotify = None
+                _LOG.info("inotify unavailable (%s); polling config files", exc)
+        self._backend = "inotify" if inotify is not None else "poll"
+        self._thread = threading.Thread(
+            target=self._run_inotify if inotify is not None else self._run_poll,
+            args=(inotify,) if inotify is not None else (),
+            name="MlServiceConfigWatcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self._backend,
+            "files": sorted(str(path) for path in self._paths),
+            "events": self._events,
+            "batches": self._batches,
+            "errors": self._errors,
+            "last_batch": list(self._last_batch),
+            "last_batch_at": self._last_batch_at,
+        }
+
+    def _fire(self, pending: set[Path]) -> None:
+        self._batches += 1
+        self._last_batch = sorted(str(path) for path in pending)
+        self._last_batch_at = time.time()
+        try:
+            self._on_change(set(pending))
+        except Exception:
+            self._errors += 1
+            _LOG.exception("config change handler failed")
+
+    def _run_inotify(self, inotify: _Inotify) -> None:
+        pending: set[Path] = set()
+        deadline: float | None = None
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                timeout = _WAKE_INTERVAL_SEC if deadline is None else max(0.0, deadline - now)
+                ready, _, _ = select.select([inotify.fd], [], [], min(timeout, _WAKE_INTERVAL_SEC))
+                if ready:
+                    changed = [path for path in inotify.read_paths() if path in self._paths]
+                    if changed:
+                        self._events += len(changed)
+                        pending.update(changed)
+                        deadline = time.monotonic() + self._debounce
+                if pending and deadline is not None and time.monotonic() >= deadline:
+                    self._fire(pending)
+                    pending = set()
+                    deadline = None
+        finally:
+            inotify.close()
+
+    def _run_poll(self) -> None:
+        signatures = {path: _signature(path) for path in self._paths}
+        pending: set[Path] = set()
+        deadline: float | None = None
+        while not self._stop.is_set():
+            for path in self._paths:
+                current = _signature(path)
+                if current != signatures[path]:
+                    signatures[path] = current
+                    self._events += 1
+                    pending.add(path)
+                    deadline = time.monotonic() + self._debounce
+            if pending and deadline is not None and time.monotonic() >= deadline:
+                self._fire(pending)
+                pending = set()
+                deadline = None
+            wait = self._poll_interval if deadline is None else min(self._poll_interval, self._debounce)
+            self._stop.wait(max(0.005, wait))
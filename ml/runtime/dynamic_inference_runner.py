@@ -11,6 +11,29 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from ml.runtime.types import DynamicInferenceResult, NormalizedHandFrame
+from ml.runtime.warm_up import time_warm_up
+
+# Checkpoints written by `train_dynamic` since variable-length training are a
+# dict with this "format" marker, a "header" and the "state_dict". The header
+# names the architecture ("model_type"). Older files are a bare LSTM state
+# dict trained on 30-frame sequences padded with their last frame, and are
+# still fed padded sequences.
+CHECKPOINT_FORMAT = "dynamic_gesture_checkpoint"
+DYNAMIC_MODEL_TYPES = ("lstm", "tcn")
+
+
+def save_dynamic_checkpoint(path: str | Path, state_dict: dict[str, Any], **header: Any) -> None:
+    torch.save({"format": CHECKPOINT_FORMAT, "header": dict(header), "state_dict": state_dict}, path)
+
+
+def load_dynamic_checkpoint(path: str | Path) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return (state dict, header); legacy files get `variable_length: False`."""
+
+    checkpoint = torch.load(path, map_location="cpu")
+    if isinstance(checkpoint, dict) and checkpoint.get("format") == CHECKPOINT_FORMAT:
+        header = {"model_type": "lstm", **(checkpoint.get("header") or {})}
+        return checkpoint["state_dict"], header
+    return checkpoint, {"model_type": "lstm", "variable_length": False}
 
 
 class SequenceBuffer:
@@ -101,18 +124,240 @@ class DynamicGestureModel(nn.Module):
         self.relu = nn.ReLU()
         self.fc2 = nn.Linear(32, num_classes)
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self, x: torch.Tensor, lengths: torch.Tensor | None = None) -> torch.Tensor:
+        """
+        Classify a batch of sequences.
+
+        With `lengths`, each row of `x` only has that many real frames and the
+        rest is padding: the batch is packed so the LSTM stops at each row's
+        last real frame instead of running through the padding.
+        """
+
+        if lengths is not None:
+            x = nn.utils.rnn.pack_padded_sequence(
+                x, lengths.cpu(), batch_first=True, enforce_sorted=False
+            )
         _outputs, (hidden, _cell) = self.lstm(x)
         final_hidden = hidden[-1]
         return self.fc2(self.relu(self.fc1(final_hidden)))
 
 
+class _CausalConvBlock(nn.Module):
+    """
+    Dilated causal convolution with a residual connection, on (batch, time, channels).
+
+    The convolution is written as its taps: the input shifted by 0, d, 2d...
+    frames, concatenated and passed through one Linear. That is the same
+    function as `nn.Conv1d(..., dilation=d)` with causal padding, but PyTorch's
+    CPU kernel for dilated Conv1d is about 4x slower than the matmul.
+    """
+
+    def __init__(self, channels: int, dilation: int, kernel_size: int = 3, dropout: float = 0.2) -> None:
+        super().__init__()
+        self.dilation = int(dilation)
+        self.kernel_size = int(kernel_size)
+        self.taps = nn.Linear(kernel_size * channels, channels)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(dropout)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        steps = x.size(1)
+        padded = F.pad(x, (0, 0, (self.kernel_size - 1) * self.dilation, 0))
+        shifted = torch.cat(
+            [padded[:, tap * self.dilation : tap * self.dilation + steps] for tap in range(self.kernel_size)],
+            dim=-1,
+        )
+        return self.relu(x + self.dropout(self.relu(self.taps(shifted))))
+
+
+class DynamicTCNModel(nn.Module):
+    """
+    A small temporal convolution network, the alternative to the LSTM.
+
+    Every time step is computed in parallel instead of one after another.
+    The convolutions are causal with dilations 1, 2, 4 and 8 and kernel 3,
+    so the last frame sees the previous 30 frames. The output at a
+    sequence's last real frame does not depend on any padding after it,
+    which makes variable lengths a gather rather than packing. The MLP
+    head matches `DynamicGestureModel`, so class counts are read from
+    `fc2.weight` the same way.
+    """
+
+    def __init__(
+        self,
+        input_size: int = 126,
+        channels: int = 64,
+        dilations: tuple[int, ...] = (1, 2, 4, 8),
+        num_classes: int = 2,
+    ) -> None:
+        super().__init__()
+        self.input = nn.Linear(input_size, channels)
+        self.blocks = nn.Sequential(*(_CausalConvBlock(channels, dilation) for dilation in dilations))
+        self.fc1 = nn.Linear(channels, 32)
+        self.relu = nn.ReLU()
+        self.fc2 = nn.Linear(32, num_classes)
+
+    def forward(self, x: torch.Tensor, lengths: torch.Tensor | None = None) -> torch.Tensor:
+        features = self.blocks(self.input(x))
+        if lengths is None:
+            last = features[:, -1]
+        else:
+            positions = (lengths.to(features.device) - 1).clamp(min=0)
+            last = features[torch.arange(features.size(0), device=features.device), positions]
+        return self.fc2(self.relu(self.fc1(last)))
+
+
+def build_dynamic_model(
+    model_type: str,
+    *,
+    input_size: int = 126,
+    num_classes: int = 2,
+    hidden_size: int = 64,
+    num_layers: int = 2,
+) -> nn.Module:
+    """Instantiate one of `DYNAMIC_MODEL_TYPES`; `hidden_size`/`num_layers` are LSTM-only."""
+
+    if model_type == "lstm":
+        return DynamicGestureModel(
+            input_size=input_size,
+            hidden_size=hidden_size,
+            num_layers=num_layers,
+            num_classes=num_classes,
+        )
+    if model_type == "tcn":
+        return DynamicTCNModel(input_size=input_size, num_classes=num_classes)
+    raise ValueError(f"Unsupported dynamic model type: {model_type!r}; expected one of {DYNAMIC_MODEL_TYPES}")
+
+
+class DynamicPrefixStream:
+    """
+    Frame-by-frame classification of one dynamic gesture episode.
+
+    Each `push()` classifies the prefix seen so far exactly as
+    `DynamicInferenceRunner.infer_sequence()` would, carrying the LSTM state
+    over the real frames. For variable-length models that is one LSTM step
+    per frame. Legacy models expect sequences padded with their last frame,
+    so only that padding tail is re-run: `1 + length - n` steps for a prefix
+    of `n` frames instead of `length`. Other architectures have no state to
+    carry and classify the buffered prefix in one call.
+
+    `push()` returns a result only when the prefix may be committed early:
+    at least `min_frames` frames, and the same label at or above
+    `commit_confidence` for `stable_frames` consecutive prefixes. It does so
+    at most once per stream, so one episode cannot emit twice.
+
+    The LSTM is confidently wrong on short prefixes (a circle's first third
+    looks like a swipe), so `min_frames` matters as much as the threshold.
+    `python -m ml.benchmarks.dynamic_early_commit` calibrates both.
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        label_map: dict[int, str],
+        *,
+        sequence_length: int,
+        feature_size: int,
+        confidence_threshold: float,
+        commit_confidence: float,
+        min_frames: int,
+        stable_frames: int = 2,
+        pad_to_length: bool = True,
+    ) -> None:
+        self._model = model
+        self._pad_to_length = bool(pad_to_length)
+        self._label_map = label_map
+        self._sequence_length = int(sequence_length)
+        self._feature_size = int(feature_size)
+        self._confidence_threshold = float(confidence_threshold)
+        self._commit_confidence = float(commit_confidence)
+        self._min_frames = max(1, int(min_frames))
+        self._stable_frames = max(1, int(stable_frames))
+        self._state: tuple[torch.Tensor, torch.Tensor] | None = None
+        self._buffered: list[torch.Tensor] = []
+        self._frames = 0
+        self._streak_label = -1
+        self._streak = 0
+        self._committed = False
+        self._last_result: DynamicInferenceResult | None = None
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def committed(self) -> bool:
+        return self._committed
+
+    @property
+    def last_result(self) -> DynamicInferenceResult | None:
+        """Classification of the whole prefix pushed so far."""
+
+        return self._last_result
+
+    def push(self, features: list[float]) -> DynamicInferenceResult | None:
+        if self._frames >= self._sequence_length or len(features) != self._feature_size:
+            # infer_sequence() keeps the last `length` frames, which a carried
+            # state cannot; the caller falls back to it.
+            self._last_result = None
+            return None
+
+        frame = torch.tensor(features, dtype=torch.float32).view(1, 1, self._feature_size)
+        model = self._model
+        with torch.no_grad():
+            self._frames += 1
+            if isinstance(model, DynamicGestureModel):
+                _outputs, self._state = model.lstm(frame, self._state)
+                padding = self._sequence_length - self._frames if self._pad_to_length else 0
+                if padding:
+                    _outputs, (hidden, _cell) = model.lstm(frame.expand(1, padding, -1), self._state)
+                else:
+                    hidden = self._state[0]
+                logits = model.fc2(model.relu(model.fc1(hidden[-1])))
+            else:
+                self._buffered.append(frame)
+                logits = model(torch.cat(self._buffered, dim=1))
+            probs = F.softmax(logits, dim=1)
+            confidence_tensor, pred_tensor = torch.max(probs, dim=1)
+
+        confidence = float(confidence_tensor.item())
+        label_idx = int(pred_tensor.item())
+        label_name = self._label_map.get(label_idx, "UNKNOWN")
+        is_unknown = confidence < self._confidence_threshold or label_name == "UNKNOWN"
+        result = DynamicInferenceResult(
+            label_idx=-1 if is_unknown else label_idx,
+            label_name="UNKNOWN" if is_unknown else label_name,
+            confidence=confidence,
+            is_unknown=is_unknown,
+        )
+        self._last_result = result
+
+        if is_unknown or confidence < self._commit_confidence:
+            self._streak_label = -1
+            self._streak = 0
+            return None
+        if label_idx == self._streak_label:
+            self._streak += 1
+        else:
+            self._streak_label = label_idx
+            self._streak = 1
+        if (
+            self._committed or
+            self._frames < self._min_frames or
+            self._frames >= self._sequence_length or
+            self._streak < self._stable_frames
+        ):
+            return None
+        self._committed = True
+        return result
+
+
 class DynamicInferenceRunner:
     """
-    Runtime owner for the dynamic LSTM gesture model.
+    Runtime owner for the dynamic gesture model (LSTM or TCN, per checkpoint).
 
-    It mirrors the role of `StaticInferenceRunner`, but for fixed-length
-    sequences instead of single frames.
+    It mirrors the role of `StaticInferenceRunner`, but for sequences of up
+    to `sequence_length` frames instead of single frames.
     """
 
     def __init__(
@@ -135,7 +380,10 @@ class DynamicInferenceRunner:
         self._confidence_threshold = float(confidence_threshold)
         self._hidden_size = int(hidden_size)
         self._num_layers = int(num_layers)
-        self._model: DynamicGestureModel | None = None
+        self._model: nn.Module | None = None
+        self._model_type = ""
+        self._num_classes = 0
+        self._variable_length = False
         self._last_error = ""
 
         self.reload(model_path=self._model_path, label_map=self._label_map)
@@ -151,8 +399,11 @@ class DynamicInferenceRunner:
         self._model_path = str(model_path)
         self._label_map = dict(label_map)
         self._last_error = ""
+        self._variable_length = False
+        self._model_type = ""
 
         num_classes = self._infer_num_classes(self._model_path, self._label_map)
+        self._num_classes = max(0, num_classes)
         if num_classes <= 0:
             self._model = None
             self._last_error = (
@@ -161,16 +412,20 @@ class DynamicInferenceRunner:
             return
 
         try:
-            model = DynamicGestureModel(
+            state, header = load_dynamic_checkpoint(self._model_path)
+            model_type = str(header.get("model_type", "lstm"))
+            model = build_dynamic_model(
+                model_type,
                 input_size=self._feature_size,
+                num_classes=num_classes,
                 hidden_size=self._hidden_size,
                 num_layers=self._num_layers,
-                num_classes=num_classes,
             )
-            state = torch.load(self._model_path, map_location="cpu")
             model.load_state_dict(state)
             model.eval()
             self._model = model
+            self._model_type = model_type
+            self._variable_length = bool(header.get("variable_length", False))
         except FileNotFoundError:
             self._model = None
             self._last_error = f"Dynamic model file not found: {self._model_path}"
@@ -208,15 +463,18 @@ class DynamicInferenceRunner:
             prepared_sequence = [list(frame) for frame in sequence]
             if len(prepared_sequence) > self._sequence_length:
                 prepared_sequence = prepared_sequence[-self._sequence_length :]
-            while len(prepared_sequence) < self._sequence_length:
-                prepared_sequence.append(list(prepared_sequence[-1]))
+            # Variable-length models run only the real frames; legacy ones were
+            # trained on full windows padded with the last frame.
+            if not self._variable_length:
+                while len(prepared_sequence) < self._sequence_length:
+                    prepared_sequence.append(list(prepared_sequence[-1]))
 
             x = torch.tensor(prepared_sequence, dtype=torch.float32).unsqueeze(0)
-            if tuple(x.shape) != (1, self._sequence_length, self._feature_size):
+            if tuple(x.shape) != (1, len(prepared_sequence), self._feature_size):
                 self._last_error = (
                     "Dynamic sequence tensor has unexpected shape: "
                     f"{tuple(x.shape)}; expected "
-                    f"(1, {self._sequence_length}, {self._feature_size})."
+                    f"(1, {len(prepared_sequence)}, {self._feature_size})."
                 )
                 return DynamicInferenceResult(
                     label_idx=-1,
@@ -250,6 +508,54 @@ class DynamicInferenceRunner:
                 is_unknown=True,
             )
 
+    def infer_batch(self, sequences: list[list[list[float]]]) -> list[DynamicInferenceResult]:
+        """
+        Classify several sequences in one model call.
+
+        Used by the sliding-window recognizer, whose overlapping windows are
+        cheaper to run as one batch than one `infer_sequence()` each. Each
+        sequence is prepared as `infer_sequence()` would prepare it.
+        """
+
+        unknown = DynamicInferenceResult(label_idx=-1, label_name="UNKNOWN", confidence=0.0, is_unknown=True)
+        if self._model is None or not sequences or not all(sequences):
+            return [unknown for _ in sequences]
+
+        try:
+            prepared = [sequence[-self._sequence_length :] for sequence in sequences]
+            lengths = [len(sequence) for sequence in prepared]
+            steps = self._sequence_length if not self._variable_length else max(lengths)
+            x = torch.zeros(len(prepared), steps, self._feature_size, dtype=torch.float32)
+            for index, sequence in enumerate(prepared):
+                x[index, : len(sequence)] = torch.tensor(sequence, dtype=torch.float32)
+                if not self._variable_length:
+                    # Legacy checkpoints: pad with the last frame, as in training.
+                    x[index, len(sequence) :] = x[index, len(sequence) - 1]
+
+            with torch.no_grad():
+                if self._variable_length and min(lengths) != steps:
+                    logits = self._model(x, torch.tensor(lengths, dtype=torch.long))
+                else:
+                    logits = self._model(x)
+                confidences, predictions = torch.max(F.softmax(logits, dim=1), dim=1)
+        except Exception as exc:
+            self._last_error = f"Dynamic batch inference failed: {exc}"
+            return [unknown for _ in sequences]
+
+        results: list[DynamicInferenceResult] = []
+        for confidence, label_idx in zip(confidences.tolist(), predictions.tolist()):
+            label_name = self._label_map.get(label_idx, "UNKNOWN")
+            is_unknown = confidence < self._confidence_threshold or label_name == "UNKNOWN"
+            results.append(
+                DynamicInferenceResult(
+                    label_idx=-1 if is_unknown else label_idx,
+                    label_name="UNKNOWN" if is_unknown else label_name,
+                    confidence=confidence,
+                    is_unknown=is_unknown,
+                )
+            )
+        return results
+
     def infer(self, buffer: SequenceBuffer) -> DynamicInferenceResult:
         """
         Run dynamic inference only when the sequence buffer is full.
@@ -277,6 +583,48 @@ class DynamicInferenceRunner:
 
         return self.infer_sequence(buffer.to_list())
 
+    def open_stream(
+        self,
+        commit_confidence: float,
+        min_frames: int,
+        stable_frames: int = 2,
+    ) -> DynamicPrefixStream | None:
+        """
+        Start early-commit classification of a new episode.
+
+        The stream keeps the model and label map active when it was opened,
+        so a reload mid-episode cannot mix two models' states. Returns None
+        when no model is loaded.
+        """
+
+        if self._model is None:
+            return None
+        return DynamicPrefixStream(
+            self._model,
+            self._label_map,
+            sequence_length=self._sequence_length,
+            feature_size=self._feature_size,
+            confidence_threshold=self._confidence_threshold,
+            commit_confidence=commit_confidence,
+            min_frames=min_frames,
+            stable_frames=stable_frames,
+            pad_to_length=not self._variable_length,
+        )
+
+    def warm_up(self, iterations: int = 3) -> dict[str, Any]:
+        """
+        Classify a synthetic full-length sequence before live traffic.
+
+        The first LSTM forward pass is several times slower than later ones;
+        doing it here keeps that cost off the user's first dynamic gesture.
+        """
+
+        if self._model is None:
+            return {"skipped": self._last_error or "no model loaded"}
+
+        sequence = [[0.0] * self._feature_size for _ in range(self._sequence_length)]
+        return time_warm_up(lambda: self.infer_sequence(sequence), iterations)
+
     def get_last_error(self) -> str:
         """Return the most recent dynamic model error, if any."""
 
@@ -287,11 +635,30 @@ class DynamicInferenceRunner:
 
         return self._model_path
 
+    def get_model_type(self) -> str:
+        """Return the loaded architecture ("lstm" or "tcn"), or "" with no model."""
+
+        return self._model_type
+
+    def is_variable_length(self) -> bool:
+        """Return True when the loaded model takes unpadded sequences."""
+
+        return self._variable_length
+
     def get_label_map(self) -> dict[int, str]:
         """Return a copy of the active dynamic label map."""
 
         return dict(self._label_map)
 
+    def set_label_map(self, label_map: dict[int, str]) -> bool:
+        """Replace only the label names; see `StaticInferenceRunner.set_label_map`."""
+
+        new_map = dict(label_map)
+        if self._model is not None and max(new_map, default=-1) >= self._num_classes:
+            return False
+        self._label_map = new_map
+        return True
+
     def _infer_num_classes(self, model_path: str, label_map: dict[int, str]) -> int:
         """
         Infer the number of output classes from the saved state dict when
@@ -299,7 +666,7 @@ class DynamicInferenceRunner:
         """
 
         try:
-            state: dict[str, Any] = torch.load(model_path, map_location="cpu")
+            state, _header = load_dynamic_checkpoint(model_path)
             output_weight = state.get("fc2.weight")
             if output_weight is not None and hasattr(output_weight, "shape"):
                 shape = getattr(output_weight, "shape")
@@ -0,0 +1,316 @@
+"""
+Flight recorder: the last N seconds of per-frame pipeline decisions.
+
+Why this exists:
+"it fired Mute twice" or "the swipe was late" are only answerable if
+something remembers the frames before the report. The pipeline thread writes
+one fixed-size record per camera frame into a preallocated NumPy structured
+array used as a ring, so memory stays constant however long the service
+runs and nothing is allocated per frame.
+
+Strings (gate reasons, hints, labels, actions, decisions) are interned into a
+small table and stored as `u16` ids; id 0 is the empty string.
+
+`DUMP_FLIGHT_RECORDER` writes the ring to a binary file:
+
+    8    magic b"OCTFLREC"
+    4    u32 format version
+    4    u32 JSON header length
+    n    JSON header (dtype, string table, clock offsets, window)
+    ...  records, oldest first, in the dtype's little-endian layout
+
+Read a dump with:
+
+    python -m ml.runtime.flight_recorder ml/flight_recordings/<file>.bin
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+RECORDING_DIR = ROOT / "flight_recordings"
+
+FILE_MAGIC = b"OCTFLREC"
+FILE_VERSION = 1
+_FILE_PREFIX = struct.Struct("<8sII")
+_MAX_STRINGS = 0xFFFF
+
+# Timestamps are `time.monotonic()` seconds, the same clock as
+# `CameraFrame.timestamp`; the dump header carries the wall-clock offset.
+# Stage timings are milliseconds; NaN means the stage did not run.
+FLIGHT_RECORD_DTYPE = np.dtype(
+    [
+        ("frame_id", "<i8"),
+        ("capture_ts", "<f8"),
+        ("ingested_ts", "<f8"),
+        ("decided_ts", "<f8"),
+        ("hand_count", "u1"),
+        ("tracking_confidence", "<f4"),
+        ("gate1_passed", "u1"),
+        ("clutch_active", "u1"),
+        ("gate_reason", "<u2"),
+        ("raw_hint", "<u2"),
+        ("motion_score", "<f4"),
+        ("static_label", "<u2"),
+        ("static_confidence", "<f4"),
+        ("dynamic_label", "<u2"),
+        ("dynamic_confidence", "<f4"),
+        ("dynamic_frames", "<u2"),
+        ("router_label", "<u2"),
+        ("router_confidence", "<f4"),
+        ("action", "<u2"),
+        ("decision", "<u2"),
+        ("ingest_ms", "<f4"),
+        ("gates_ms", "<f4"),
+        ("static_ms", "<f4"),
+        ("dynamic_ms", "<f4"),
+        ("overlay_ms", "<f4"),
+    ]
+)
+STRING_FIELDS: tuple[str, ...] = (
+    "gate_reason",
+    "raw_hint",
+    "static_label",
+    "dynamic_label",
+    "router_label",
+    "action",
+    "decision",
+)
+TIMING_FIELDS: tuple[str, ...] = ("ingest_ms", "gates_ms", "static_ms", "dynamic_ms", "overlay_ms")
+
+_EMPTY_RECORD = np.zeros((), dtype=FLIGHT_RECORD_DTYPE)
+for _field in ("ingested_ts", "decided_ts", *TIMING_FIELDS):
+    _EMPTY_RECORD[_field] = np.nan
+
+
+class FlightRecorder:
+    """
+    Fixed-memory ring of per-frame records.
+
+    Only the pipeline thread writes: `begin()` claims the next slot and
+    returns a row view whose fields are filled in as the frame moves through
+    the stages. `snapshot()` and `dump()` may run on any thread; a dump taken
+    while a frame is in flight shows that frame's later fields as empty.
+    """
+
+    def __init__(self, seconds: float = 30.0, max_fps: float = 60.0) -> None:
+        self._seconds = max(1.0, float(seconds))
+        self._capacity = max(1, int(math.ceil(self._seconds * max(1.0, float(max_fps)))))
+        self._records = np.zeros(self._capacity, dtype=FLIGHT_RECORD_DTYPE)
+        self._lock = threading.Lock()
+        self._next = 0
+        self._written = 0
+        self._strings: list[str] = [""]
+        self._string_ids: dict[str, int] = {"": 0}
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    def intern(self, text: str | None) -> int:
+        """Return the id for `text`, adding it to the string table if new."""
+
+        if not text:
+            return 0
+        string_id = self._string_ids.get(text)
+        if string_id is not None:
+            return string_id
+        with self._lock:
+            string_id = self._string_ids.get(text)
+            if string_id is None:
+                if len(self._strings) >= _MAX_STRINGS:
+                    return 0
+                string_id = len(self._strings)
+                self._strings.append(text)
+                self._string_ids[text] = string_id
+            return string_id
+
+    def begin(self, frame_id: int, capture_ts: float) -> np.void:
+        """Claim the next slot for a new frame and return a writable row view."""
+
+        with self._lock:
+            index = self._next
+            self._next = (index + 1) % self._capacity
+            self._written += 1
+        records = self._records
+        records[index] = _EMPTY_RECORD
+        row = records[index]
+        row["frame_id"] = frame_id
+        row["capture_ts"] = capture_ts
+        return row
+
+    def snapshot(self) -> np.ndarray:
+        """Copy of the records within the window, oldest first."""
+
+        with self._lock:
+            written = self._written
+            start = self._next
+            if written < self._capacity:
+                ordered = self._records[:written].copy()
+            else:
+                ordered = np.concatenate((self._records[start:], self._records[:start]))
+        if len(ordered):
+            newest = float(ordered["capture_ts"][-1])
+            ordered = ordered[ordered["capture_ts"] >= newest - self._seconds]
+        return ordered
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "seconds": self._seconds,
+                "capacity": self._capacity,
+                "record_bytes": FLIGHT_RECORD_DTYPE.itemsize,
+                "frames_recorded": self._written,
+                "strings": len(self._strings),
+            }
+
+    def dump(self, path: str | Path | None = None) -> Path:
+        """Write the current window to a binary file and return its path."""
+
+        records = self.snapshot()
+        with self._lock:
+            strings = list(self._strings)
+        header = {
+            "dtype": FLIGHT_RECORD_DTYPE.descr,
+            "count": int(len(records)),
+            "seconds": self._seconds,
+            "capacity": self._capacity,
+            "strings": strings,
+            "wall_time": time.time(),
+            "monotonic_time": time.monotonic(),
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+
+        if path is None:
+            RECORDING_DIR.mkdir(parents=True, exist_ok=True)
+            path = RECORDING_DIR / time.strftime("flight_%Y%m%d_%H%M%S.bin")
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("wb") as handle:
+            handle.write(_FILE_PREFIX.pack(FILE_MAGIC, FILE_VERSION, len(header_bytes)))
+            handle.write(header_bytes)
+            handle.write(records.tobytes())
+        return output
+
+
+@dataclass(slots=True)
+class FlightRecording:
+    """A flight recorder dump loaded back into memory."""
+
+    records: np.ndarray
+    strings: list[str]
+    header: dict[str, Any]
+
+    def text(self, string_id: int) -> str:
+        string_id = int(string_id)
+        return self.strings[string_id] if 0 <= string_id < len(self.strings) else ""
+
+    def wall_time(self, monotonic_ts: float) -> float:
+        """Convert a recorded monotonic timestamp to Unix time."""
+
+        return float(self.header["wall_time"]) - (float(self.header["monotonic_time"]) - float(monotonic_ts))
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        """Yield records as dicts with string ids resolved, for tools and replay."""
+
+        names = self.records.dtype.names or ()
+        for record in self.records:
+            row: dict[str, Any] = {}
+            for name in names:
+                value = record[name].item()
+                row[name] = self.text(value) if name in STRING_FIELDS else value
+            yield row
+
+
+def load_flight_recording(path: str | Path) -> FlightRecording:
+    """Read a file written by `FlightRecorder.dump()`."""
+
+    data = Path(path).read_bytes()
+    if len(data) < _FILE_PREFIX.size:
+        raise ValueError(f"{path} is too short to be a flight recording.")
+    magic, version, header_length = _FILE_PREFIX.unpack_from(data, 0)
+    if magic != FILE_MAGIC:
+        raise ValueError(f"{path} is not a flight recording.")
+    if version != FILE_VERSION:
+        raise ValueError(f"{path} uses flight recording format {version}; expected {FILE_VERSION}.")
+    offset = _FILE_PREFIX.size
+    header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+    offset += header_length
+    dtype = np.dtype([tuple(field) for field in header["dtype"]])
+    records = np.frombuffer(data, dtype=dtype, count=int(header["count"]), offset=offset)
+    return FlightRecording(records=records, strings=list(header["strings"]), header=header)
+
+
+def _format_ms(value: float) -> str:
+    return "" if math.isnan(value) else f"{value:.1f}"
+
+
+def _format_float(value: float, digits: int = 2) -> str:
+    return "" if math.isnan(value) else f"{value:.{digits}f}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Print a flight recorder dump.")
+    parser.add_argument("path", help="file written by DUMP_FLIGHT_RECORDER")
+    parser.add_argument("--tail", type=int, default=0, help="only the last N frames")
+    parser.add_argument("--csv", action="store_true", help="write every field as CSV")
+    args = parser.parse_args(argv)
+
+    recording = load_flight_recording(args.path)
+    rows = list(recording.rows())
+    if args.tail > 0:
+        rows = rows[-args.tail:]
+
+    if args.csv:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(recording.records.dtype.names or ()))
+        writer.writeheader()
+        writer.writerows(rows)
+        return 0
+
+    if not rows:
+        print("no frames recorded")
+        return 0
+
+    origin = rows[0]["capture_ts"]
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(recording.wall_time(origin)))
+    print(f"{len(rows)} frames starting {started}")
+    print(
+        f"{'frame':>8} {'t_ms':>8} {'hands':>5} {'conf':>5} {'gate':<20} {'hint':<12} "
+        f"{'static':<14} {'dynamic':<14} {'router':<14} {'action':<18} {'decision':<18} "
+        f"{'ingest':>6} {'gates':>6} {'static':>6} {'dyn':>6} {'overlay':>7}"
+    )
+    for row in rows:
+        static = f"{row['static_label']}:{_format_float(row['static_confidence'])}" if row["static_label"] else ""
+        dynamic = f"{row['dynamic_label']}:{_format_float(row['dynamic_confidence'])}" if row["dynamic_label"] else ""
+        router = f"{row['router_label']}:{_format_float(row['router_confidence'])}" if row["router_label"] else ""
+        print(
+            f"{row['frame_id']:>8} {(row['capture_ts'] - origin) * 1000.0:>8.1f} "
+            f"{row['hand_count']:>5} {_format_float(row['tracking_confidence']):>5} "
+            f"{row['gate_reason']:<20} {row['raw_hint']:<12} {static:<14} {dynamic:<14} "
+            f"{router:<14} {row['action']:<18} {row['decision']:<18} "
+            f"{_format_ms(row['ingest_ms']):>6} {_format_ms(row['gates_ms']):>6} "
+            f"{_format_ms(row['static_ms']):>6} {_format_ms(row['dynamic_ms']):>6} "
+            f"{_format_ms(row['overlay_ms']):>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
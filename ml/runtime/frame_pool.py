@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+np_error = ""
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on local runtime
+    np = None  # type: ignore[assignment]
+    np_error = str(exc)
+
+
+class FrameBufferPool:
+    """
+    Fixed-size pool of preallocated image buffers shared by capture and preview.
+
+    Why this exists:
+    every camera read used to allocate a fresh ~900 KB array, then `.copy()`
+    and `cv2.flip` each allocated another, and the overlay renderer copied the
+    frame once more. At 30 fps that is roughly 100 MB/s of allocator churn for
+    data that is thrown away a frame later.
+
+    The pool hands out buffers with a reference count of one. Anyone who keeps
+    a buffer past the current stage calls `retain()`, and every holder calls
+    `release()` when done. A buffer only returns to the free list when its
+    count reaches zero, so a frame that the pipeline is still reading can never
+    be overwritten by the capture thread.
+
+    When every buffer is in use the pool falls back to a plain allocation and
+    counts it as an exhaustion. Those overflow arrays are not tracked, so
+    releasing them is a harmless no-op. That keeps capture running even if a
+    consumer leaks a reference, while the stats make the leak visible.
+    """
+
+    def __init__(self, capacity: int = 4, name: str = "frames") -> None:
+        self._capacity = max(1, int(capacity))
+        self._name = str(name)
+        self._lock = threading.Lock()
+        self._free: list[Any] = []
+        self._in_use: dict[int, list[Any]] = {}
+        self._allocated = 0
+
+        self._acquires = 0
+        self._reuses = 0
+        self._allocations = 0
+        self._reshapes = 0
+        self._exhaustions = 0
+        self._releases = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def acquire(self, shape: tuple[int, ...], dtype: Any = None) -> Any | None:
+        """
+        Return a writable buffer with the requested shape and dtype.
+
+        Returns:
+            A pooled array, an overflow array when the pool is exhausted, or
+            `None` when NumPy is unavailable.
+        """
+
+        if np is None:
+            return None
+
+        dtype = np.dtype(dtype if dtype is not None else np.uint8)
+        shape = tuple(int(dim) for dim in shape)
+
+        with self._lock:
+            self._acquires += 1
+
+            for index, candidate in enumerate(self._free):
+                if candidate.shape == shape and candidate.dtype == dtype:
+                    buffer = self._free.pop(index)
+                    self._reuses += 1
+                    self._in_use[id(buffer)] = [buffer, 1]
+                    return buffer
+
+            if self._allocated < self._capacity:
+                self._allocated += 1
+                self._allocations += 1
+                buffer = np.empty(shape, dtype=dtype)
+                self._in_use[id(buffer)] = [buffer, 1]
+                return buffer
+
+            if self._free:
+                # The capture resolution changed (new camera or driver
+                # renegotiation). Recycle a stale free slot instead of growing
+                # past the configured capacity.
+                self._free.pop(0)
+                self._reshapes += 1
+                buffer = np.empty(shape, dtype=dtype)
+                self._in_use[id(buffer)] = [buffer, 1]
+                return buffer
+
+            self._exhaustions += 1
+
+        return np.empty(shape, dtype=dtype)
+
+    def retain(self, buffer: Any) -> None:
+        """Add one reference to a pooled buffer. Overflow arrays are ignored."""
+
+        if buffer is None:
+            return
+        with self._lock:
+            entry = self._in_use.get(id(buffer))
+            if entry is not None and entry[0] is buffer:
+                entry[1] += 1
+
+    def release(self, buffer: Any) -> None:
+        """Drop one reference and return the buffer to the pool at zero."""
+
+        if buffer is None:
+            return
+        with self._lock:
+            entry = self._in_use.get(id(buffer))
+            if entry is None or entry[0] is not buffer:
+                return
+            entry[1] -= 1
+            self._releases += 1
+            if entry[1] <= 0:
+                del self._in_use[id(buffer)]
+                self._free.append(buffer)
+
+    def owns(self, buffer: Any) -> bool:
+        """Return True when `buffer` is currently checked out of this pool."""
+
+        with self._lock:
+            entry = self._in_use.get(id(buffer))
+            return entry is not None and entry[0] is buffer
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool occupancy and reuse counters."""
+
+        with self._lock:
+            return {
+                "name": self._name,
+                "capacity": self._capacity,
+                "allocated": self._allocated,
+                "in_use": len(self._in_use),
+                "free": len(self._free),
+                "acquires": self._acquires,
+                "reuses": self._reuses,
+                "allocations": self._allocations,
+                "reshapes": self._reshapes,
+                "exhaustions": self._exhaustions,
+                "releases": self._releases,
+            }
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class InferenceResult:
+    """
+    A small internal result type used by the stabilizer/cooldown stage.
+
+    This is intentionally narrower than the richer runtime dataclasses because
+    the stabilizer only needs a label and a confidence value.
+    """
+
+    label: str
+    confidence: float
+
+
+_UNKNOWN = "UNKNOWN"
+
+
+class GestureStabilizer:
+    """
+    Confirmation filter for recognized gesture labels.
+
+    Why this still exists in Phase 1:
+    the new gate pipeline controls *whether* a frame may reach inference, but
+    it does not replace the existing output confirmation policy. We still want
+    to demand a few consistent model predictions before emitting a gesture over
+    IPC, otherwise the runtime will feel twitchy.
+
+    The window is a fixed ring of (label, confidence) slots with running
+    per-label counts and confidence sums, so each frame costs O(1) however
+    large the window is. A label is confirmed by whichever policy fires first:
+    - count: it appears at least `min_confirmation_frames` times in the window
+    - weighted: its confidences in the window sum to `min_weighted_score`
+      (off when None). Two 0.75 frames score 1.5; so do one 0.80 and one 0.70
+    - immediate: this frame's confidence is at least `immediate_confidence`
+      (off when None). Saves the confirmation frame for confident gestures
+    """
+
+    def __init__(
+        self,
+        window_size: int = 5,
+        min_confirmation_frames: int = 2,
+        min_confidence: float = 0.85,
+        *,
+        immediate_confidence: float | None = None,
+        min_weighted_score: float | None = None,
+    ) -> None:
+        self.window_size = max(1, int(window_size))
+        self.min_confirmation_frames = int(min_confirmation_frames)
+        self.min_confidence = float(min_confidence)
+        self.immediate_confidence = None if immediate_confidence is None else float(immediate_confidence)
+        self.min_weighted_score = None if min_weighted_score is None else float(min_weighted_score)
+        self._labels: list[str] = [_UNKNOWN] * self.window_size
+        self._confidences: list[float] = [0.0] * self.window_size
+        self._next = 0
+        self._filled = 0
+        self._counts: dict[str, int] = {}
+        self._weights: dict[str, float] = {}
+
+    @property
+    def history(self) -> list[str]:
+        """Labels in the window, oldest first (UNKNOWN for rejected frames)."""
+
+        if self._filled < self.window_size:
+            return self._labels[:self._filled]
+        return self._labels[self._next:] + self._labels[:self._next]
+
+    def count(self, label: str) -> int:
+        return self._counts.get(label, 0)
+
+    def score(self, label: str) -> float:
+        return self._weights.get(label, 0.0)
+
+    def reset(self) -> None:
+        """Clear stabilizer history on mode changes or hard tracking loss."""
+
+        self._next = 0
+        self._filled = 0
+        self._counts.clear()
+        self._weights.clear()
+
+    def __call__(self, result: InferenceResult) -> InferenceResult:
+        """
+        Confirm only labels that appear consistently in the recent history.
+
+        Unknown or low-confidence results are still pushed into history as
+        UNKNOWN so that the stabilizer naturally cools off when tracking gets
+        noisy.
+        """
+
+        label = result.label
+        confidence = result.confidence
+        rejected = label == _UNKNOWN or confidence < self.min_confidence
+        if rejected:
+            label = _UNKNOWN
+
+        # Ring update, inlined: this runs on every frame with a hand.
+        # UNKNOWN slots are counted but carry no confidence weight.
+        index = self._next
+        counts = self._counts
+        weights = self._weights
+        if self._filled == self.window_size:
+            old_label = self._labels[index]
+            remaining = counts[old_label] - 1
+            if remaining:
+                counts[old_label] = remaining
+                if old_label != _UNKNOWN:
+                    weights[old_label] -= self._confidences[index]
+            else:
+                # Dropping the key also drops any accumulated float drift.
+                del counts[old_label]
+                weights.pop(old_label, None)
+        else:
+            self._filled += 1
+        self._labels[index] = label
+        count = counts.get(label, 0) + 1
+        counts[label] = count
+        self._next = index + 1 if index + 1 < self.window_size else 0
+
+        if rejected:
+            return InferenceResult(label=_UNKNOWN, confidence=confidence)
+
+        self._confidences[index] = confidence
+        score = weights.get(label, 0.0) + confidence
+        weights[label] = score
+
+        if count >= self.min_confirmation_frames:
+            return result
+        if self.immediate_confidence is not None and confidence >= self.immediate_confidence:
+            return result
+        if self.min_weighted_score is not None and score >= self.min_weighted_score:
+            return result
+
+        return InferenceResult(label=_UNKNOWN, confidence=confidence)
+
+
+def _self_test():
+    """Check the ring, running counts and each confirmation policy."""
+    passed = 0
+    failed = 0
+
+    def _check(name, fn):
+        nonlocal passed, failed
+        try:
+            fn()
+            print(f"  [PASS] {name}")
+            passed += 1
+        except Exception as exc:
+            print(f"  [FAIL] {name}: {exc}")
+            failed += 1
+
+    def feed(stabilizer, *frames):
+        return [stabilizer(InferenceResult(label, confidence)).label for label, confidence in frames]
+
+    def t_two_of_five():
+        out = feed(GestureStabilizer(min_confidence=0.7), ("A", 0.9), ("B", 0.9), ("A", 0.9))
+        assert out == ["UNKNOWN", "UNKNOWN", "A"], out
+
+    _check("default 2-of-5 confirmation", t_two_of_five)
+
+    def t_low_confidence_is_unknown():
+        stabilizer = GestureStabilizer(min_confidence=0.8)
+        out = feed(stabilizer, ("A", 0.79), ("A", 0.79), ("A", 0.79))
+        assert out == ["UNKNOWN"] * 3, out
+        assert stabilizer.count("UNKNOWN") == 3 and stabilizer.count("A") == 0
+
+    _check("low confidence counts as UNKNOWN", t_low_confidence_is_unknown)
+
+    def t_eviction():
+        stabilizer = GestureStabilizer(window_size=3, min_confidence=0.5)
+        feed(stabilizer, ("A", 0.9), ("B", 0.6), ("B", 0.7), ("C", 0.8))
+        assert stabilizer.history == ["B", "B", "C"], stabilizer.history
+        assert stabilizer.count("A") == 0 and stabilizer.count("B") == 2
+        assert abs(stabilizer.score("B") - 1.3) < 1e-9, stabilizer.score("B")
+        # The next C evicts the oldest B and confirms C.
+        assert feed(stabilizer, ("C", 0.8)) == ["C"]
+        assert stabilizer.history == ["B", "C", "C"], stabilizer.history
+
+    _check("ring eviction keeps running counts and scores", t_eviction)
+
+    def t_matches_list_reference():
+        import random
+
+        rng = random.Random(7)
+        stabilizer = GestureStabilizer(window_size=5, min_confidence=0.72)
+        history = []
+        for _ in range(5000):
+            label = rng.choice(["A", "B", "C", "UNKNOWN"])
+            confidence = rng.random()
+            expected_label = label if label != "UNKNOWN" and confidence >= 0.72 else "UNKNOWN"
+            history.append(expected_label)
+            history = history[-5:]
+            expected = (
+                expected_label
+                if expected_label != "UNKNOWN" and history.count(expected_label) >= 2
+                else "UNKNOWN"
+            )
+            got = stabilizer(InferenceResult(label, confidence)).label
+            assert got == expected, (got, expected, history)
+
+    _check("matches the list-based 2-of-5 filter", t_matches_list_reference)
+
+    def t_immediate():
+        stabilizer = GestureStabilizer(min_confidence=0.7, immediate_confidence=0.95)
+        assert feed(stabilizer, ("A", 0.96)) == ["A"]
+        assert feed(stabilizer, ("B", 0.94)) == ["UNKNOWN"]
+
+    _check("immediate commit above threshold", t_immediate)
+
+    def t_weighted():
+        stabilizer = GestureStabilizer(
+            window_size=5, min_confirmation_frames=3, min_confidence=0.7, min_weighted_score=1.8
+        )
+        assert feed(stabilizer, ("A", 0.95), ("A", 0.9)) == ["UNKNOWN", "A"]
+        stabilizer.reset()
+        assert feed(stabilizer, ("A", 0.75), ("A", 0.75), ("A", 0.75)) == ["UNKNOWN", "UNKNOWN", "A"]
+
+    _check("confidence-weighted score", t_weighted)
+
+    def t_reset():
+        stabilizer = GestureStabilizer(min_confidence=0.7)
+        feed(stabilizer, ("A", 0.9))
+        stabilizer.reset()
+        assert stabilizer.history == [] and feed(stabilizer, ("A", 0.9)) == ["UNKNOWN"]
+
+    _check("reset clears the window", t_reset)
+
+    print(f"\n  Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    print("Gesture Stabilizer Self-Test")
+    print("=" * 40)
+    ok = _self_test()
+    sys.exit(0 if ok else 1)
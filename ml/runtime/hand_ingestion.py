@@ -3,8 +3,11 @@ from __future__ import annotations
 import math
 from typing import Any
 
+import numpy as np
+
 from ml.feature_extraction import extract_features
 from ml.runtime.types import CameraFrame, HandDetection, NormalizedHandFrame
+from ml.runtime.warm_up import time_warm_up
 
 mp_error = ""
 try:
@@ -216,6 +219,29 @@ class HandIngestion:
             raw_gesture_hint=detection.raw_gesture_hint,
         )
 
+    def warm_up(self, iterations: int = 2, width: int = 640, height: int = 480) -> dict[str, Any]:
+        """
+        Push blank frames through MediaPipe before the camera delivers real ones.
+
+        `Hands` starts its graph and loads the palm and landmark models on the
+        first `process()` call, which otherwise lands on the user's first
+        frame. A blank frame is enough to trigger that work.
+        """
+
+        if self._hands is None:
+            return {"skipped": self._last_error or "MediaPipe Hands unavailable"}
+
+        frame = CameraFrame(
+            frame_bgr=np.zeros((height, width, 3), dtype=np.uint8),
+            frame_rgb=None,
+            timestamp=0.0,
+            frame_id=-1,
+            camera_index=-1,
+        )
+        result = time_warm_up(lambda: self.process_frame(frame), iterations)
+        self._last_hand_count = 0
+        return result
+
     def _create_hands(self, min_detection_confidence: float) -> Any | None:
         """
         Create the MediaPipe Hands runtime.
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Sequence
+
+# Millisecond buckets that cover both sub-millisecond queue waits and
+# multi-frame pipeline latencies.
+LATENCY_MS_BOUNDS: tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0,
+    50.0, 75.0, 100.0, 150.0, 250.0, 500.0, 1000.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram that is cheap enough to update once per frame.
+
+    Observations are counted into buckets with the given upper bounds plus one
+    overflow bucket. Percentiles are reported as the upper bound of the bucket
+    that contains them, which is the usual trade-off for constant memory: it
+    is exact enough to see a p95 move from 2 ms to 8 ms, and it never grows.
+    """
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_MS_BOUNDS) -> None:
+        self._bounds = tuple(sorted(float(bound) for bound in bounds))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = float("inf")
+        self._max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        value = float(value)
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self._bounds) + 1)
+            self._count = 0
+            self._sum = 0.0
+            self._min = float("inf")
+            self._max = float("-inf")
+
+    def percentile(self, quantile: float) -> float:
+        """Return the bucket upper bound containing `quantile` (0.0-1.0)."""
+
+        with self._lock:
+            return self._percentile_locked(quantile)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return counts plus summary statistics as a JSON-friendly dict."""
+
+        with self._lock:
+            if self._count == 0:
+                return {"count": 0}
+            return {
+                "count": self._count,
+                "mean": round(self._sum / self._count, 4),
+                "min": round(self._min, 4),
+                "max": round(self._max, 4),
+                "p50": self._percentile_locked(0.50),
+                "p95": self._percentile_locked(0.95),
+                "p99": self._percentile_locked(0.99),
+                "bounds": list(self._bounds),
+                "counts": list(self._counts),
+            }
+
+    def _percentile_locked(self, quantile: float) -> float:
+        if self._count == 0:
+            return 0.0
+        target = max(1, int(round(self._count * min(1.0, max(0.0, quantile)))))
+        running = 0
+        for index, count in enumerate(self._counts):
+            running += count
+            if running >= target:
+                if index < len(self._bounds):
+                    return min(self._bounds[index], self._max)
+                return self._max
+        return self._max
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from ml.runtime.histogram import Histogram
+
+# Hops between the monotonic timestamps carried by a frame trace, in pipeline
+# order. The last entry is the end-to-end motion-to-event latency.
+TRACE_HOPS: tuple[tuple[str, str, str], ...] = (
+    ("capture_to_ingested", "capture", "ingested"),
+    ("ingested_to_inferred", "ingested", "inferred"),
+    ("inferred_to_sent", "inferred", "sent"),
+    ("capture_to_sent", "capture", "sent"),
+)
+
+
+class LatencyTracer:
+    """
+    Collect per-hop latency for gesture events, from capture to IPC send.
+
+    Why this exists:
+    `CameraFrame.timestamp` used to stop at ingestion, so "the swipe felt
+    late" could not be split into camera, MediaPipe, model and queueing time.
+    The pipeline now carries a small trace dict with the frame id and
+    `time.monotonic()` stamps for capture, ingestion done and inference done.
+    The outbound writer stamps `sent` right before handing the event to the
+    sockets and calls `record()`.
+
+    Distributions are always collected because the cost is one histogram
+    update per hop per event. Whether the trace is also copied into the
+    outbound payload is a separate switch (`include_in_payload`), so clients
+    that do not care never see the extra field.
+    """
+
+    def __init__(self, include_in_payload: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._include_in_payload = bool(include_in_payload)
+        self._hops = {name: Histogram() for name, _, _ in TRACE_HOPS}
+        self._events = 0
+        self._by_kind: dict[str, Histogram] = {}
+
+    @property
+    def include_in_payload(self) -> bool:
+        return self._include_in_payload
+
+    def set_include_in_payload(self, enabled: bool) -> None:
+        self._include_in_payload = bool(enabled)
+
+    def record(self, trace: dict[str, Any]) -> None:
+        """Add one completed trace. Missing stages skip the hops that need them."""
+
+        for name, start, end in TRACE_HOPS:
+            started_at = trace.get(start)
+            ended_at = trace.get(end)
+            if started_at is None or ended_at is None:
+                continue
+            self._hops[name].observe((float(ended_at) - float(started_at)) * 1000.0)
+
+        kind = str(trace.get("kind", ""))
+        capture = trace.get("capture")
+        sent = trace.get("sent")
+        with self._lock:
+            self._events += 1
+            if kind and capture is not None and sent is not None:
+                histogram = self._by_kind.get(kind)
+                if histogram is None:
+                    histogram = self._by_kind[kind] = Histogram()
+        if kind and capture is not None and sent is not None:
+            histogram.observe((float(sent) - float(capture)) * 1000.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            for histogram in self._hops.values():
+                histogram.reset()
+            self._by_kind = {}
+            self._events = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            by_kind = dict(self._by_kind)
+            events = self._events
+        return {
+            "events": events,
+            "include_in_payload": self._include_in_payload,
+            "hops_ms": {name: histogram.snapshot() for name, histogram in self._hops.items()},
+            "capture_to_sent_ms_by_kind": {
+                kind: histogram.snapshot() for kind, histogram in by_kind.items()
+            },
+        }
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_COALESCED = 2
+# Answers to one client's request command. Never dropped: the requester is
+# waiting for exactly this message and a broadcast will not replace it.
+PRIORITY_REPLY = 3
+
+_PRIORITY_NAMES = {
+    PRIORITY_HIGH: "high",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_COALESCED: "coalesced",
+}
+
+# Discrete actions and training results are what the user is waiting on, so
+# they jump ahead of status chatter.
+HIGH_PRIORITY_TYPES = frozenset({"gesture", "voice", "training", "training_progress"})
+
+
+class OutboundEventQueue:
+    """
+    Bounded, prioritized hand-off between producers and the IPC writer.
+
+    Why this exists:
+    `_send` used to serialize and write on whatever thread produced the
+    event, which is usually the camera pipeline. Any stall in the consumer
+    then stalled MediaPipe and inference too. Producers now only append to
+    this queue; a dedicated writer thread drains it and calls `deliver`.
+
+    Ordering rules:
+    - high-priority events (discrete gestures, voice, training) go first
+    - replies to a client's request command go next
+    - normal events (status, mode, metrics) follow, in arrival order
+    - coalesced events (continuous slider / drag / cursor updates) keep only
+      one pending entry per key; a newer update replaces the pending one
+
+    Continuous payloads carry per-frame deltas, so a plain "keep the latest"
+    would lose movement whenever the writer falls behind. Fields named in
+    `accumulate` are therefore summed into the replacement instead.
+
+    When the queue is full the oldest entry of the lowest class present is
+    dropped, so a backlog of status messages can never push out a gesture.
+    Replies are never dropped; there is at most one per command, so they
+    cannot grow without bound.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[dict[str, Any]], None],
+        *,
+        max_pending: int = 256,
+        name: str = "MlServiceWriter",
+    ) -> None:
+        self._deliver = deliver
+        self._max_pending = max(1, int(max_pending))
+        self._name = name
+
+        self._condition = threading.Condition()
+        self._high: deque[dict[str, Any]] = deque()
+        self._normal: deque[dict[str, Any]] = deque()
+        self._replies: deque[dict[str, Any]] = deque()
+        self._coalesced: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+        self._enqueued = 0
+        self._delivered = 0
+        self._coalesced_count = 0
+        self._delivery_errors = 0
+        self._max_depth = 0
+        self._dropped = {name: 0 for name in _PRIORITY_NAMES.values()}
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running and self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._writer_loop, name=self._name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the writer after it flushes what is already queued."""
+
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def put(
+        self,
+        payload: dict[str, Any],
+        *,
+        priority: int | None = None,
+        coalesce_key: str | None = None,
+        accumulate: tuple[str, ...] = (),
+    ) -> None:
+        """
+        Queue `payload` without blocking.
+
+        Passing `coalesce_key` makes the event replace any pending event with
+        the same key. Without an explicit `priority`, the payload type decides
+        between high and normal.
+        """
+
+        with self._condition:
+            self._enqueued += 1
+            if coalesce_key is not None:
+                pending = self._coalesced.get(coalesce_key)
+                if pending is not None:
+                    merged = dict(payload)
+                    for field in accumulate:
+                        try:
+                            merged[field] = float(pending.get(field, 0.0)) + float(
+                                payload.get(field, 0.0)
+                            )
+                        except (TypeError, ValueError):
+                            pass
+                    # Replace in place so the key keeps its place in line.
+                    self._coalesced[coalesce_key] = merged
+                    self._coalesced_count += 1
+                    self._condition.notify()
+                    return
+                self._make_room_locked()
+                self._coalesced[coalesce_key] = dict(payload)
+            else:
+                if priority is None:
+                    priority = (
+                        PRIORITY_HIGH
+                        if str(payload.get("type", "")) in HIGH_PRIORITY_TYPES
+                        else PRIORITY_NORMAL
+                    )
+                self._make_room_locked()
+                if priority == PRIORITY_REPLY:
+                    self._replies.append(payload)
+                elif priority == PRIORITY_HIGH:
+                    self._high.append(payload)
+                else:
+                    self._normal.append(payload)
+
+            depth = self._depth_locked()
+            if depth > self._max_depth:
+                self._max_depth = depth
+            self._condition.notify()
+
+    def depth(self) -> int:
+        with self._condition:
+            return self._depth_locked()
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "depth": self._depth_locked(),
+                "depth_by_priority": {
+                    "high": len(self._high),
+                    "reply": len(self._replies),
+                    "normal": len(self._normal),
+                    "coalesced": len(self._coalesced),
+                },
+                "max_depth": self._max_depth,
+                "max_pending": self._max_pending,
+                "enqueued": self._enqueued,
+                "delivered": self._delivered,
+                "coalesced": self._coalesced_count,
+                "dropped": dict(self._dropped),
+                "delivery_errors": self._delivery_errors,
+            }
+
+    def _depth_locked(self) -> int:
+        return len(self._high) + len(self._replies) + len(self._normal) + len(self._coalesced)
+
+    def _make_room_locked(self) -> None:
+        if self._depth_locked() < self._max_pending:
+            return
+        if self._coalesced:
+            self._coalesced.popitem(last=False)
+            self._dropped["coalesced"] += 1
+        elif self._normal:
+            self._normal.popleft()
+            self._dropped["normal"] += 1
+        elif self._high:
+            self._high.popleft()
+            self._dropped["high"] += 1
+
+    def _pop_locked(self) -> dict[str, Any] | None:
+        if self._high:
+            return self._high.popleft()
+        if self._replies:
+            return self._replies.popleft()
+        if self._normal:
+            return self._normal.popleft()
+        if self._coalesced:
+            return self._coalesced.popitem(last=False)[1]
+        return None
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and self._depth_locked() == 0:
+                    self._condition.wait()
+                payload = self._pop_locked()
+                if payload is None:
+                    return
+
+            try:
+                self._deliver(payload)
+            except Exception:
+                with self._condition:
+                    self._delivery_errors += 1
+                continue
+            with self._condition:
+                self._delivered += 1
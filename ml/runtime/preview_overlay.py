@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from ml.runtime.frame_pool import FrameBufferPool
 from ml.runtime.types import DynamicInferenceResult, NormalizedHandFrame, PreviewState
 
 cv2_error = ""
@@ -20,10 +21,18 @@ class PreviewOverlayRenderer:
     now, but it should stay visually quiet. The goal is guidance, not a
     dashboard. That is why this renderer uses small labels, a simple clutch bar,
     and plain landmark visuals instead of heavy panels or decorative graphics.
+
+    Canvases come from a small buffer pool. A canvas returned by `render()` or
+    `render_dynamic()` stays valid until the next `render()` call, which is
+    when the previous frame's canvases go back to the pool. The service
+    encodes the preview synchronously inside one loop iteration, so that
+    lifetime is enough and no per-frame allocation is needed.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, frame_pool: FrameBufferPool | None = None) -> None:
         self._last_error = ""
+        self._frame_pool = frame_pool or FrameBufferPool(capacity=3, name="overlay")
+        self._held_canvases: list[Any] = []
 
     def render(
         self,
@@ -38,11 +47,13 @@ class PreviewOverlayRenderer:
             A new annotated frame on success, or the original frame value when
             drawing cannot proceed.
 
-        We always draw on `frame.copy()` rather than the original frame because
+        We always draw on a pooled copy rather than the original frame because
         overlay rendering is a presentation concern. Downstream logic should not
         receive a mutated frame by surprise.
         """
 
+        self._release_held_canvases()
+
         if frame_bgr is None:
             return None
 
@@ -51,7 +62,7 @@ class PreviewOverlayRenderer:
             return frame_bgr
 
         try:
-            canvas = frame_bgr.copy()
+            canvas = self._copy_to_canvas(frame_bgr)
         except Exception as exc:
             self._last_error = f"Could not copy preview frame: {exc}"
             return frame_bgr
@@ -77,6 +88,11 @@ class PreviewOverlayRenderer:
 
         return self._last_error
 
+    def get_frame_pool_stats(self) -> dict[str, Any]:
+        """Return occupancy and reuse counters for the overlay canvas pool."""
+
+        return self._frame_pool.stats()
+
     def render_dynamic(
         self,
         frame_bgr: Any | None,
@@ -96,7 +112,7 @@ class PreviewOverlayRenderer:
         try:
             # Always copy before drawing to avoid mutating the input frame.
             # Frame references can be reused, so in-place mutations cause duplication.
-            canvas = frame_bgr.copy()
+            canvas = self._copy_to_canvas(frame_bgr)
         except Exception as exc:
             self._last_error = f"Could not copy preview frame in render_dynamic: {exc}"
             return frame_bgr
@@ -128,6 +144,27 @@ class PreviewOverlayRenderer:
             self._last_error = f"Dynamic overlay rendering failed: {exc}"
             return frame_bgr
 
+    def _copy_to_canvas(self, frame_bgr: Any) -> Any:
+        """Copy `frame_bgr` into a pooled canvas held until the next render."""
+
+        canvas = self._frame_pool.acquire(frame_bgr.shape, frame_bgr.dtype)
+        if canvas is None:
+            return frame_bgr.copy()
+        try:
+            canvas[...] = frame_bgr
+        except Exception:
+            self._frame_pool.release(canvas)
+            raise
+        self._held_canvases.append(canvas)
+        return canvas
+
+    def _release_held_canvases(self) -> None:
+        """Return the previous frame's canvases to the pool."""
+
+        for canvas in self._held_canvases:
+            self._frame_pool.release(canvas)
+        self._held_canvases.clear()
+
     def _draw_status(self, frame_bgr: Any, preview_state: PreviewState) -> None:
         """
         Draw the small, high-signal text labels used by the live preview.
@@ -9,15 +9,32 @@ hijacked-actions blacklist before being forwarded.
 Config files
 ------------
 * ``ml/config/default_mapping.json`` — read-only factory gestures.
+* ``ml/config/user_mapping.json``    — custom gestures and action overrides.
 * ``ml/config/override_state.json``  — runtime blacklist maintained by the
   training / deletion lifecycle.
+
+All three are read through the shared ``ConfigStore``, so ``reload()`` only
+parses a file again when it changed on disk.
+
+Routing tables
+--------------
+``resolve`` and ``get_action`` run on every frame that yields a label, so
+``reload()`` compiles the config into immutable per-gesture-type tables
+(label id -> name / action / hijacked / disabled, label name -> id / action)
+and publishes them with a single attribute assignment.  Readers grab the
+current ``RoutingTables`` once per call and never see a half-built state;
+no lock is taken on the frame path.  Label ids are the mapping keys, which
+are also the models' class indices.
 """
 
 from __future__ import annotations
+from dataclasses import dataclass, field
 from pathlib import Path
-import json
+from types import MappingProxyType
+
+from typing import Any, Mapping, Optional
 
-from typing import Any, Optional
+from ml.runtime.config_store import CONFIG_STORE, ConfigStore
 
 ROOT = Path(__file__).resolve().parent.parent
 CONFIG_DIR = ROOT / "config"
@@ -30,6 +47,143 @@ OVERRIDE_STATE_PATH = CONFIG_DIR / "override_state.json"
 # Confidence floor below which any result is treated as UNKNOWN.
 _DEFAULT_CONFIDENCE_THRESHOLD = 0.60
 
+# Label id returned by ``resolve_id`` when nothing should fire.
+UNKNOWN_LABEL_ID = -1
+
+_EMPTY_MAPPING: Mapping[Any, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingTable:
+    """Compiled lookups for one gesture type.  Never mutated after build."""
+
+    # Indexed by label id; gaps in the mapping keys hold "" / "Unknown" / False.
+    names: tuple[str, ...] = ()
+    actions: tuple[str, ...] = ()
+    hijacked: tuple[bool, ...] = ()
+    disabled: tuple[bool, ...] = ()
+    blocked: tuple[bool, ...] = ()
+    # Keyed by label name, for callers that only have the string.
+    ids: Mapping[str, int] = field(default_factory=lambda: _EMPTY_MAPPING)
+    action_by_name: Mapping[str, str] = field(default_factory=lambda: _EMPTY_MAPPING)
+    blocked_names: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingTables:
+    """Every gesture type's table plus the fallback for unmapped types."""
+
+    by_type: Mapping[str, RoutingTable]
+    fallback: RoutingTable
+    generation: int = 0
+
+    def table(self, gesture_type: str) -> RoutingTable:
+        return self.by_type.get(gesture_type, self.fallback)
+
+
+def _section(mapping: dict[str, Any], gesture_type: str) -> dict[str, Any]:
+    section = mapping.get(gesture_type, {})
+    return section if isinstance(section, dict) else {}
+
+
+def _compile_table(
+    default_section: dict[str, Any],
+    user_section: dict[str, Any],
+    hijacked_actions: Mapping[str, Any],
+    disabled_names: frozenset[str],
+) -> RoutingTable:
+    # Same precedence as the linear scans this replaces: the first default
+    # entry with a name supplies its default action, the first user entry
+    # with a non-empty action overrides it, and user entries win a shared key.
+    default_actions: dict[str, Any] = {}
+    for entry in default_section.values():
+        if isinstance(entry, dict) and "name" in entry:
+            default_actions.setdefault(entry.get("name"), entry.get("action"))
+    user_actions: dict[str, str] = {}
+    for entry in user_section.values():
+        if isinstance(entry, dict) and entry.get("action"):
+            user_actions.setdefault(entry.get("name"), entry["action"])
+
+    # Runners report stripped names; actions and hijacks match the raw one.
+    names_by_id: dict[int, tuple[str, Any]] = {}
+    for section in (default_section, user_section):
+        for key, entry in section.items():
+            if isinstance(entry, dict) and "name" in entry:
+                try:
+                    label_id = int(key)
+                except (TypeError, ValueError):
+                    continue
+                raw_name = entry.get("name")
+                names_by_id[label_id] = (str(raw_name if raw_name is not None else "").strip(), raw_name)
+
+    action_by_name: dict[str, str] = {}
+    for name in {*default_actions, *user_actions}:
+        action_by_name[name] = user_actions.get(name) or default_actions.get(name) or "Unknown"
+    hijacked_names = {
+        name
+        for name, action in default_actions.items()
+        if action and action in hijacked_actions
+    }
+
+    size = max(names_by_id, default=-1) + 1
+    names = [""] * size
+    actions = ["Unknown"] * size
+    hijacked = [False] * size
+    disabled = [False] * size
+    ids: dict[str, int] = {}
+    for label_id in sorted(names_by_id):
+        if label_id < 0:
+            continue
+        name, raw_name = names_by_id[label_id]
+        names[label_id] = name
+        actions[label_id] = action_by_name.get(raw_name, "Unknown")
+        hijacked[label_id] = raw_name in hijacked_names
+        disabled[label_id] = name in disabled_names
+        ids.setdefault(name, label_id)
+
+    return RoutingTable(
+        names=tuple(names),
+        actions=tuple(actions),
+        hijacked=tuple(hijacked),
+        disabled=tuple(disabled),
+        blocked=tuple(h or d for h, d in zip(hijacked, disabled)),
+        ids=MappingProxyType(ids),
+        action_by_name=MappingProxyType(action_by_name),
+        blocked_names=frozenset(hijacked_names) | disabled_names,
+    )
+
+
+def compile_routing_tables(
+    default_mapping: dict[str, Any],
+    user_mapping: dict[str, Any],
+    override_state: dict[str, Any],
+    generation: int = 0,
+) -> RoutingTables:
+    """Build the immutable tables ``PriorityRouter`` resolves against."""
+
+    hijacked_actions = override_state.get("hijacked_actions", {})
+    if not isinstance(hijacked_actions, dict):
+        hijacked_actions = {}
+    disabled_defaults = override_state.get("disabled_defaults", [])
+    if not isinstance(disabled_defaults, (list, tuple)):
+        disabled_defaults = []
+    disabled_names = frozenset(name for name in disabled_defaults if isinstance(name, str))
+
+    by_type = {
+        gesture_type: _compile_table(
+            _section(default_mapping, gesture_type),
+            _section(user_mapping, gesture_type),
+            hijacked_actions,
+            disabled_names,
+        )
+        for gesture_type in dict.fromkeys([*default_mapping, *user_mapping])
+    }
+    return RoutingTables(
+        by_type=MappingProxyType(by_type),
+        fallback=RoutingTable(blocked_names=disabled_names),
+        generation=generation,
+    )
+
 
 class PriorityRouter:
     """Stateless collision resolver for the dual-brain inference pipeline."""
@@ -37,58 +191,47 @@ class PriorityRouter:
     def __init__(
         self,
         confidence_threshold: float = _DEFAULT_CONFIDENCE_THRESHOLD,
+        config_store: ConfigStore | None = None,
     ) -> None:
         self._confidence_threshold = confidence_threshold
+        self._config_store = config_store or CONFIG_STORE
 
-        # In-memory caches populated from disk.
-        self._default_mapping: dict[str, dict[str, Any]] = {}
-        self._user_mapping: dict[str, dict[str, Any]] = {}
-        self._hijacked_actions: dict[str, str] = {}
-        self._disabled_defaults: list[str] = []
+        # Replaced wholesale by reload(); see the module docstring.
+        self._tables = compile_routing_tables({}, {}, {})
 
         self.reload()
 
+    @property
+    def tables(self) -> RoutingTables:
+        return self._tables
+
     # -----------------------------------------------------------------
     # Config I/O
     # -----------------------------------------------------------------
     def reload(self) -> None:
-        """Re-read both config files from disk.  Safe to call at any time."""
-
-        # --- default_mapping.json ---
-        if DEFAULT_MAPPING_PATH.exists():
-            try:
-                with DEFAULT_MAPPING_PATH.open("r", encoding="utf-8") as fh:
-                    raw = json.load(fh)
-                self._default_mapping = raw if isinstance(raw, dict) else {}
-            except (json.JSONDecodeError, OSError):
-                self._default_mapping = {}
-        else:
-            self._default_mapping = {}
-
-        # --- user_mapping.json ---
-        if USER_MAPPING_PATH.exists():
-            try:
-                with USER_MAPPING_PATH.open("r", encoding="utf-8") as fh:
-                    raw = json.load(fh)
-                self._user_mapping = raw if isinstance(raw, dict) else {}
-            except (json.JSONDecodeError, OSError):
-                self._user_mapping = {}
-        else:
-            self._user_mapping = {}
-
-        # --- override_state.json ---
-        if OVERRIDE_STATE_PATH.exists():
-            try:
-                with OVERRIDE_STATE_PATH.open("r", encoding="utf-8") as fh:
-                    state = json.load(fh)
-                self._hijacked_actions = state.get("hijacked_actions", {})
-                self._disabled_defaults = state.get("disabled_defaults", [])
-            except (json.JSONDecodeError, OSError):
-                self._hijacked_actions = {}
-                self._disabled_defaults = []
-        else:
-            self._hijacked_actions = {}
-            self._disabled_defaults = []
+        """Pick up the current config files.  Safe to call at any time."""
+
+        # The store hands out its shared parsed objects; compiling only
+        # reads them.
+        store = self._config_store
+
+        default_mapping = store.get(DEFAULT_MAPPING_PATH, default={}, copy=False)
+        user_mapping = store.get(USER_MAPPING_PATH, default={}, copy=False)
+        override_state = store.get(OVERRIDE_STATE_PATH, default={}, copy=False)
+
+        self.swap_tables(
+            compile_routing_tables(
+                default_mapping if isinstance(default_mapping, dict) else {},
+                user_mapping if isinstance(user_mapping, dict) else {},
+                override_state if isinstance(override_state, dict) else {},
+                generation=self._tables.generation + 1,
+            )
+        )
+
+    def swap_tables(self, tables: RoutingTables) -> RoutingTables:
+        """Publish prebuilt *tables* and return the ones they replace."""
+        previous, self._tables = self._tables, tables
+        return previous
 
     # -----------------------------------------------------------------
     # Resolution
@@ -126,62 +269,115 @@ class PriorityRouter:
             or when the result is blacklisted.
         """
 
+        threshold = self._confidence_threshold
+
         # --- Scenario 1: Custom model produced a confident hit --------
-        custom_valid = (
+        if (
             custom_label is not None
             and custom_label != "UNKNOWN"
             and custom_confidence is not None
-            and custom_confidence >= self._confidence_threshold
-        )
-
-        if custom_valid:
-            return (custom_label, custom_confidence)  # type: ignore[return-value]
+            and custom_confidence >= threshold
+        ):
+            return (custom_label, custom_confidence)
 
         # --- Scenario 2: Fall back to default model -------------------
-        default_valid = (
-            default_label != "UNKNOWN"
-            and default_confidence >= self._confidence_threshold
-        )
-
-        if not default_valid:
-            return ("UNKNOWN", 0.0)
-
-        # Check explicit disable list.
-        if default_label in self._disabled_defaults:
+        if default_label == "UNKNOWN" or default_confidence < threshold:
             return ("UNKNOWN", 0.0)
 
-        # Check action-hijack blacklist.  Lookup the action string that
-        # the default gesture maps to, then see if a custom gesture has
-        # claimed that action.
-        default_action = self._lookup_default_action(
-            default_label, gesture_type
-        )
-        if default_action and default_action in self._hijacked_actions:
+        # Disabled defaults and defaults whose action a custom gesture has
+        # hijacked are both folded into one set at compile time.
+        if default_label in self._tables.table(gesture_type).blocked_names:
             return ("UNKNOWN", 0.0)
 
         return (default_label, default_confidence)
 
+    def resolve_id(
+        self,
+        default_id: int,
+        default_confidence: float,
+        custom_id: Optional[int] = None,
+        custom_confidence: Optional[float] = None,
+        gesture_type: str = "static",
+    ) -> tuple[int, float]:
+        """``resolve`` on integer label ids; ``UNKNOWN_LABEL_ID`` means no hit.
+
+        Ids are the class indices the runners report in ``label_idx``.
+        """
+
+        threshold = self._confidence_threshold
+        if (
+            custom_id is not None
+            and custom_id >= 0
+            and custom_confidence is not None
+            and custom_confidence >= threshold
+        ):
+            return (custom_id, custom_confidence)
+
+        if default_id < 0 or default_confidence < threshold:
+            return (UNKNOWN_LABEL_ID, 0.0)
+
+        blocked = self._tables.table(gesture_type).blocked
+        if default_id < len(blocked) and blocked[default_id]:
+            return (UNKNOWN_LABEL_ID, 0.0)
+
+        return (default_id, default_confidence)
+
+    def route_id(
+        self,
+        default_id: int,
+        default_confidence: float,
+        custom_id: Optional[int] = None,
+        custom_confidence: Optional[float] = None,
+        gesture_type: str = "static",
+    ) -> tuple[str, float, str]:
+        """``resolve_id`` plus the name and action lookups in one call.
+
+        Returns ``(label, confidence, action)``; ``("UNKNOWN", 0.0,
+        "Unknown")`` when nothing should fire.  This is the per-frame entry
+        point: one table fetch and no string comparisons.
+        """
+
+        table = self._tables.table(gesture_type)
+        threshold = self._confidence_threshold
+        if (
+            custom_id is not None
+            and custom_id >= 0
+            and custom_confidence is not None
+            and custom_confidence >= threshold
+        ):
+            label_id, confidence = custom_id, custom_confidence
+        elif (
+            default_id < 0
+            or default_confidence < threshold
+            or (default_id < len(table.blocked) and table.blocked[default_id])
+        ):
+            return ("UNKNOWN", 0.0, "Unknown")
+        else:
+            label_id, confidence = default_id, default_confidence
+
+        if label_id < len(table.names) and table.names[label_id]:
+            return (table.names[label_id], confidence, table.actions[label_id])
+        return ("UNKNOWN", 0.0, "Unknown")
+
     # -----------------------------------------------------------------
     # Helpers
     # -----------------------------------------------------------------
-    def _lookup_default_action(
-        self, label_name: str, gesture_type: str
-    ) -> str | None:
-        """Find the action string for *label_name* inside default_mapping."""
-        section = self._default_mapping.get(gesture_type, {})
-        for _key, entry in section.items():
-            if isinstance(entry, dict) and entry.get("name") == label_name:
-                return entry.get("action")
-        return None
+    def label_id(self, label_name: str, gesture_type: str) -> int:
+        """Label id for *label_name*, or ``UNKNOWN_LABEL_ID``."""
+        return self._tables.table(gesture_type).ids.get(label_name, UNKNOWN_LABEL_ID)
+
+    def label_name(self, label_id: int, gesture_type: str) -> str:
+        """Label name for *label_id*, or ``"UNKNOWN"``."""
+        names = self._tables.table(gesture_type).names
+        if 0 <= label_id < len(names) and names[label_id]:
+            return names[label_id]
+        return "UNKNOWN"
+
+    def action_for_id(self, label_id: int, gesture_type: str) -> str:
+        """Mapped action for *label_id*, user overrides first."""
+        actions = self._tables.table(gesture_type).actions
+        return actions[label_id] if 0 <= label_id < len(actions) else "Unknown"
 
     def get_action(self, label_name: str, gesture_type: str) -> str:
         """Get the mapped action for a gesture label, checking user overrides first."""
-        section = self._user_mapping.get(gesture_type, {})
-        for _key, entry in section.items():
-            if isinstance(entry, dict) and entry.get("name") == label_name:
-                action = entry.get("action")
-                if action:
-                    return action
-
-        action = self._lookup_default_action(label_name, gesture_type)
-        return action if action else "Unknown"
+        return self._tables.table(gesture_type).action_by_name.get(label_name, "Unknown")
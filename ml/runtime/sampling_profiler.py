@@ -0,0 +1,210 @@
+"""
+In-process sampling profiler for the live service.
+
+Why this exists:
+the slowdowns worth chasing tend to appear after hours of uptime, and
+restarting under cProfile or attaching py-spy loses exactly that state. The
+`PROFILE` command starts this profiler on a background thread instead. Every
+`interval` it snapshots all Python thread stacks with `sys._current_frames()`
+and counts identical stacks per thread. The profiled threads are never
+paused or instrumented; the cost is one stack walk per thread per sample on
+the sampler's own thread (plus its share of the GIL).
+
+Output formats:
+- `collapsed`: Brendan Gregg's folded stacks, one `thread;frame;...;leaf
+  count` line per unique stack, for flamegraph.pl, speedscope or inferno
+- `speedscope`: a speedscope.app JSON document with one sampled profile per
+  thread
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+PROFILE_DIR = ROOT / "profiles"
+
+PROFILE_FORMATS: tuple[str, ...] = ("collapsed", "speedscope")
+MAX_PROFILE_SECONDS = 600.0
+_MAX_STACK_DEPTH = 128
+
+_Frame = tuple[str, str, int]
+
+
+def _stack_of(frame: FrameType | None) -> tuple[_Frame, ...]:
+    """Return the stack as (function, file, first line) tuples, root first."""
+
+    stack: list[_Frame] = []
+    while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def _short_path(filename: str) -> str:
+    parts = Path(filename).parts
+    return "/".join(parts[-2:]) if len(parts) >= 2 else filename
+
+
+class SamplingProfiler:
+    """
+    One profiling run. `start()` returns immediately; `on_done(result)` is
+    called from the sampler thread once the file has been written.
+    """
+
+    def __init__(
+        self,
+        seconds: float,
+        *,
+        interval_ms: float = 5.0,
+        output_format: str = "speedscope",
+        path: str | Path | None = None,
+        on_done: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        if output_format not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format '{output_format}'. Expected one of {PROFILE_FORMATS}.")
+        self._seconds = min(MAX_PROFILE_SECONDS, max(0.1, float(seconds)))
+        self._interval = max(0.001, float(interval_ms) / 1000.0)
+        self._format = output_format
+        self._path = Path(path) if path else None
+        self._on_done = on_done
+        self._samples: dict[int, Counter[tuple[_Frame, ...]]] = {}
+        self._thread_names: dict[int, str] = {}
+        self._sample_count = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """End the run early; the file is still written."""
+
+        self._stop.set()
+
+    def _run(self) -> None:
+        started_at = time.monotonic()
+        deadline = started_at + self._seconds
+        own_ident = threading.get_ident()
+        lag_total = 0.0
+        next_sample = started_at
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                lag_total += max(0.0, now - next_sample)
+                self._sample(own_ident)
+                next_sample += self._interval
+                # Skip ticks that were missed instead of bursting to catch up.
+                if next_sample < time.monotonic():
+                    next_sample = time.monotonic() + self._interval
+                self._stop.wait(max(0.0, next_sample - time.monotonic()))
+
+            output = self._write()
+            result = {
+                "status": "done",
+                "path": str(output),
+                "format": self._format,
+                "seconds": round(time.monotonic() - started_at, 3),
+                "interval_ms": self._interval * 1000.0,
+                "samples": self._sample_count,
+                "mean_lag_ms": round(lag_total / self._sample_count * 1000.0, 3) if self._sample_count else 0.0,
+                "threads": sorted(self._thread_names.get(ident, str(ident)) for ident in self._samples),
+            }
+        except Exception as exc:
+            result = {"status": "failed", "error": str(exc)}
+        if self._on_done is not None:
+            self._on_done(result)
+
+    def _sample(self, own_ident: int) -> None:
+        frames = sys._current_frames()
+        names = self._thread_names
+        if len(names) < len(frames):
+            for thread in threading.enumerate():
+                if thread.ident is not None and thread.ident not in names:
+                    names[thread.ident] = thread.name
+        for ident, frame in frames.items():
+            if ident == own_ident:
+                continue
+            counter = self._samples.get(ident)
+            if counter is None:
+                counter = self._samples[ident] = Counter()
+                names.setdefault(ident, f"thread-{ident}")
+            counter[_stack_of(frame)] += 1
+        self._sample_count += 1
+
+    def _write(self) -> Path:
+        if self._path is None:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            suffix = "json" if self._format == "speedscope" else "txt"
+            self._path = PROFILE_DIR / time.strftime(f"profile_%Y%m%d_%H%M%S.{suffix}")
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if self._format == "speedscope":
+            text = json.dumps(self._speedscope())
+        else:
+            text = "\n".join(self._collapsed()) + "\n"
+        self._path.write_text(text, encoding="utf-8")
+        return self._path
+
+    def _collapsed(self) -> list[str]:
+        lines: list[str] = []
+        for ident, counter in self._samples.items():
+            thread_name = self._thread_names.get(ident, str(ident)).replace(";", "_")
+            for stack, count in counter.most_common():
+                frames = ";".join(
+                    f"{name} ({_short_path(filename)}:{line})" for name, filename, line in stack
+                )
+                lines.append(f"{thread_name};{frames} {count}" if frames else f"{thread_name} {count}")
+        return lines
+
+    def _speedscope(self) -> dict[str, Any]:
+        frame_index: dict[_Frame, int] = {}
+        shared_frames: list[dict[str, Any]] = []
+        profiles: list[dict[str, Any]] = []
+        for ident, counter in self._samples.items():
+            samples: list[list[int]] = []
+            weights: list[float] = []
+            for stack, count in counter.items():
+                indices: list[int] = []
+                for frame in stack:
+                    index = frame_index.get(frame)
+                    if index is None:
+                        index = frame_index[frame] = len(shared_frames)
+                        name, filename, line = frame
+                        shared_frames.append({"name": name, "file": filename, "line": line})
+                    indices.append(index)
+                samples.append(indices)
+                weights.append(count * self._interval * 1000.0)
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": self._thread_names.get(ident, str(ident)),
+                    "unit": "milliseconds",
+                    "startValue": 0.0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "octave-ml-service",
+            "exporter": "ml.runtime.sampling_profiler",
+            "shared": {"frames": shared_frames},
+            "profiles": profiles,
+        }
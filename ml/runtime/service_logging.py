@@ -0,0 +1,269 @@
+"""
+Logging setup for the ML service: levels, rate limiting, background writer.
+
+Why this exists:
+the pipeline used to `print(..., flush=True)` for every frame with a hand,
+and `trace_startup` opened and appended to a file on every call, including
+each training epoch's progress callback. Both put synchronous I/O on threads
+that have a frame budget.
+
+Everything now goes through stdlib `logging` under the `octave` logger:
+- a disabled level costs the `isEnabledFor` check in `logger.debug(...)`;
+  messages use %-style arguments so nothing is formatted unless enabled
+- `RateLimitFilter` lets each call site through `burst` times per
+  `interval_sec` and reports how many were suppressed on the next record
+- enabled records go onto a bounded queue; a `QueueListener` thread owns
+  the sinks, so callers never wait for the disk. A full queue drops records
+- the file sink rotates by size and flushes on WARNING and above, once a
+  second under load, and whenever the queue goes idle
+
+Environment:
+- `SPIDER_ML_LOG_LEVEL` (default INFO)
+- `SPIDER_ML_LOG_CONSOLE_LEVEL` (default WARNING, stderr)
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+LOG_DIR = ROOT / "logs"
+DEFAULT_LOG_PATH = LOG_DIR / "ml_service.log"
+LOGGER_NAME = "octave"
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a child of the service logger, e.g. `get_logger("pipeline")`."""
+
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let each call site log at most `burst` records per `interval_sec`.
+
+    Call sites are keyed by (file, line), so one chatty debug line cannot
+    starve others. ERROR and above always pass.
+    """
+
+    def __init__(self, interval_sec: float = 1.0, burst: int = 5) -> None:
+        super().__init__()
+        self._interval = max(0.0, float(interval_sec))
+        self._burst = max(1, int(burst))
+        self._lock = threading.Lock()
+        # key -> [window start, records passed in window, suppressed since last pass]
+        self._windows: dict[tuple[str, int], list[float | int]] = {}
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR or self._interval <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - float(window[0]) >= self._interval:
+                suppressed = int(window[2]) if window is not None else 0
+                self._windows[key] = [record.created, 1, 0]
+            elif int(window[1]) < self._burst:
+                window[1] = int(window[1]) + 1
+                suppressed = 0
+            else:
+                window[2] = int(window[2]) + 1
+                self.suppressed_total += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar suppressed]"
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that counts and drops records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Size-rotated file sink that does not flush per record.
+
+    `RotatingFileHandler` flushes after every write and seeks to the end to
+    measure the file before each one, which defeats the stream buffer. This
+    keeps its own byte count and flushes on WARNING+ or once per
+    `flush_interval_sec`; the listener also flushes when it goes idle.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        *,
+        max_bytes: int,
+        backup_count: int,
+        flush_interval_sec: float = 1.0,
+    ) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self._flush_interval = flush_interval_sec
+        self._last_flush = 0.0
+        try:
+            self._bytes = os.path.getsize(filename)
+        except OSError:
+            self._bytes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator
+            if self.maxBytes > 0 and self._bytes + len(line) >= self.maxBytes and self._bytes > 0:
+                self.doRollover()
+                self._bytes = 0
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(line)
+            self._bytes += len(line)
+            if record.levelno >= logging.WARNING or record.created - self._last_flush >= self._flush_interval:
+                self.flush()
+                self._last_flush = record.created
+        except Exception:
+            self.handleError(record)
+
+
+class _IdleFlushQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue is idle."""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, idle_sec: float) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self._idle_sec = idle_sec
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            try:
+                return self.queue.get(timeout=self._idle_sec)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+class _LoggingState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.listener: QueueListener | None = None
+        self.queue_handler: _DroppingQueueHandler | None = None
+        self.rate_limit: RateLimitFilter | None = None
+        self.path: Path | None = None
+
+
+_STATE = _LoggingState()
+
+
+def _parse_level(level: str | int | None, default: int) -> int:
+    if level is None or level == "":
+        return default
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).strip().upper())
+    return value if isinstance(value, int) else default
+
+
+def configure_logging(
+    *,
+    level: str | int | None = None,
+    path: str | Path | None = None,
+    console_level: str | int | None = None,
+    max_bytes: int = 2 * 1024 * 1024,
+    backup_count: int = 3,
+    max_queue: int = 10_000,
+    rate_limit_interval_sec: float = 1.0,
+    rate_limit_burst: int = 5,
+) -> None:
+    """Install the queue handler and start the writer thread. Idempotent."""
+
+    with _STATE.lock:
+        if _STATE.listener is not None:
+            return
+        log_path = Path(path) if path else DEFAULT_LOG_PATH
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = _BufferedRotatingFileHandler(
+            log_path,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+        )
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        console_handler.setLevel(
+            _parse_level(console_level or os.environ.get("SPIDER_ML_LOG_CONSOLE_LEVEL"), logging.WARNING)
+        )
+
+        log_queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        queue_handler = _DroppingQueueHandler(log_queue)
+        rate_limit = RateLimitFilter(rate_limit_interval_sec, rate_limit_burst)
+        queue_handler.addFilter(rate_limit)
+
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(_parse_level(level or os.environ.get("SPIDER_ML_LOG_LEVEL"), logging.INFO))
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+
+        listener = _IdleFlushQueueListener(log_queue, file_handler, console_handler, idle_sec=0.5)
+        listener.start()
+
+        _STATE.listener = listener
+        _STATE.queue_handler = queue_handler
+        _STATE.rate_limit = rate_limit
+        _STATE.path = log_path
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Drain the queue, stop the writer thread and close the sinks."""
+
+    with _STATE.lock:
+        listener = _STATE.listener
+        queue_handler = _STATE.queue_handler
+        _STATE.listener = None
+        _STATE.queue_handler = None
+    if listener is None:
+        return
+    logger = logging.getLogger(LOGGER_NAME)
+    if queue_handler is not None:
+        logger.removeHandler(queue_handler)
+    logger.propagate = True
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def set_log_level(level: str | int) -> str:
+    """Change the service log level at runtime and return its name."""
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(_parse_level(level, logger.level or logging.INFO))
+    return logging.getLevelName(logger.level)
+
+
+def logging_stats() -> dict[str, Any]:
+    queue_handler = _STATE.queue_handler
+    rate_limit = _STATE.rate_limit
+    return {
+        "level": logging.getLevelName(logging.getLogger(LOGGER_NAME).getEffectiveLevel()),
+        "path": str(_STATE.path) if _STATE.path else None,
+        "queued": queue_handler.queue.qsize() if queue_handler is not None else 0,
+        "dropped": queue_handler.dropped if queue_handler is not None else 0,
+        "rate_limited": rate_limit.suppressed_total if rate_limit is not None else 0,
+    }
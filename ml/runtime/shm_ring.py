@@ -0,0 +1,316 @@
+"""
+Single-producer / single-consumer shared-memory ring for local IPC.
+
+Why this exists:
+gesture and continuous-control events are tiny and frequent. Over loopback
+TCP each one still costs a syscall on both sides plus the kernel's socket
+path. When the engine and the ML service share a Linux host, the service can
+also write those events into a shared-memory ring that the engine reads
+directly.
+
+Layout of the shared segment (little-endian, indices on separate cache lines
+so producer and consumer do not false-share):
+
+    0    u32 magic, u32 version, u64 capacity (data bytes)
+    64   u64 write position (bytes ever written, only the producer stores)
+    128  u64 read position (bytes ever consumed, only the consumer stores)
+    192  u32 consumer-waiting flag
+    256  data
+
+Records are `u32 length + bytes` and never straddle the end of the buffer; a
+`WRAP` length tells the consumer to continue at offset 0. A full ring drops
+the new record and counts it instead of blocking the producer.
+
+Wakeup works like a futex: the consumer spins briefly, then sets the waiting
+flag, re-checks and sleeps on an eventfd. The producer only pays for the
+`eventfd_write` syscall when that flag is set. Without an eventfd (another
+platform, or a consumer that did not inherit the fd) the consumer polls.
+
+Python cannot issue memory fences, so the handshake is best effort. Both
+sides store then load (producer: write position, then waiting flag;
+consumer: waiting flag, then write position), and neither x86-64 nor
+AArch64 orders that without a StoreLoad fence; AArch64 may also make the
+write position visible before the record bytes. A wakeup can therefore be
+lost, so the consumer never sleeps longer than `_WAIT_SLICE_SEC` before
+checking the ring again, whatever its timeout. Aligned 8-byte index stores
+are still single-copy atomic, so a reader never sees a torn position.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+from ml.runtime.wire_protocol import WireEncoder
+
+RING_MAGIC = 0x474E5952  # "RYNG"
+RING_VERSION = 1
+HEADER_BYTES = 256
+WRAP = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<IIQ")
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+_WRITE_POS = 64
+_READ_POS = 128
+_WAITING = 192
+_DEFAULT_SPIN = 200 if (os.cpu_count() or 1) > 1 else 0
+# Longest a waiting consumer sleeps before re-checking the ring, which bounds
+# the delay of a lost wakeup (see the module docstring).
+_WAIT_SLICE_SEC = 0.005
+
+
+def create_wakeup_fd() -> int | None:
+    """Return a non-blocking eventfd, or None where eventfd is unavailable."""
+
+    if not hasattr(os, "eventfd"):
+        return None
+    return os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+
+
+class ShmRing:
+    """One end of a shared-memory ring. Use `create()` or `attach()`."""
+
+    def __init__(
+        self,
+        segment: shared_memory.SharedMemory,
+        *,
+        owner: bool,
+        wakeup_fd: int | None,
+    ) -> None:
+        self._segment = segment
+        self._buf = segment.buf
+        self._owner = owner
+        self._wakeup_fd = wakeup_fd
+        magic, version, capacity = _HEADER.unpack_from(self._buf, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            raise ValueError(f"Shared memory '{segment.name}' is not a ring buffer.")
+        self._capacity = int(capacity)
+        self.pushed = 0
+        self.dropped = 0
+        self.wakeups = 0
+
+    @classmethod
+    def create(
+        cls,
+        name: str | None = None,
+        capacity: int = 1 << 16,
+        *,
+        wakeup_fd: int | None = None,
+    ) -> "ShmRing":
+        """Create a new ring segment. The creator unlinks it on `close()`."""
+
+        segment = shared_memory.SharedMemory(name=name, create=True, size=HEADER_BYTES + capacity)
+        segment.buf[:HEADER_BYTES] = bytes(HEADER_BYTES)
+        _HEADER.pack_into(segment.buf, 0, RING_MAGIC, RING_VERSION, capacity)
+        return cls(segment, owner=True, wakeup_fd=wakeup_fd)
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        *,
+        wakeup_fd: int | None = None,
+        shared_tracker: bool = False,
+    ) -> "ShmRing":
+        """
+        Attach to a ring created by another process.
+
+        Before Python 3.13 attaching also registers the segment with this
+        process's resource tracker, which would unlink it on exit even though
+        the creator still owns it, so the registration is dropped again. Pass
+        `shared_tracker=True` from a forked child, which shares the creator's
+        tracker and must leave its registration alone.
+        """
+
+        segment = shared_memory.SharedMemory(name=name, create=False)
+        if not shared_tracker:
+            try:
+                resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore[attr-defined]
+            except Exception:
+                pass
+        return cls(segment, owner=False, wakeup_fd=wakeup_fd)
+
+    @property
+    def name(self) -> str:
+        return self._segment.name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def push(self, record: bytes) -> bool:
+        """Append one record. Returns False (and counts a drop) when full."""
+
+        buf = self._buf
+        capacity = self._capacity
+        need = _U32.size + len(record)
+        if need > capacity:
+            self.dropped += 1
+            return False
+
+        (write_pos,) = _U64.unpack_from(buf, _WRITE_POS)
+        (read_pos,) = _U64.unpack_from(buf, _READ_POS)
+        offset = write_pos % capacity
+        skip = capacity - offset if capacity - offset < need else 0
+        if capacity - (write_pos - read_pos) < skip + need:
+            self.dropped += 1
+            return False
+
+        if skip:
+            if skip >= _U32.size:
+                _U32.pack_into(buf, HEADER_BYTES + offset, WRAP)
+            write_pos += skip
+            offset = 0
+
+        start = HEADER_BYTES + offset
+        _U32.pack_into(buf, start, len(record))
+        buf[start + _U32.size:start + need] = record
+        # Publish only after the record bytes are in place.
+        _U64.pack_into(buf, _WRITE_POS, write_pos + need)
+        self.pushed += 1
+
+        if self._wakeup_fd is not None and _U32.unpack_from(buf, _WAITING)[0]:
+            try:
+                os.eventfd_write(self._wakeup_fd, 1)
+                self.wakeups += 1
+            except BlockingIOError:
+                pass
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def pop(self) -> bytes | None:
+        """Return the next record, or None when the ring is empty."""
+
+        buf = self._buf
+        capacity = self._capacity
+        (read_pos,) = _U64.unpack_from(buf, _READ_POS)
+        while True:
+            (write_pos,) = _U64.unpack_from(buf, _WRITE_POS)
+            if read_pos == write_pos:
+                return None
+            offset = read_pos % capacity
+            remaining = capacity - offset
+            if remaining < _U32.size:
+                read_pos += remaining
+                continue
+            (length,) = _U32.unpack_from(buf, HEADER_BYTES + offset)
+            if length == WRAP:
+                read_pos += remaining
+                continue
+            start = HEADER_BYTES + offset + _U32.size
+            record = bytes(buf[start:start + length])
+            _U64.pack_into(buf, _READ_POS, read_pos + _U32.size + length)
+            return record
+
+    def wait(self, timeout: float | None = None, spin: int | None = None) -> bytes | None:
+        """
+        Block until a record is available or `timeout` expires.
+
+        Spins `spin` times first because most waits are shorter than a
+        syscall round trip, then sleeps on the eventfd or polls. On a single
+        CPU spinning only delays the producer, so the default is no spin.
+        Each sleep lasts at most `_WAIT_SLICE_SEC`, so a wakeup lost to
+        store/load reordering costs a few milliseconds, not a hang.
+        """
+
+        if spin is None:
+            spin = _DEFAULT_SPIN
+        for _ in range(spin):
+            record = self.pop()
+            if record is not None:
+                return record
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        buf = self._buf
+        while True:
+            _U32.pack_into(buf, _WAITING, 1)
+            # Re-check after raising the flag so a push that happened in
+            # between is not missed.
+            record = self.pop()
+            if record is not None:
+                _U32.pack_into(buf, _WAITING, 0)
+                return record
+
+            remaining = _WAIT_SLICE_SEC
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    _U32.pack_into(buf, _WAITING, 0)
+                    return None
+            if self._wakeup_fd is not None:
+                readable, _, _ = select.select([self._wakeup_fd], [], [], remaining)
+                if readable:
+                    try:
+                        os.eventfd_read(self._wakeup_fd)
+                    except BlockingIOError:
+                        pass
+            else:
+                time.sleep(min(0.0002, remaining))
+            _U32.pack_into(buf, _WAITING, 0)
+            record = self.pop()
+            if record is not None:
+                return record
+
+    def stats(self) -> dict[str, Any]:
+        (write_pos,) = _U64.unpack_from(self._buf, _WRITE_POS)
+        (read_pos,) = _U64.unpack_from(self._buf, _READ_POS)
+        return {
+            "name": self.name,
+            "capacity": self._capacity,
+            "used_bytes": int(write_pos - read_pos),
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+            "wakeups": self.wakeups,
+            "eventfd": self._wakeup_fd is not None,
+        }
+
+    def close(self) -> None:
+        """Detach; the creating side also removes the segment."""
+
+        self._buf = None  # type: ignore[assignment]
+        self._segment.close()
+        if self._owner:
+            try:
+                self._segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ShmEventPublisher:
+    """
+    Mirror gesture events into a ring using the binary wire format.
+
+    Records are `WireEncoder` output, so consumers reuse `WireDecoder`. A
+    full ring drops the newest record; the encoder is then reset so the next
+    record re-sends its string definitions instead of referring to ids the
+    consumer never saw.
+    """
+
+    EVENT_TYPES = frozenset({"gesture", "voice"})
+
+    def __init__(self, ring: ShmRing) -> None:
+        self._ring = ring
+        self._encoder = WireEncoder()
+
+    @property
+    def ring(self) -> ShmRing:
+        return self._ring
+
+    def publish(self, payload: dict[str, Any]) -> None:
+        if payload.get("type") not in self.EVENT_TYPES:
+            return
+        if not self._ring.push(self._encoder.encode(payload)):
+            self._encoder = WireEncoder()
+
+    def close(self) -> None:
+        self._ring.close()
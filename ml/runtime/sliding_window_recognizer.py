@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from ml.runtime.histogram import Histogram
+from ml.runtime.types import DynamicInferenceResult
+
+
+_IDLE = DynamicInferenceResult(label_idx=-1, label_name="UNKNOWN", confidence=0.0, is_unknown=True)
+
+
+@dataclass(slots=True)
+class WindowDetection:
+    """One dynamic gesture found by the sliding-window recognizer."""
+
+    result: DynamicInferenceResult
+    start_frame: int
+    end_frame: int
+
+
+class SlidingWindowRecognizer:
+    """
+    Always-on dynamic gesture recognition over overlapping windows.
+
+    Why this exists:
+    the episode pipeline only classifies motion that `_should_start_dynamic_
+    episode` segments inside a clutch session, and that segmentation is a
+    heuristic. This recognizer needs no segmentation. It classifies the last
+    `window` hand frames every `stride` frames and picks gestures out of the
+    stream of window scores.
+
+    Work per frame is bounded: windows are queued and classified
+    `batch_windows` at a time in one `infer_batch` call, so a frame runs at
+    most one batch, and only one frame in `stride * batch_windows` does.
+    Batching trades `stride * (batch_windows - 1)` frames of latency for
+    fewer, cheaper model calls; `python -m ml.benchmarks.sliding_window`
+    measures both.
+
+    Features are wrist-relative, so a held pose gives near-identical frames
+    that the model, never trained on idle hands, may still score confidently.
+    With `min_motion`, a window whose frames stay within that feature-space
+    distance of its first frame counts as idle: it is not classified and
+    closes any open cluster like a low-confidence window would. Idle stretches
+    then cost no model calls.
+
+    A gesture scores highly in several overlapping windows, so the scores
+    pass through online non-maximum suppression over time. Confident windows
+    (`min_confidence`, any label) that overlap form a cluster that keeps its
+    best window. The cluster is emitted when a window stops being confident,
+    when a confident window no longer overlaps it, or `max_hold_frames` after
+    it opened. Windows overlapping an emitted one are then ignored, so one
+    gesture emits one event.
+    """
+
+    def __init__(
+        self,
+        infer_batch: Callable[[list[list[list[float]]]], list[DynamicInferenceResult]],
+        *,
+        window: int = 30,
+        stride: int = 5,
+        batch_windows: int = 2,
+        min_confidence: float = 0.99,
+        min_motion: float = 0.0,
+        max_hold_frames: int | None = None,
+    ) -> None:
+        self._infer_batch = infer_batch
+        self._window = max(1, int(window))
+        self._stride = max(1, int(stride))
+        self._batch_windows = max(1, int(batch_windows))
+        self._min_confidence = float(min_confidence)
+        self._min_motion = max(0.0, float(min_motion))
+        self._max_hold_frames = self._window if max_hold_frames is None else max(0, int(max_hold_frames))
+
+        self._frames: deque[list[float]] = deque(maxlen=self._window)
+        self._frame_index = 0
+        self._next_window_at = self._window
+        self._last_window_end = 0
+        self._pending: deque[tuple[int, list[list[float]] | None]] = deque()
+        self._best: tuple[int, DynamicInferenceResult] | None = None
+        self._cluster_opened_at = 0
+        self._suppress_until = 0
+
+        self._batch_ms = Histogram()
+        self._windows = 0
+        self._idle_windows = 0
+        self._batches = 0
+        self._detections = 0
+        self._suppressed = 0
+
+    def reset(self) -> list[WindowDetection]:
+        """
+        End the stream, e.g. when the hand is lost; windows must be contiguous.
+
+        A swipe often ends with the hand leaving the frame, so nothing it was
+        holding is dropped: the last full window is queued if the stride has
+        not reached it yet, the queued windows are classified (one batch at
+        most), and the open cluster is closed. Returns what that emits.
+        """
+
+        if len(self._frames) == self._window and self._frame_index > self._last_window_end:
+            self._enqueue_window()
+        detections: list[WindowDetection] = []
+        if self._pending:
+            batch = list(self._pending)
+            self._pending.clear()
+            detections.extend(self._classify(batch))
+        detection = self._close_cluster()
+        if detection is not None:
+            detections.append(detection)
+
+        self._frames.clear()
+        self._next_window_at = self._frame_index + self._window
+        return detections
+
+    def push(self, features: list[float]) -> list[WindowDetection]:
+        """Add one hand frame; returns the gestures whose clusters closed."""
+
+        self._frames.append(features)
+        self._frame_index += 1
+        if self._frame_index >= self._next_window_at:
+            self._enqueue_window()
+
+        if len(self._pending) < self._batch_windows:
+            return []
+
+        return self._classify([self._pending.popleft() for _ in range(self._batch_windows)])
+
+    def _enqueue_window(self) -> None:
+        frames = list(self._frames)
+        self._pending.append((self._frame_index, frames if self._is_moving(frames) else None))
+        self._last_window_end = self._frame_index
+        self._next_window_at = self._frame_index + self._stride
+
+    def _classify(self, batch: list[tuple[int, list[list[float]] | None]]) -> list[WindowDetection]:
+        moving = [frames for _end, frames in batch if frames is not None]
+        results: list[DynamicInferenceResult] = []
+        if moving:
+            started = time.perf_counter()
+            results = self._infer_batch(moving)
+            self._batch_ms.observe((time.perf_counter() - started) * 1000.0)
+            self._batches += 1
+        self._windows += len(batch)
+        self._idle_windows += len(batch) - len(moving)
+
+        detections: list[WindowDetection] = []
+        classified = iter(results)
+        for end_frame, frames in batch:
+            result = _IDLE if frames is None else next(classified, _IDLE)
+            detection = self._observe(end_frame, result)
+            if detection is not None:
+                detections.append(detection)
+        return detections
+
+    def _is_moving(self, frames: list[list[float]]) -> bool:
+        if self._min_motion <= 0.0:
+            return True
+        first = frames[0]
+        limit = self._min_motion * self._min_motion
+        for frame in frames[1:]:
+            if sum((value - origin) ** 2 for value, origin in zip(frame, first)) >= limit:
+                return True
+        return False
+
+    def _observe(self, end_frame: int, result: DynamicInferenceResult) -> WindowDetection | None:
+        confident = not result.is_unknown and result.confidence >= self._min_confidence
+        if confident and end_frame < self._suppress_until:
+            self._suppressed += 1
+            return None
+
+        best = self._best
+        if best is None:
+            if confident:
+                self._open_cluster(end_frame, result)
+            return None
+
+        overlaps = end_frame - best[0] < self._window
+        if confident and overlaps:
+            if result.confidence > best[1].confidence:
+                self._best = (end_frame, result)
+            if end_frame - self._cluster_opened_at < self._max_hold_frames:
+                return None
+
+        detection = self._close_cluster()
+        if confident and end_frame >= self._suppress_until:
+            self._open_cluster(end_frame, result)
+        return detection
+
+    def _open_cluster(self, end_frame: int, result: DynamicInferenceResult) -> None:
+        self._best = (end_frame, result)
+        self._cluster_opened_at = end_frame
+
+    def _close_cluster(self) -> WindowDetection | None:
+        best = self._best
+        self._best = None
+        if best is None:
+            return None
+        end_frame, result = best
+        self._suppress_until = end_frame + self._window
+        self._detections += 1
+        return WindowDetection(result=result, start_frame=end_frame - self._window + 1, end_frame=end_frame)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "window": self._window,
+            "stride": self._stride,
+            "batch_windows": self._batch_windows,
+            "min_confidence": self._min_confidence,
+            "min_motion": self._min_motion,
+            "frames": self._frame_index,
+            "windows": self._windows,
+            "idle_windows": self._idle_windows,
+            "batches": self._batches,
+            "pending_windows": len(self._pending),
+            "suppressed_windows": self._suppressed,
+            "detections": self._detections,
+            "batch_ms": self._batch_ms.snapshot(),
+        }
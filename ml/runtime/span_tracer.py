@@ -0,0 +1,183 @@
+"""
+Opt-in span tracer that exports Chrome Trace Event JSON.
+
+Usage from any thread:
+
+    from ml.runtime.span_tracer import TRACER
+
+    with TRACER.span("static_inference"):
+        ...
+
+While tracing is off, `span()` returns one shared do-nothing context manager,
+so instrumented code pays for an attribute check and a call. While on, each
+span appends one tuple to a bounded deque; the oldest spans fall out once the
+ring is full, so a long session can never grow memory.
+
+The dump is the Trace Event Format's JSON object form ("X" complete events
+plus thread-name metadata). It opens directly in https://ui.perfetto.dev and
+chrome://tracing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+TRACE_DIR = ROOT / "traces"
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_events", "_name", "_category", "_args", "_start_ns")
+
+    def __init__(
+        self,
+        events: deque,
+        name: str,
+        category: str,
+        args: dict[str, Any] | None,
+    ) -> None:
+        self._events = events
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        end_ns = time.perf_counter_ns()
+        # deque.append is atomic, so threads can share one ring without a lock.
+        self._events.append(
+            (
+                self._name,
+                self._category,
+                self._start_ns,
+                end_ns - self._start_ns,
+                threading.get_ident(),
+                self._args,
+            )
+        )
+
+
+class SpanTracer:
+    """Bounded ring of timed spans with start/stop/dump controls."""
+
+    def __init__(self, capacity: int = 200_000) -> None:
+        self._lock = threading.Lock()
+        self._events: deque = deque(maxlen=max(1, int(capacity)))
+        self._enabled = False
+        self._started_at_ns = time.perf_counter_ns()
+        self._thread_names: dict[int, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def start(self, capacity: int | None = None) -> None:
+        """Clear the ring and start recording."""
+
+        with self._lock:
+            maxlen = int(capacity) if capacity else self._events.maxlen
+            self._events = deque(maxlen=max(1, int(maxlen or 1)))
+            self._thread_names = {}
+            self._started_at_ns = time.perf_counter_ns()
+            self._enabled = True
+
+    def stop(self) -> None:
+        """Stop recording; recorded spans stay available for `dump()`."""
+
+        self._enabled = False
+
+    def span(self, name: str, category: str = "pipeline", args: dict[str, Any] | None = None):
+        """Return a context manager that records one span while enabled."""
+
+        if not self._enabled:
+            return _NULL_SPAN
+        ident = threading.get_ident()
+        if ident not in self._thread_names:
+            self._thread_names[ident] = threading.current_thread().name
+        return _Span(self._events, name, category, args)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self._enabled,
+            "events": len(self._events),
+            "capacity": self._events.maxlen,
+        }
+
+    def dump(self, path: str | os.PathLike[str] | None = None) -> Path:
+        """Write the recorded spans as Chrome Trace Event JSON and return the path."""
+
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+            origin_ns = self._started_at_ns
+
+        pid = os.getpid()
+        trace_events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": "octave-ml-service"},
+            }
+        ]
+        for ident, thread_name in thread_names.items():
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": ident,
+                    "args": {"name": thread_name},
+                }
+            )
+        for name, category, start_ns, duration_ns, ident, args in events:
+            event: dict[str, Any] = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_ns - origin_ns) / 1000.0,
+                "dur": duration_ns / 1000.0,
+                "pid": pid,
+                "tid": ident,
+            }
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+
+        if path is None:
+            TRACE_DIR.mkdir(parents=True, exist_ok=True)
+            path = TRACE_DIR / time.strftime("trace_%Y%m%d_%H%M%S.json")
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, handle)
+        return output
+
+
+# One process-wide tracer so the camera, pipeline, preview and training
+# threads all land in the same timeline without passing it around.
+TRACER = SpanTracer()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from ml.runtime.histogram import Histogram
+from ml.runtime.types import NormalizedHandFrame, StaticInferenceResult
+
+
+class _PendingRequest:
+    """One submitted frame waiting for its slice of a batched forward pass."""
+
+    __slots__ = ("frame", "submitted_at", "result", "done")
+
+    def __init__(self, frame: NormalizedHandFrame) -> None:
+        self.frame = frame
+        self.submitted_at = time.perf_counter()
+        self.result: StaticInferenceResult | None = None
+        self.done = threading.Event()
+
+
+class StaticBatchScheduler:
+    """
+    Collect static inference requests from several sources into micro-batches.
+
+    Why this exists:
+    with more than one frame source (extra camera sessions, replay streams,
+    remote clients) each frame used to cost its own forward pass. A small MLP
+    forward pass is dominated by fixed per-call overhead, so eight frames in
+    one call cost barely more than one.
+
+    Submitters block in `submit()`. A single worker thread takes the first
+    pending request, keeps collecting until `max_wait_ms` has passed since
+    that request arrived or the batch is full, runs one `infer_batch` call and
+    hands each submitter its own result.
+
+    Waiting only pays off when another source is about to submit. The worker
+    therefore tracks how many distinct threads submitted recently and closes a
+    batch early once every active source is in it. With a single camera that
+    means no added wait at all, only a thread hand-off.
+
+    A submitter never depends on the worker for longer than
+    `result_timeout_sec`: if its requests are not done by then (worker dead,
+    stopped or stuck), it takes them back and runs `infer_batch` itself.
+    """
+
+    def __init__(
+        self,
+        infer_batch: Callable[[list[NormalizedHandFrame]], list[StaticInferenceResult]],
+        *,
+        max_wait_ms: float = 1.5,
+        max_batch_size: int = 8,
+        source_idle_sec: float = 1.0,
+        result_timeout_sec: float = 1.0,
+    ) -> None:
+        self._infer_batch = infer_batch
+        self._max_wait_sec = max(0.0, float(max_wait_ms)) / 1000.0
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._source_idle_sec = float(source_idle_sec)
+        self._result_timeout_sec = max(0.0, float(result_timeout_sec))
+
+        self._condition = threading.Condition()
+        self._pending: deque[_PendingRequest] = deque()
+        self._sources: dict[int, float] = {}
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+        self._batch_sizes = Histogram(
+            bounds=[float(size) for size in range(1, self._max_batch_size + 1)]
+        )
+        self._queue_wait_ms = Histogram()
+        self._batches = 0
+        self._requests = 0
+        self._inline_fallbacks = 0
+
+    @property
+    def max_wait_ms(self) -> float:
+        return self._max_wait_sec * 1000.0
+
+    def set_max_wait_ms(self, max_wait_ms: float) -> None:
+        """Change the batching window. Takes effect for the next batch."""
+
+        with self._condition:
+            self._max_wait_sec = max(0.0, float(max_wait_ms)) / 1000.0
+
+    def submit(self, frame: NormalizedHandFrame) -> StaticInferenceResult:
+        """Queue one frame and block until its result is ready."""
+
+        return self.submit_many([frame])[0]
+
+    def submit_many(self, frames: list[NormalizedHandFrame]) -> list[StaticInferenceResult]:
+        """Queue several frames from one source and block until all are done."""
+
+        if not frames:
+            return []
+
+        requests = [_PendingRequest(frame) for frame in frames]
+        with self._condition:
+            self._ensure_worker_locked()
+            self._sources[threading.get_ident()] = time.monotonic()
+            self._pending.extend(requests)
+            self._requests += len(requests)
+            self._condition.notify()
+
+        deadline = time.perf_counter() + self._result_timeout_sec
+        for request in requests:
+            if not request.done.wait(max(0.0, deadline - time.perf_counter())):
+                self._run_inline(requests)
+                break
+        return [
+            request.result
+            if request.result is not None
+            else StaticInferenceResult(
+                label_idx=-1,
+                label_name="UNKNOWN",
+                confidence=0.0,
+                is_unknown=True,
+            )
+            for request in requests
+        ]
+
+    def _run_inline(self, requests: list[_PendingRequest]) -> None:
+        """Finish `requests` on the calling thread after the worker timed out."""
+
+        with self._condition:
+            self._inline_fallbacks += 1
+            for request in requests:
+                try:
+                    self._pending.remove(request)
+                except ValueError:
+                    pass
+        # Requests the worker already took may finish there too; the result
+        # is the same either way.
+        unfinished = [request for request in requests if not request.done.is_set()]
+        try:
+            results = self._infer_batch([request.frame for request in unfinished])
+        except Exception:
+            results = []
+        for request, result in zip(unfinished, results):
+            request.result = result
+
+    def stop(self) -> None:
+        """Stop the worker after it drains whatever is already queued."""
+
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=1.0)
+
+    def stats(self) -> dict[str, Any]:
+        """Return batch-size and queue-wait histograms plus totals."""
+
+        with self._condition:
+            active_sources = self._active_source_count_locked(time.monotonic())
+            batches = self._batches
+            requests = self._requests
+            inline_fallbacks = self._inline_fallbacks
+        return {
+            "max_wait_ms": round(self.max_wait_ms, 3),
+            "max_batch_size": self._max_batch_size,
+            "active_sources": active_sources,
+            "batches": batches,
+            "requests": requests,
+            "inline_fallbacks": inline_fallbacks,
+            "batch_size": self._batch_sizes.snapshot(),
+            "queue_wait_ms": self._queue_wait_ms.snapshot(),
+        }
+
+    def _ensure_worker_locked(self) -> None:
+        if self._running and self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._worker_loop,
+            name="StaticBatchScheduler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _active_source_count_locked(self, now: float) -> int:
+        stale = [
+            ident for ident, seen_at in self._sources.items()
+            if now - seen_at > self._source_idle_sec
+        ]
+        for ident in stale:
+            del self._sources[ident]
+        return max(1, len(self._sources))
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                deadline = self._pending[0].submitted_at + self._max_wait_sec
+                expected = min(
+                    self._max_batch_size,
+                    self._active_source_count_locked(time.monotonic()),
+                )
+                while self._running and len(self._pending) < expected:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch: list[_PendingRequest] = []
+                while self._pending and len(batch) < self._max_batch_size:
+                    batch.append(self._pending.popleft())
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_PendingRequest]) -> None:
+        results: list[StaticInferenceResult] = []
+        try:
+            started = time.perf_counter()
+            for request in batch:
+                self._queue_wait_ms.observe((started - request.submitted_at) * 1000.0)
+            self._batch_sizes.observe(float(len(batch)))
+            results = self._infer_batch([request.frame for request in batch])
+        except Exception:
+            pass
+        finally:
+            # Always release the submitters, even if this batch failed.
+            for index, request in enumerate(batch):
+                if index < len(results):
+                    request.result = results[index]
+                request.done.set()
+
+        with self._condition:
+            self._batches += 1
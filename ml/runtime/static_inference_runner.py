@@ -10,6 +10,7 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from ml.runtime.types import NormalizedHandFrame, StaticInferenceResult
+from ml.runtime.warm_up import time_warm_up
 
 
 class StaticGestureModel(nn.Module):
@@ -67,6 +68,7 @@ class StaticInferenceRunner:
         self._model_path = str(model_path or default_model_path)
         self._label_map: dict[int, str] = dict(label_map or {})
         self._model: StaticGestureModel | None = None
+        self._num_classes = 0
         self._last_error = ""
 
         self.reload(model_path=self._model_path, label_map=self._label_map)
@@ -84,6 +86,7 @@ class StaticInferenceRunner:
         self._last_error = ""
 
         num_classes = self._infer_num_classes(self._model_path, self._label_map)
+        self._num_classes = max(0, num_classes)
         if num_classes <= 0:
             self._model = None
             self._last_error = (
@@ -166,6 +169,100 @@ class StaticInferenceRunner:
                 is_unknown=True,
             )
 
+    def infer_batch(
+        self,
+        hand_frames: list[NormalizedHandFrame],
+    ) -> list[StaticInferenceResult]:
+        """
+        Run static inference for several frames in one forward pass.
+
+        Results come back in input order. Frames with the wrong feature size
+        get an UNKNOWN result without failing the rest of the batch, so one
+        bad source cannot starve the others that share this runner.
+        """
+
+        unknown = StaticInferenceResult(
+            label_idx=-1,
+            label_name="UNKNOWN",
+            confidence=0.0,
+            is_unknown=True,
+        )
+        results = [unknown] * len(hand_frames)
+        if self._model is None or not hand_frames:
+            return results
+
+        valid_positions: list[int] = []
+        rows: list[list[float]] = []
+        for position, hand_frame in enumerate(hand_frames):
+            features = hand_frame.normalized_features
+            if len(features) != self._input_size:
+                self._last_error = (
+                    f"Expected {self._input_size} normalized features, got {len(features)}."
+                )
+                continue
+            valid_positions.append(position)
+            rows.append(features)
+
+        if not rows:
+            return results
+
+        try:
+            x = torch.tensor(rows, dtype=torch.float32)
+            with torch.no_grad():
+                probs = F.softmax(self._model(x), dim=1)
+                confidence_tensor, pred_tensor = torch.max(probs, dim=1)
+        except Exception as exc:
+            self._last_error = f"Static batch inference failed: {exc}"
+            return results
+
+        for position, confidence, label_idx in zip(
+            valid_positions,
+            confidence_tensor.tolist(),
+            pred_tensor.tolist(),
+        ):
+            label_name = self._label_map.get(int(label_idx), "UNKNOWN")
+            is_unknown = confidence < self._confidence_threshold or label_name == "UNKNOWN"
+            results[position] = StaticInferenceResult(
+                label_idx=-1 if is_unknown else int(label_idx),
+                label_name="UNKNOWN" if is_unknown else label_name,
+                confidence=float(confidence),
+                is_unknown=is_unknown,
+            )
+        return results
+
+    def warm_up(self, iterations: int = 3, batch_sizes: tuple[int, ...] = (1, 4)) -> dict[str, Any]:
+        """
+        Run synthetic frames through the loaded model before live traffic.
+
+        The first forward pass for a given input shape pays one-time costs
+        (kernel selection, allocator growth), so each batch size the scheduler
+        commonly forms is exercised. Returns cold versus warm latency per
+        batch size, or a `skipped` reason when no model is loaded.
+        """
+
+        if self._model is None:
+            return {"skipped": self._last_error or "no model loaded"}
+
+        synthetic = NormalizedHandFrame(
+            frame_id=-1,
+            timestamp=0.0,
+            frame_bgr=None,
+            landmarks_xyz=[[0.0, 0.0, 0.0]] * 21,
+            all_landmarks_xyz=None,
+            normalized_features=[0.0] * self._input_size,
+            tracking_confidence=1.0,
+            hand_present=True,
+            hand_count=1,
+            raw_gesture_hint=None,
+        )
+        return {
+            f"batch_{size}": time_warm_up(
+                lambda size=size: self.infer_batch([synthetic] * size),
+                iterations,
+            )
+            for size in batch_sizes
+        }
+
     def get_last_error(self) -> str:
         """Return the last human-readable model load or inference error."""
 
@@ -181,6 +278,21 @@ class StaticInferenceRunner:
 
         return dict(self._label_map)
 
+    def set_label_map(self, label_map: dict[int, str]) -> bool:
+        """
+        Replace only the label names, keeping the loaded weights.
+
+        Used for config hot reloads such as a rename. Returns False without
+        changing anything when the map needs more output classes than the
+        loaded model has; that takes a full `reload()`.
+        """
+
+        new_map = dict(label_map)
+        if self._model is not None and max(new_map, default=-1) >= self._num_classes:
+            return False
+        self._label_map = new_map
+        return True
+
     def _infer_num_classes(self, model_path: str, label_map: dict[int, str]) -> int:
         """
         Infer the output size expected by the stored model weights.
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+# Fields every status message carries even when unchanged. The engine's
+# status handler re-reads these from each message, so leaving them out of a
+# delta would reset its recording progress.
+STICKY_STATUS_FIELDS: tuple[str, ...] = (
+    "state",
+    "message",
+    "mode",
+    "active_label",
+    "sample_count",
+    "target_samples",
+)
+_STICKY_DEFAULTS: dict[str, Any] = {
+    "state": "starting",
+    "message": "",
+    "mode": "HAND",
+    "active_label": "",
+    "sample_count": 0,
+    "target_samples": 0,
+}
+
+
+class StatusPublisher:
+    """
+    Turn status snapshots into rate-limited delta messages.
+
+    Why this exists:
+    `_set_status` runs for every recorded sample (20 times a second) and
+    used to send the whole status dict plus a freshly sorted label list each
+    time. Most of that never changed.
+
+    Behavior:
+    - `publish()` takes the full current status; only fields that differ from
+      the last sent message go out, plus `STICKY_STATUS_FIELDS`
+    - the label list is sent only when `set_labels()` saw a different list,
+      tracked by `labels_version`; every message carries the version
+    - messages are limited to `max_rate_hz`; updates inside the window are
+      merged and flushed once when it ends. A change of `state` is always
+      sent immediately because clients act on transitions
+    - `snapshot()` builds a complete message for new clients and GET_STATUS
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict[str, Any]], None],
+        *,
+        max_rate_hz: float = 10.0,
+        sticky_fields: Iterable[str] = STICKY_STATUS_FIELDS,
+    ) -> None:
+        self._send = send
+        self._sticky_fields = tuple(sticky_fields)
+        self._lock = threading.Lock()
+        self._min_interval = 0.0
+        self.set_max_rate_hz(max_rate_hz)
+
+        self._latest: dict[str, Any] = {}
+        self._last_sent: dict[str, Any] = {}
+        self._last_flush_at = 0.0
+        self._timer: threading.Timer | None = None
+
+        self._labels: list[str] = []
+        self._labels_version = 0
+        self._last_sent_labels_version = -1
+
+        self._published = 0
+        self._sent = 0
+        self._suppressed = 0
+
+    @property
+    def labels_version(self) -> int:
+        return self._labels_version
+
+    def set_max_rate_hz(self, max_rate_hz: float) -> None:
+        rate = max(0.5, float(max_rate_hz))
+        with self._lock:
+            self._min_interval = 1.0 / rate
+
+    def set_labels(self, labels: Iterable[str]) -> bool:
+        """Record the current label list; returns True when it changed."""
+
+        ordered = sorted(str(label) for label in labels)
+        with self._lock:
+            if ordered == self._labels:
+                return False
+            self._labels = ordered
+            self._labels_version += 1
+            return True
+
+    def publish(self, status: dict[str, Any]) -> None:
+        """Queue `status` (the full current status) for delta publishing."""
+
+        with self._lock:
+            self._published += 1
+            state_changed = status.get("state") != self._last_sent.get("state")
+            self._latest = dict(status)
+            wait = self._min_interval - (time.monotonic() - self._last_flush_at)
+            if state_changed or wait <= 0:
+                payload = self._build_delta_locked()
+            else:
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._flush_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        if payload is not None:
+            self._send(payload)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a complete status message including the label list."""
+
+        with self._lock:
+            payload = {**_STICKY_DEFAULTS, **self._latest}
+            return {
+                "type": "status",
+                **payload,
+                "labels": list(self._labels),
+                "labels_version": self._labels_version,
+            }
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_rate_hz": round(1.0 / self._min_interval, 3),
+                "published": self._published,
+                "sent": self._sent,
+                "suppressed": self._suppressed,
+                "labels_version": self._labels_version,
+            }
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            self._timer = None
+            payload = self._build_delta_locked()
+        if payload is not None:
+            self._send(payload)
+
+    def _build_delta_locked(self) -> dict[str, Any] | None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        latest = self._latest
+        changed = {
+            key: value
+            for key, value in latest.items()
+            if key not in self._last_sent or self._last_sent[key] != value
+        }
+        labels_changed = self._labels_version != self._last_sent_labels_version
+        if not changed and not labels_changed:
+            self._suppressed += 1
+            return None
+
+        payload: dict[str, Any] = {"type": "status"}
+        for key in self._sticky_fields:
+            payload[key] = latest.get(key, _STICKY_DEFAULTS.get(key))
+        payload.update(changed)
+        payload["labels_version"] = self._labels_version
+        if labels_changed:
+            payload["labels"] = list(self._labels)
+            self._last_sent_labels_version = self._labels_version
+
+        self._last_sent = dict(latest)
+        self._last_flush_at = time.monotonic()
+        self._sent += 1
+        return payload
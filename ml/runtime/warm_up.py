@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Any, Callable
+
+
+def time_warm_up(run: Callable[[], Any], iterations: int = 3) -> dict[str, Any]:
+    """
+    Call `run` `iterations` times and report cold versus warm latency.
+
+    The first call pays the one-time costs (lazy kernel selection, allocator
+    growth, MediaPipe graph start-up); the median of the remaining calls is
+    what a live frame costs afterwards. Runners call this with synthetic
+    inputs at startup and after a reload so the user's first gesture does not
+    pay for it.
+    """
+
+    iterations = max(1, int(iterations))
+    durations_ms: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run()
+        durations_ms.append((time.perf_counter() - started) * 1000.0)
+    warm = durations_ms[1:] or durations_ms
+    return {
+        "cold_ms": round(durations_ms[0], 3),
+        "warm_ms": round(statistics.median(warm), 3),
+        "iterations": iterations,
+        "warmed_at": time.time(),
+    }
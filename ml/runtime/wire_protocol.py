@@ -0,0 +1,216 @@
+"""
+Compact binary framing for high-rate ML service events.
+
+JSON over newline-delimited TCP stays the default protocol on port 50555.
+A client that sends
+
+    {"command": "SET_PROTOCOL", "protocol": "binary"}
+
+receives one JSON acknowledgement line and from then on gets length-prefixed
+binary frames. Commands from the client stay newline-delimited JSON; they
+are rare and human-debuggable matters more there.
+
+Frame layout (all little-endian):
+
+    u32  body length (not counting these 4 bytes)
+    u8   frame kind
+    ...  body
+
+Frame kinds:
+
+    STRING  u16 string id, UTF-8 bytes
+            Defines an id before its first use. Labels, actions and modes are
+            sent once per connection and referenced by id afterwards.
+    GESTURE u8 flags, u16 label id, u16 action id, u16 mode id,
+            f32 confidence, f32 value, f32 index x/y, f32 thumb x/y
+            One gesture or continuous-control event. Flag bit 0 says the tip
+            coordinates are present.
+    JSON    UTF-8 JSON object
+            Everything else (status, training, metrics, and any gesture that
+            carries extra fields) so no information is ever lost.
+
+`WireEncoder` and `WireDecoder` are stateful per connection because the
+string table is. The decoder is the reference implementation for other
+clients and returns the same dicts the JSON protocol would have produced.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+PROTOCOL_VERSION = 1
+
+FRAME_STRING = 0x01
+FRAME_GESTURE = 0x02
+FRAME_JSON = 0x03
+
+FLAG_HAS_TIPS = 0x01
+
+_LENGTH = struct.Struct("<I")
+_KIND = struct.Struct("<B")
+_STRING_HEADER = struct.Struct("<BH")
+_GESTURE = struct.Struct("<BBHHHffffff")
+
+# Keys a gesture payload may carry and still use the compact record.
+_GESTURE_KEYS = frozenset(
+    {"type", "label", "class", "action", "mode", "confidence", "value", "index_tip", "thumb_tip"}
+)
+_MAX_STRING_IDS = 0xFFFF
+
+
+class WireEncoder:
+    """Encode outbound payloads into binary frames for one connection."""
+
+    def __init__(self) -> None:
+        self._string_ids: dict[str, int] = {}
+
+    def encode(self, payload: dict[str, Any]) -> bytes:
+        """Return one or more complete frames for `payload`."""
+
+        if self._is_compact_gesture(payload):
+            prefix = bytearray()
+            # New ids only stick once all three fit; otherwise the message
+            # goes out as JSON and the peer never sees their STRING frames.
+            pending: dict[str, int] = {}
+            label_id = self._string_id(str(payload.get("label", "")), prefix, pending)
+            action_id = self._string_id(str(payload.get("action", "")), prefix, pending)
+            mode_id = self._string_id(str(payload.get("mode", "")), prefix, pending)
+            if label_id is not None and action_id is not None and mode_id is not None:
+                self._string_ids.update(pending)
+                index_tip = payload.get("index_tip") or {}
+                thumb_tip = payload.get("thumb_tip") or {}
+                flags = FLAG_HAS_TIPS if "index_tip" in payload else 0
+                body = _GESTURE.pack(
+                    FRAME_GESTURE,
+                    flags,
+                    label_id,
+                    action_id,
+                    mode_id,
+                    float(payload.get("confidence", 0.0)),
+                    float(payload.get("value", 0.0)),
+                    float(index_tip.get("x", 0.0)),
+                    float(index_tip.get("y", 0.0)),
+                    float(thumb_tip.get("x", 0.0)),
+                    float(thumb_tip.get("y", 0.0)),
+                )
+                return bytes(prefix) + _LENGTH.pack(len(body)) + body
+
+        body = _KIND.pack(FRAME_JSON) + json.dumps(payload).encode("utf-8")
+        return _LENGTH.pack(len(body)) + body
+
+    def _is_compact_gesture(self, payload: dict[str, Any]) -> bool:
+        if payload.get("type") != "gesture":
+            return False
+        if not _GESTURE_KEYS.issuperset(payload.keys()):
+            return False
+        if "class" in payload and payload["class"] != payload.get("label"):
+            return False
+        # Tips are either both present or both absent in every producer.
+        return ("index_tip" in payload) == ("thumb_tip" in payload)
+
+    def _string_id(self, text: str, prefix: bytearray, pending: dict[str, int]) -> int | None:
+        string_id = self._string_ids.get(text, pending.get(text))
+        if string_id is not None:
+            return string_id
+        string_id = len(self._string_ids) + len(pending)
+        if string_id >= _MAX_STRING_IDS:
+            return None
+        pending[text] = string_id
+        body = _STRING_HEADER.pack(FRAME_STRING, string_id) + text.encode("utf-8")
+        prefix += _LENGTH.pack(len(body)) + body
+        return string_id
+
+
+def leading_string_frames(message: bytes) -> bytes:
+    """
+    Return the STRING frames at the start of an encoded message.
+
+    A transport that has to drop an encoded message keeps these and sends
+    them ahead of the next one, because later frames may refer to the ids
+    they define.
+    """
+
+    offset = 0
+    while len(message) - offset > _LENGTH.size:
+        (length,) = _LENGTH.unpack_from(message, offset)
+        if message[offset + _LENGTH.size] != FRAME_STRING:
+            break
+        offset += _LENGTH.size + length
+    return message[:offset]
+
+
+class WireDecoder:
+    """
+    Reference decoder for the binary protocol.
+
+    Feed it raw socket bytes in any chunking; it returns the payload dicts the
+    JSON protocol would have delivered. STRING frames only update the table
+    and produce no payload.
+    """
+
+    def __init__(self, max_frame_bytes: int = 1 << 20) -> None:
+        self._buffer = bytearray()
+        self._strings: dict[int, str] = {}
+        self._max_frame_bytes = int(max_frame_bytes)
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        self._buffer += data
+        payloads: list[dict[str, Any]] = []
+        offset = 0
+        buffer = self._buffer
+        while len(buffer) - offset >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(buffer, offset)
+            if length > self._max_frame_bytes or length < _KIND.size:
+                raise ValueError(f"Invalid frame length: {length}")
+            end = offset + _LENGTH.size + length
+            if end > len(buffer):
+                break
+            payload = self._decode_body(memoryview(buffer)[offset + _LENGTH.size:end])
+            if payload is not None:
+                payloads.append(payload)
+            offset = end
+        if offset:
+            del self._buffer[:offset]
+        return payloads
+
+    def _decode_body(self, body: memoryview) -> dict[str, Any] | None:
+        kind = body[0]
+        if kind == FRAME_STRING:
+            _, string_id = _STRING_HEADER.unpack_from(body, 0)
+            self._strings[string_id] = bytes(body[_STRING_HEADER.size:]).decode("utf-8")
+            return None
+        if kind == FRAME_GESTURE:
+            (
+                _,
+                flags,
+                label_id,
+                action_id,
+                mode_id,
+                confidence,
+                value,
+                index_x,
+                index_y,
+                thumb_x,
+                thumb_y,
+            ) = _GESTURE.unpack_from(body, 0)
+            label = self._strings.get(label_id, "UNKNOWN")
+            payload: dict[str, Any] = {
+                "type": "gesture",
+                "label": label,
+                "class": label,
+                "action": self._strings.get(action_id, ""),
+                "mode": self._strings.get(mode_id, ""),
+                "confidence": confidence,
+                "value": value,
+            }
+            if flags & FLAG_HAS_TIPS:
+                payload["index_tip"] = {"x": index_x, "y": index_y}
+                payload["thumb_tip"] = {"x": thumb_x, "y": thumb_y}
+            return payload
+        if kind == FRAME_JSON:
+            return json.loads(bytes(body[1:]).decode("utf-8"))
+        raise ValueError(f"Unknown frame kind: {kind}")
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
-import socket
 import sys
 import threading
 import time
 import traceback
 import csv
 from collections import deque
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, TypeVar
 
 try:
     import winsound
@@ -37,21 +37,55 @@ if VENDOR.exists() and str(VENDOR) not in sys.path:
 
 os.environ.setdefault("PYTHONNOUSERSITE", "1")
 
+# Reference point for the startup timeline reported in GET_METRICS.
+_MODULE_LOADED_AT = time.monotonic()
+
 from ml.feature_extraction import diagnose_environment
-from ml.runtime.camera_manager import CameraManager
-from ml.runtime.dynamic_inference_runner import DynamicInferenceRunner, SequenceBuffer
+from ml.runtime.camera_manager import CameraManager, enumerate_cameras
+from ml.runtime.camera_probe_cache import CameraProbeCache
+from ml.runtime.command_server import CommandServer
+from ml.runtime.flight_recorder import RECORDING_DIR, FlightRecorder
 from ml.runtime.gates import InferenceGatePipeline
-from ml.runtime.hand_ingestion import (
-    HandIngestion,
-    mp as runtime_mediapipe,
-    mp_error as runtime_mediapipe_error,
-)
+from ml.runtime.gesture_stabilizer import GestureStabilizer, InferenceResult
+from ml.runtime.latency_tracer import LatencyTracer
+from ml.runtime.outbound_queue import PRIORITY_REPLY, OutboundEventQueue
 from ml.runtime.preview_overlay import PreviewOverlayRenderer
-from ml.runtime.static_inference_runner import StaticInferenceRunner
-from ml.runtime.priority_router import PriorityRouter
-from ml.runtime.types import DynamicInferenceResult, PreviewState, StaticInferenceResult
-from ml.training.train_dynamic import train_dynamic_model
-from ml.training.train_static import train_static_model
+from ml.runtime.sampling_profiler import PROFILE_DIR, PROFILE_FORMATS, SamplingProfiler
+from ml.runtime.service_logging import (
+    configure_logging,
+    get_logger,
+    logging_stats,
+    set_log_level,
+)
+from ml.runtime.config_store import CONFIG_STORE
+from ml.runtime.config_watcher import ConfigWatcher
+from ml.runtime.static_batch_scheduler import StaticBatchScheduler
+from ml.runtime.status_publisher import StatusPublisher
+from ml.runtime.priority_router import UNKNOWN_LABEL_ID, PriorityRouter
+from ml.runtime.shm_ring import ShmEventPublisher, ShmRing
+from ml.runtime.sliding_window_recognizer import SlidingWindowRecognizer, WindowDetection
+from ml.runtime.span_tracer import TRACE_DIR, TRACER
+from ml.runtime.types import (
+    CameraFrame,
+    DynamicInferenceResult,
+    NormalizedHandFrame,
+    PreviewState,
+    StaticInferenceResult,
+)
+
+# torch (model runners), mediapipe (hand ingestion and camera sessions), the
+# training modules, vosk/sounddevice and flask take seconds to import, so they
+# are imported where first needed: the command socket binds before any of
+# them load, and the warm start or first use pulls them in.
+if TYPE_CHECKING:
+    from ml.runtime.camera_session import CameraSession
+    from ml.runtime.dynamic_inference_runner import (
+        DynamicInferenceRunner,
+        DynamicPrefixStream,
+        SequenceBuffer,
+    )
+    from ml.runtime.hand_ingestion import HandIngestion
+    from ml.runtime.static_inference_runner import StaticInferenceRunner
 
 cv2_error = ""
 try:
@@ -67,101 +101,145 @@ except ImportError as exc:  # pragma: no cover - depends on local runtime
     np = None  # type: ignore[assignment]
     np_error = str(exc)
 
-vosk_error = ""
-try:
-    from vosk import KaldiRecognizer, Model as VoskModel
-    import sounddevice as sd
-except ImportError as exc:  # pragma: no cover - depends on local runtime
-    KaldiRecognizer = None  # type: ignore[assignment]
-    VoskModel = None  # type: ignore[assignment]
-    sd = None  # type: ignore[assignment]
-    vosk_error = str(exc)
+_VOICE_BACKEND: tuple[Any, Any, Any, str] | None = None
 
-try:
-    from flask import Flask, Response
-except ImportError:  # pragma: no cover - depends on local runtime
-    Flask = None  # type: ignore[assignment]
-    Response = None  # type: ignore[assignment]
 
-HOST = "127.0.0.1"
-PORT = 50555
-STARTUP_TRACE = ROOT / "startup_trace.log"
-CONFIG_DIR = ROOT / "config"
-DEFAULT_MAPPING_PATH = CONFIG_DIR / "default_mapping.json"
-USER_MAPPING_PATH = CONFIG_DIR / "user_mapping.json"
-OVERRIDE_STATE_PATH = CONFIG_DIR / "override_state.json"
-CUSTOM_STATIC_CSV_PATH = ROOT / "data" / "static" / "custom" / "samples.csv"
-CUSTOM_DYNAMIC_DATA_DIR = ROOT / "data" / "dynamic" / "custom"
-DEFAULT_STATIC_MODEL_PATH = ROOT / "models" / "static" / "default_model.pth"
-CUSTOM_STATIC_MODEL_PATH = ROOT / "models" / "static" / "custom_model.pth"
-DEFAULT_DYNAMIC_MODEL_PATH = ROOT / "models" / "dynamic" / "default_model.pth"
-CUSTOM_DYNAMIC_MODEL_PATH = ROOT / "models" / "dynamic" / "custom_model.pth"
-
-
-@dataclass(slots=True)
-class InferenceResult:
+def _voice_backend() -> tuple[Any, Any, Any, str]:
     """
-    A small internal result type used by the stabilizer/cooldown stage.
+    Import vosk and sounddevice on first use and cache the outcome.
 
-    This is intentionally narrower than the richer runtime dataclasses because
-    the stabilizer only needs a label and a confidence value.
+    Returns `(KaldiRecognizer, VoskModel, sounddevice, error)`; the first
+    three are None when voice input is unavailable.
     """
 
-    label: str
-    confidence: float
-
+    global _VOICE_BACKEND
+    if _VOICE_BACKEND is None:
+        try:
+            from vosk import KaldiRecognizer, Model as VoskModel
+            import sounddevice as sd
+        except (ImportError, OSError) as exc:  # pragma: no cover - depends on local runtime
+            _VOICE_BACKEND = (None, None, None, str(exc))
+        else:
+            _VOICE_BACKEND = (KaldiRecognizer, VoskModel, sd, "")
+    return _VOICE_BACKEND
 
-class GestureStabilizer:
-    """
-    Confirmation filter for recognized gesture labels.
 
-    Why this still exists in Phase 1:
-    the new gate pipeline controls *whether* a frame may reach inference, but
-    it does not replace the existing output confirmation policy. We still want
-    to demand a few consistent model predictions before emitting a gesture over
-    IPC, otherwise the runtime will feel twitchy.
-    """
+_Number = TypeVar("_Number", int, float)
 
-    def __init__(
-        self,
-        window_size: int = 5,
-        min_confirmation_frames: int = 2,
-        min_confidence: float = 0.85,
-    ) -> None:
-        self.window_size = int(window_size)
-        self.min_confirmation_frames = int(min_confirmation_frames)
-        self.min_confidence = float(min_confidence)
-        self.history: list[str] = []
 
-    def reset(self) -> None:
-        """Clear stabilizer history on mode changes or hard tracking loss."""
+def _env_number(name: str, default: _Number) -> _Number:
+    """
+    Read a numeric setting from the environment, typed like `default`.
 
-        self.history.clear()
+    These are read at import time, before the socket binds, so a malformed
+    value logs a warning and keeps the default instead of killing the
+    service; `SET_SETTINGS` treats bad values the same way.
+    """
 
-    def __call__(self, result: InferenceResult) -> InferenceResult:
-        """
-        Confirm only labels that appear consistently in the recent history.
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return type(default)(raw)
+    except ValueError:
+        get_logger("service").warning(
+            "ignoring %s=%r: expected %s, using %s", name, raw, type(default).__name__, default
+        )
+        return default
 
-        Unknown or low-confidence results are still pushed into history as
-        UNKNOWN so that the stabilizer naturally cools off when tracking gets
-        noisy.
-        """
 
-        if result.label == "UNKNOWN" or result.confidence < self.min_confidence:
-            self.history.append("UNKNOWN")
-            if len(self.history) > self.window_size:
-                self.history.pop(0)
-            return InferenceResult(label="UNKNOWN", confidence=result.confidence)
+def _env_optional_number(name: str, default: _Number | None, cast: type[_Number]) -> _Number | None:
+    """Like `_env_number`, but "off" or "none" disables the setting (None)."""
 
-        self.history.append(result.label)
-        if len(self.history) > self.window_size:
-            self.history.pop(0)
+    raw = os.environ.get(name, "").strip().lower()
+    if not raw:
+        return default
+    if raw in ("off", "none"):
+        return None
+    try:
+        return cast(raw)
+    except ValueError:
+        get_logger("service").warning(
+            "ignoring %s=%r: expected %s or 'off', using %s",
+            name,
+            raw,
+            cast.__name__,
+            "off" if default is None else default,
+        )
+        return default
 
-        counts = {label: self.history.count(label) for label in set(self.history)}
-        if counts.get(result.label, 0) >= self.min_confirmation_frames:
-            return result
 
-        return InferenceResult(label="UNKNOWN", confidence=result.confidence)
+HOST = "127.0.0.1"
+# SPIDER_ML_SERVICE_PORT lets tools such as the cold-start benchmark run a
+# second instance next to the engine's.
+PORT = _env_number("SPIDER_ML_SERVICE_PORT", 50555)
+# Optional Linux-local transports. Both are off unless the launcher sets them:
+# a Unix socket path served alongside TCP, and a shared-memory ring name that
+# gesture events are mirrored into. An inherited eventfd number enables
+# futex-style wakeups for the ring consumer.
+UNIX_SOCKET_PATH = (
+    os.environ.get("SPIDER_ML_SERVICE_SOCKET", "") if sys.platform != "win32" else ""
+)
+SHM_RING_NAME = os.environ.get("SPIDER_ML_SHM_RING", "")
+SHM_RING_WAKE_FD = os.environ.get("SPIDER_ML_SHM_WAKE_FD", "")
+# How many seconds of per-frame decisions the flight recorder keeps.
+FLIGHT_RECORDER_SECONDS = _env_number("SPIDER_ML_FLIGHT_RECORDER_SEC", 30.0)
+# Static predictions at or above this confidence are confirmed on their first
+# frame instead of waiting for a second one; "off" (the default) keeps the
+# plain 2-of-5 vote. 0.99 was tuned on synthetic replays of the stock static
+# model; a retrained model's confidences sit differently, so opt in only
+# after replaying its flight recordings with `python -m ml.benchmarks.stabilizer`.
+STABILIZER_IMMEDIATE_CONFIDENCE = _env_optional_number("SPIDER_ML_STABILIZER_IMMEDIATE_CONF", None, float)
+# A dynamic gesture is emitted mid-episode once its prefix of at least
+# DYNAMIC_EARLY_MIN_FRAMES frames is classified at this confidence twice in a
+# row; "off" (the default) waits for the episode to end. Short prefixes are
+# confidently wrong (circles start like swipes), and a threshold only holds
+# for the model it was calibrated on, so calibrate both together on held-out
+# recordings with `python -m ml.benchmarks.dynamic_early_commit`.
+DYNAMIC_EARLY_CONFIDENCE = _env_optional_number("SPIDER_ML_DYNAMIC_EARLY_CONF", None, float)
+DYNAMIC_EARLY_MIN_FRAMES = _env_number("SPIDER_ML_DYNAMIC_EARLY_MIN_FRAMES", 22)
+# Architecture for custom dynamic retrains: "lstm" or "tcn" (a dilated
+# temporal convolution network); `python -m ml.benchmarks.dynamic_models`
+# compares them. The runner loads whichever type a checkpoint records.
+DYNAMIC_MODEL_TYPE = os.environ.get("SPIDER_ML_DYNAMIC_MODEL_TYPE", "lstm").strip().lower() or "lstm"
+# Always-on dynamic recognition: while a hand is tracked, the last 30 frames
+# are classified every SPIDER_ML_DYNAMIC_SLIDING_STRIDE frames, in batches of
+# DYNAMIC_SLIDING_BATCH windows, with no clutch or motion episode; overlapping
+# detections merge into one event. Windows whose pose moves less than
+# DYNAMIC_SLIDING_MIN_MOTION (feature units) are skipped. "off" keeps
+# episodes. The model has no idle class, so transitions between gestures can
+# fire too; `python -m ml.benchmarks.sliding_window` measures this.
+DYNAMIC_SLIDING_STRIDE = _env_optional_number("SPIDER_ML_DYNAMIC_SLIDING_STRIDE", None, int)
+if DYNAMIC_SLIDING_STRIDE is not None:
+    DYNAMIC_SLIDING_STRIDE = max(1, DYNAMIC_SLIDING_STRIDE)
+DYNAMIC_SLIDING_BATCH = _env_number("SPIDER_ML_DYNAMIC_SLIDING_BATCH", 2)
+DYNAMIC_SLIDING_CONFIDENCE = _env_number("SPIDER_ML_DYNAMIC_SLIDING_CONF", 0.99)
+DYNAMIC_SLIDING_MIN_MOTION = _env_number("SPIDER_ML_DYNAMIC_SLIDING_MIN_MOTION", 0.5)
+# Commands that do not touch the camera, models or hand tracking and so can
+# be answered while the warm start is still running.
+_COMMANDS_BEFORE_WARM_START = frozenset(
+    {
+        "GET_STATUS",
+        "GET_METRICS",
+        "LIST_LABELS",
+        "TRACE_START",
+        "TRACE_STOP",
+        "TRACE_DUMP",
+        "PROFILE",
+        "DUMP_FLIGHT_RECORDER",
+        "SHUTDOWN",
+    }
+)
+CONFIG_DIR = ROOT / "config"
+DEFAULT_MAPPING_PATH = CONFIG_DIR / "default_mapping.json"
+USER_MAPPING_PATH = CONFIG_DIR / "user_mapping.json"
+OVERRIDE_STATE_PATH = CONFIG_DIR / "override_state.json"
+CUSTOM_STATIC_CSV_PATH = ROOT / "data" / "static" / "custom" / "samples.csv"
+CUSTOM_DYNAMIC_DATA_DIR = ROOT / "data" / "dynamic" / "custom"
+DEFAULT_STATIC_MODEL_PATH = ROOT / "models" / "static" / "default_model.pth"
+CUSTOM_STATIC_MODEL_PATH = ROOT / "models" / "static" / "custom_model.pth"
+DEFAULT_DYNAMIC_MODEL_PATH = ROOT / "models" / "dynamic" / "default_model.pth"
+CUSTOM_DYNAMIC_MODEL_PATH = ROOT / "models" / "dynamic" / "custom_model.pth"
 
 
 def resolve_vosk_model_dir() -> Path | None:
@@ -180,6 +258,22 @@ def resolve_vosk_model_dir() -> Path | None:
 
 
 def describe_runtime() -> Dict[str, Any]:
+    # Called once the warm start has imported hand ingestion. Voice is only
+    # checked for presence here; `_voice_backend()` imports it on first use.
+    from ml.runtime.hand_ingestion import (
+        mp as runtime_mediapipe,
+        mp_error as runtime_mediapipe_error,
+    )
+
+    if _VOICE_BACKEND is not None:
+        voice_ready = _VOICE_BACKEND[0] is not None
+        vosk_error = _VOICE_BACKEND[3]
+    else:
+        missing = [
+            name for name in ("vosk", "sounddevice") if importlib.util.find_spec(name) is None
+        ]
+        voice_ready = not missing
+        vosk_error = f"No module named {', '.join(missing)}" if missing else ""
     return {
         "python": sys.executable,
         "cv2": bool(cv2),
@@ -188,40 +282,36 @@ def describe_runtime() -> Dict[str, Any]:
         "numpy_error": np_error,
         "mediapipe": bool(runtime_mediapipe),
         "mediapipe_error": runtime_mediapipe_error,
-        "vosk": bool(KaldiRecognizer and VoskModel and sd),
+        "vosk": voice_ready,
         "vosk_error": vosk_error,
         "venv_site": str(VENV_SITE) if VENV_SITE.exists() else "",
     }
 
 
-def trace_startup(message: str) -> None:
-    try:
-        STARTUP_TRACE.parent.mkdir(parents=True, exist_ok=True)
-        with STARTUP_TRACE.open("a", encoding="utf-8") as handle:
-            handle.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
-    except Exception:
-        pass
+_LOG = get_logger("service")
+_PIPELINE_LOG = get_logger("pipeline")
+_STARTUP_LOG = get_logger("startup")
 
 
-def _load_json_file(path: Path, default: Any) -> Any:
-    if not path.exists():
-        return default
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
-    except Exception:
-        return default
+def trace_startup(message: str) -> None:
+    """Log a startup milestone; the background writer owns the file."""
+
+    _STARTUP_LOG.info("%s", message)
 
 
 def _save_json_file(path: Path, payload: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
+    CONFIG_STORE.save(path, payload)
+
 
+def _mapping_sections(*, copy: bool = True) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Parsed default and user mappings from the shared config store.
+
+    Pass `copy=False` only to read: the result is then the cached object.
+    """
 
-def _mapping_sections() -> tuple[dict[str, Any], dict[str, Any]]:
-    default_mapping = _load_json_file(DEFAULT_MAPPING_PATH, default={})
-    user_mapping = _load_json_file(USER_MAPPING_PATH, default={})
+    default_mapping = CONFIG_STORE.get(DEFAULT_MAPPING_PATH, default={}, copy=copy)
+    user_mapping = CONFIG_STORE.get(USER_MAPPING_PATH, default={}, copy=copy)
     if not isinstance(default_mapping, dict):
         default_mapping = {}
     if not isinstance(user_mapping, dict):
@@ -240,7 +330,7 @@ def _dynamic_section(mapping: dict[str, Any]) -> dict[str, Any]:
 
 
 def _list_custom_static_gestures() -> list[tuple[int, str]]:
-    _, user_mapping = _mapping_sections()
+    _, user_mapping = _mapping_sections(copy=False)
     static_mapping = _static_section(user_mapping)
     gestures: list[tuple[int, str]] = []
     for key in sorted(static_mapping, key=lambda item: int(item)):
@@ -259,7 +349,7 @@ def _label_name_map(section: dict[str, Any]) -> dict[int, str]:
 
 
 def _merged_label_map(kind: str) -> dict[int, str]:
-    default_mapping, user_mapping = _mapping_sections()
+    default_mapping, user_mapping = _mapping_sections(copy=False)
     if kind == "dynamic":
         merged = _label_name_map(_dynamic_section(default_mapping))
         merged.update(_label_name_map(_dynamic_section(user_mapping)))
@@ -271,7 +361,7 @@ def _merged_label_map(kind: str) -> dict[int, str]:
 
 
 def _default_label_floor(kind: str) -> int:
-    default_mapping, _ = _mapping_sections()
+    default_mapping, _ = _mapping_sections(copy=False)
     if kind == "dynamic":
         label_map = _label_name_map(_dynamic_section(default_mapping))
     else:
@@ -279,8 +369,25 @@ def _default_label_floor(kind: str) -> int:
     return max(label_map.keys(), default=-1)
 
 
+def _client_output_path(directory: Path, requested: Any) -> Path | None:
+    """
+    Resolve an output file name sent by a client to a file in `directory`.
+
+    The command socket is unauthenticated, so clients choose a name, never a
+    location: anything with a directory part is refused with `ValueError`.
+    No name (None or empty) means the writer's own timestamped default.
+    """
+
+    if not requested:
+        return None
+    name = str(requested).strip()
+    if name in ("", ".", "..") or any(separator in name for separator in ("/", "\\", ":")):
+        raise ValueError(f"path must be a file name inside {directory.name}/, got {name!r}")
+    return directory / name
+
+
 def _load_runtime_static_labels() -> tuple[dict[int, str], str]:
-    default_mapping, user_mapping = _mapping_sections()
+    default_mapping, user_mapping = _mapping_sections(copy=False)
     user_static = _static_section(user_mapping)
     if user_static and CUSTOM_STATIC_MODEL_PATH.exists():
         return _merged_label_map("static"), str(CUSTOM_STATIC_MODEL_PATH)
@@ -288,7 +395,7 @@ def _load_runtime_static_labels() -> tuple[dict[int, str], str]:
 
 
 def _load_runtime_dynamic_labels() -> tuple[dict[int, str], str]:
-    default_mapping, user_mapping = _mapping_sections()
+    default_mapping, user_mapping = _mapping_sections(copy=False)
     user_dynamic = _dynamic_section(user_mapping)
     if user_dynamic and CUSTOM_DYNAMIC_MODEL_PATH.exists():
         return _merged_label_map("dynamic"), str(CUSTOM_DYNAMIC_MODEL_PATH)
@@ -461,6 +568,8 @@ def _delete_custom_static_gesture(name_or_label: str) -> int:
 
 
 def _retrain_custom_static_model(progress_cb: Any = None) -> dict[str, Any]:
+    from ml.training.train_static import train_static_model
+
     _normalize_custom_static_labels()
     result = train_static_model(
         target="custom",
@@ -474,8 +583,10 @@ def _retrain_custom_static_model(progress_cb: Any = None) -> dict[str, Any]:
 
 
 def _retrain_custom_dynamic_model() -> dict[str, Any]:
+    from ml.training.train_dynamic import train_dynamic_model
+
     _normalize_custom_dynamic_labels()
-    result = train_dynamic_model(target="custom")
+    result = train_dynamic_model(target="custom", model_type=DYNAMIC_MODEL_TYPE)
     merged_labels = _merged_label_map("dynamic")
     result["accuracy"] = result.get("val_accuracy", 0.0)
     result["labels"] = [merged_labels[key] for key in sorted(merged_labels)]
@@ -488,12 +599,33 @@ class MlService:
 
         # --- RUNTIME STATE ---
         self._running = True
-        self._client: socket.socket | None = None
-        self._send_lock = threading.Lock()
+        # Every connected client (engine, dashboard, tools) goes through one
+        # asyncio server; `_send` fans events out to their subscriptions.
+        self._command_server = CommandServer(
+            HOST,
+            PORT,
+            handle_command=self.handle_command,
+            on_connect=self._on_client_connected,
+            on_last_disconnect=self._on_last_client_disconnected,
+            unix_path=UNIX_SOCKET_PATH or None,
+        )
+        self._shm_event_publisher = self._open_shm_event_publisher()
+        # Capture-to-send latency per hop. Gesture payloads carry a private
+        # `_trace` dict that the writer thread completes and strips.
+        self._latency_tracer = LatencyTracer(include_in_payload=False)
+        # Last N seconds of per-frame decisions, dumped on DUMP_FLIGHT_RECORDER
+        # when a user reports a misfire.
+        self._flight_recorder = FlightRecorder(seconds=FLIGHT_RECORDER_SECONDS)
+        # Producers only enqueue; the writer thread hands events to the
+        # command server so a slow client never stalls the pipeline thread.
+        self._outbound_queue = OutboundEventQueue(self._deliver_event)
         self._model_lock = threading.Lock()
         self._state_lock = threading.Lock()
 
         self._status: Dict[str, Any] = {"state": "starting"}
+        # Status goes out as rate-limited deltas; the label list only when it
+        # changes. New clients and GET_STATUS get a full snapshot.
+        self._status_publisher = StatusPublisher(self._send, max_rate_hz=10.0)
         self._interaction_mode = "HAND"
         # Camera index 0 is the built-in/default webcam. Change this to 1 when
         # diagnosing a second camera or OBS Virtual Camera input.
@@ -506,16 +638,24 @@ class MlService:
         self._camera_state = "idle"
         self._mic_state = "idle"
 
+        # Label names come from the mapping files alone (no torch), so
+        # LIST_LABELS can answer during the warm start; `_load_runtime_model`
+        # refreshes them together with the models.
         self._labels: dict[int, str] = {}
-        self._gesture_stabilizer = GestureStabilizer(min_confidence=0.72)
+        try:
+            self._labels, _model_path = _load_runtime_static_labels()
+        except (OSError, ValueError) as exc:
+            _LOG.warning("label map unavailable before warm start error=%s", exc)
+        self._status_publisher.set_labels(self._labels.values())
+        self._gesture_stabilizer = GestureStabilizer(
+            min_confidence=0.72,
+            immediate_confidence=STABILIZER_IMMEDIATE_CONFIDENCE,
+        )
         self._last_action_time = 0.0
         self._action_cooldown_sec = 1.5
         self._last_action_label: str | None = None
         self._last_voice_emit = 0.0
-        self._send_fail_count = 0
-        self._send_fail_max = 5
         self._last_tracking_status_emit = 0.0
-        self._last_no_hand_debug_print = 0.0
         self._tracking_fail_count = 0
         self._camera_read_fail_count = 0
         self._hand_present_prev = False
@@ -540,23 +680,78 @@ class MlService:
         self._dynamic_motion_threshold = 0.020
         self._dynamic_idle_timeout_sec = 0.14
         self._dynamic_min_frames = 8
+        self._dynamic_stream: DynamicPrefixStream | None = None
+        self._dynamic_early_emits = 0
+        self._dynamic_early_saved_frames = 0
+        self._sliding_recognizer: SlidingWindowRecognizer | None = None
+        if DYNAMIC_SLIDING_STRIDE is not None:
+            self._sliding_recognizer = SlidingWindowRecognizer(
+                self._infer_dynamic_batch_shared,
+                stride=DYNAMIC_SLIDING_STRIDE,
+                batch_windows=DYNAMIC_SLIDING_BATCH,
+                min_confidence=DYNAMIC_SLIDING_CONFIDENCE,
+                min_motion=DYNAMIC_SLIDING_MIN_MOTION,
+            )
 
         # --- PHASE 1 COMPONENTS ---
-        self._camera_manager = CameraManager(camera_index=self._camera_index, width=640, height=480)
-        self._hand_ingestion = HandIngestion(
-            min_detection_confidence=self._hand_min_detection_confidence
+        self._camera_probe_cache = CameraProbeCache()
+        self._camera_manager = CameraManager(
+            camera_index=self._camera_index,
+            width=640,
+            height=480,
+            probe_cache=self._camera_probe_cache,
         )
+        # Created by the warm start, which also builds the MediaPipe graph and
+        # loads the models concurrently once the command socket is listening.
+        self._hand_ingestion: HandIngestion | None = None
         self._gate_pipeline = InferenceGatePipeline(
             min_confidence=0.75,
             required_hold_frames=1,
         )
         self._preview_renderer = PreviewOverlayRenderer()
+        # The pipeline holds exactly one pooled camera frame at a time. The
+        # owning manager is remembered with it because a camera switch swaps
+        # `_camera_manager` while the old frame may still be held.
+        self._held_camera_frame: tuple[CameraManager, CameraFrame] | None = None
         self._static_runner: StaticInferenceRunner | None = None
-        self._sequence_buffer = SequenceBuffer()
-        self._dynamic_runner = DynamicInferenceRunner()
+        self._sequence_buffer: SequenceBuffer | None = None
+        self._dynamic_runner: DynamicInferenceRunner | None = None
         self._router = PriorityRouter()
-        self._load_runtime_model()
-        trace_startup("phase1 components ready")
+        # Mapping and override edits are applied in the background, without
+        # `_model_lock`; started with the pipeline.
+        self._config_watcher = ConfigWatcher(
+            (DEFAULT_MAPPING_PATH, USER_MAPPING_PATH, OVERRIDE_STATE_PATH),
+            self._on_config_files_changed,
+        )
+        self._config_reloads = 0
+        self._config_reload_ms = 0.0
+        self._config_pending_model_reload: list[str] = []
+        # Serializes the watcher's handler with model reloads, which both
+        # publish `_labels` and `_config_pending_model_reload`. The service's
+        # own mapping writes during a retrain trigger the watcher while the
+        # reload runs. Lock order: `_model_lock`, then `_config_lock`.
+        self._config_lock = threading.Lock()
+
+        # --- WARM START ---
+        # Commands that need the pipeline are parked until `_warm_started`
+        # and then replayed in order on the command worker, which stays free
+        # for status commands meanwhile. `_warm_start_ok` is False when the
+        # warm start failed. The timeline (seconds since module load) is
+        # reported in GET_METRICS.
+        self._warm_started = threading.Event()
+        self._warm_start_ok = False
+        self._parked_commands: deque[tuple[int | None, Dict[str, Any]]] = deque()
+        self._parked_lock = threading.Lock()
+        self._warm_start_thread: Optional[threading.Thread] = None
+        self._startup_components: Dict[str, str] = {
+            "camera": "pending",
+            "hand_tracking": "pending",
+            "models": "pending",
+        }
+        self._startup_timeline: Dict[str, float] = {}
+        # Cold versus warm latency from the last warm-up of each component.
+        self._warm_up_stats: Dict[str, Any] = {}
+        self._mark_startup("service_constructed")
 
         # --- PREVIEW STATE ---
         self._latest_frame_jpeg: bytes | None = None
@@ -576,7 +771,29 @@ class MlService:
         self._preview_thread: Optional[threading.Thread] = None
         self._voice_thread: Optional[threading.Thread] = None
         self._training_thread: Optional[threading.Thread] = None
+        self._profiler: Optional[SamplingProfiler] = None
         self._pipeline_thread: Optional[threading.Thread] = None
+        self._camera_enumeration_thread: Optional[threading.Thread] = None
+
+        # --- ADDITIONAL CAMERA SESSIONS ---
+        # The primary camera above keeps the full pipeline. Extra cameras run
+        # as `CameraSession`s that share the loaded runners below.
+        self._camera_sessions: dict[str, CameraSession] = {}
+        self._camera_sessions_lock = threading.Lock()
+        self._max_camera_sessions = 3
+        # Index the background enumeration is probing right now. A session
+        # for that index waits for the probe to release the device.
+        self._enumerating_camera_index: Optional[int] = None
+        self._camera_enumeration_done = threading.Condition(self._camera_sessions_lock)
+
+        # Static requests from every camera are micro-batched into one
+        # forward pass. With only the primary camera active the scheduler
+        # closes each batch immediately, so single-camera latency is unchanged.
+        self._static_batch_scheduler = StaticBatchScheduler(
+            self._infer_static_batch_locked,
+            max_wait_ms=1.5,
+            max_batch_size=8,
+        )
 
     # ---------------------------------------------------------------------
     # Model and label management
@@ -590,11 +807,24 @@ class MlService:
         `StaticInferenceRunner`.
         """
 
+        with self._config_lock:
+            self._reload_runtime_model()
+
+    def _reload_runtime_model(self) -> None:
         self._labels, model_path = _load_runtime_static_labels()
         dynamic_labels, dynamic_model_path = _load_runtime_dynamic_labels()
+        self._status_publisher.set_labels(self._labels.values())
+
+        if self._dynamic_runner is None:
+            from ml.runtime.dynamic_inference_runner import DynamicInferenceRunner, SequenceBuffer
+
+            self._sequence_buffer = SequenceBuffer()
+            self._dynamic_runner = DynamicInferenceRunner()
 
         if self._static_runner is None:
-                self._static_runner = StaticInferenceRunner(
+            from ml.runtime.static_inference_runner import StaticInferenceRunner
+
+            self._static_runner = StaticInferenceRunner(
                 model_path=model_path,
                 label_map=self._labels,
                 input_size=126,
@@ -608,32 +838,289 @@ class MlService:
             model_path=dynamic_model_path,
         )
 
+        # Startup, retraining and label edits all come through here, so the
+        # first live frame after any of them hits an already-warm model.
+        self._warm_up_stats["static"] = self._static_runner.warm_up()
+        self._warm_up_stats["dynamic"] = self._dynamic_runner.warm_up()
+        self._config_pending_model_reload = []
+
+    def _infer_static_shared(
+        self,
+        hand_frames: list[NormalizedHandFrame],
+    ) -> list[StaticInferenceResult]:
+        """
+        Single entry point to the shared static runner for every camera.
+
+        The primary pipeline and all camera sessions go through here. Requests
+        are queued on the batch scheduler so frames that arrive from several
+        cameras within the batching window share one forward pass.
+        """
+
+        return self._static_batch_scheduler.submit_many(hand_frames)
+
+    def _infer_static_batch_locked(
+        self,
+        hand_frames: list[NormalizedHandFrame],
+    ) -> list[StaticInferenceResult]:
+        """Run one batched forward pass under the model lock."""
+
+        with self._model_lock:
+            if self._static_runner is None:
+                return [
+                    StaticInferenceResult(
+                        label_idx=-1,
+                        label_name="UNKNOWN",
+                        confidence=0.0,
+                        is_unknown=True,
+                    )
+                    for _ in hand_frames
+                ]
+            return self._static_runner.infer_batch(hand_frames)
+
+    def _infer_dynamic_shared(self, sequence: list[list[float]]) -> DynamicInferenceResult:
+        """Shared dynamic runner entry point, mirroring `_infer_static_shared`."""
+
+        with self._model_lock:
+            return self._dynamic_runner.infer_sequence(sequence)
+
+    def _infer_dynamic_batch_shared(self, sequences: list[list[list[float]]]) -> list[DynamicInferenceResult]:
+        """Batched dynamic entry point for the sliding-window recognizer."""
+
+        with self._model_lock:
+            return self._dynamic_runner.infer_batch(sequences)
+
+    def _emit_dynamic_result(
+        self,
+        dynamic_result: DynamicInferenceResult,
+        flight: Any,
+        overlay_frame: Any,
+        normalized_hand: NormalizedHandFrame | None,
+        camera_frame: CameraFrame,
+        ingested_at: float,
+        now: float,
+        decision: str,
+        frames: int | None = None,
+    ) -> None:
+        """Send a recognized dynamic gesture: at episode end, on early commit or from a window."""
+
+        inferred_at = time.monotonic()
+        flight["dynamic_label"] = self._flight_recorder.intern(dynamic_result.label_name)
+        flight["dynamic_confidence"] = dynamic_result.confidence
+        flight["dynamic_frames"] = min(0xFFFF, len(self._dynamic_frames) if frames is None else frames)
+        overlay_frame = self._preview_renderer.render_dynamic(overlay_frame, dynamic_result)
+        self._encode_preview_frame(overlay_frame)
+        self._last_action_time = now
+        predicted_label = dynamic_result.label_name
+        _PIPELINE_LOG.debug("predicted kind=dynamic label=%s decision=%s", predicted_label, decision)
+        payload = self._build_gesture_payload(
+            predicted_label,
+            dynamic_result.confidence,
+            normalized_hand,
+        )
+        payload["action"] = self._router.get_action(predicted_label, "dynamic")
+        payload["value"] = 0.0
+        payload["_trace"] = self._frame_trace(camera_frame, "dynamic", ingested_at, inferred_at)
+        self._send(payload)
+        self._last_action_label = predicted_label
+        self._record_flight_decision(flight, decision, payload["action"])
+
+    def _emit_window_detections(
+        self,
+        detections: list[WindowDetection],
+        flight: Any,
+        overlay_frame: Any,
+        normalized_hand: NormalizedHandFrame | None,
+        camera_frame: CameraFrame,
+        ingested_at: float,
+        now: float,
+    ) -> None:
+        for detection in detections:
+            self._emit_dynamic_result(
+                detection.result,
+                flight,
+                overlay_frame,
+                normalized_hand,
+                camera_frame,
+                ingested_at,
+                now,
+                "dynamic_window_emit",
+                frames=detection.end_frame - detection.start_frame + 1,
+            )
+        self._gesture_stabilizer.reset()
+
+    def _end_sliding_windows(
+        self,
+        flight: Any,
+        overlay_frame: Any,
+        normalized_hand: NormalizedHandFrame | None,
+        camera_frame: CameraFrame,
+        ingested_at: float,
+        now: float,
+    ) -> bool:
+        """
+        The hand was lost or is not usable: end the window stream.
+
+        Emits the gesture it was still holding (a swipe usually ends with the
+        hand leaving the frame) and returns whether anything was emitted.
+        """
+
+        recognizer = self._sliding_recognizer
+        if recognizer is None:
+            return False
+        stage_started = time.perf_counter()
+        detections = recognizer.reset()
+        if not detections:
+            return False
+        flight["dynamic_ms"] = (time.perf_counter() - stage_started) * 1000.0
+        self._emit_window_detections(
+            detections, flight, overlay_frame, normalized_hand, camera_frame, ingested_at, now
+        )
+        return True
+
+    def _open_dynamic_stream(self) -> DynamicPrefixStream | None:
+        if DYNAMIC_EARLY_CONFIDENCE is None:
+            return None
+        with self._model_lock:
+            return self._dynamic_runner.open_stream(DYNAMIC_EARLY_CONFIDENCE, DYNAMIC_EARLY_MIN_FRAMES)
+
+    def _push_dynamic_stream(self, features: list[float]) -> DynamicInferenceResult | None:
+        """Feed one frame to the episode's prefix stream; a result means commit now."""
+
+        stream = self._dynamic_stream
+        if stream is None or stream.committed:
+            return None
+        with self._model_lock:
+            return stream.push(features)
+
     def _available_labels(self) -> list[str]:
         return sorted(list(self._labels.values()))
 
+    def _on_config_files_changed(self, paths: set[Path]) -> None:
+        """
+        Apply mapping or override edits made while the service is running.
+
+        Runs on the config watcher thread. The router compiles new tables and
+        swaps them in, and each runner swaps its label names if its loaded
+        weights still fit. Nothing here takes `_model_lock`, so the frame loop
+        never waits on an edit. Changes that need different weights (more
+        classes, or a switch between the default and custom model) are listed
+        in metrics and applied by the next retrain or delete, which reloads
+        under the lock as before. `_config_lock` makes a reload and this
+        handler run one after the other, so neither publishes stale labels
+        or pending reloads over the other's.
+        """
+
+        with self._config_lock:
+            self._apply_config_files_changed(paths)
+
+    def _apply_config_files_changed(self, paths: set[Path]) -> None:
+        started = time.perf_counter()
+        for path in paths:
+            CONFIG_STORE.invalidate(path)
+        self._router.reload()
+
+        pending: list[str] = []
+        static_runner = self._static_runner
+        if static_runner is not None:
+            labels, model_path = _load_runtime_static_labels()
+            if model_path == static_runner.get_model_path() and static_runner.set_label_map(labels):
+                if labels != self._labels:
+                    self._labels = labels
+                    self._status_publisher.set_labels(labels.values())
+            else:
+                pending.append("static")
+        dynamic_runner = self._dynamic_runner
+        if dynamic_runner is not None:
+            labels, model_path = _load_runtime_dynamic_labels()
+            if not (model_path == dynamic_runner.get_model_path() and dynamic_runner.set_label_map(labels)):
+                pending.append("dynamic")
+
+        self._config_pending_model_reload = pending
+        self._config_reloads += 1
+        self._config_reload_ms = (time.perf_counter() - started) * 1000.0
+        _LOG.info(
+            "config reloaded files=%s elapsed_ms=%.2f pending_model_reload=%s",
+            sorted(path.name for path in paths),
+            self._config_reload_ms,
+            pending,
+        )
+
     # ---------------------------------------------------------------------
     # IPC and status helpers
     # ---------------------------------------------------------------------
-    def _send(self, payload: Dict[str, Any]) -> None:
-        if self._client is None:
+    def _send(
+        self,
+        payload: Dict[str, Any],
+        *,
+        coalesce_key: str | None = None,
+        accumulate: tuple[str, ...] = (),
+    ) -> None:
+        # Never blocks: the outbound writer thread does the serialization and
+        # the command server handles slow or failed clients per connection.
+        self._outbound_queue.put(payload, coalesce_key=coalesce_key, accumulate=accumulate)
+
+    def _reply(self, payload: Dict[str, Any], client_id: int | None = None) -> None:
+        """
+        Answer a request command (LIST_LABELS, GET_METRICS, TRACE_*, ...).
+
+        The answer goes to the client that sent the command, whatever topics
+        it subscribed to, instead of every subscriber of the payload's topic.
+        `client_id` defaults to the requester of the command being handled;
+        answers sent later from another thread pass the id captured then.
+        """
+
+        requester = self._command_server.requester() if client_id is None else client_id
+        if requester is None:
+            self._send(payload)
+            return
+        payload["_reply_to"] = requester
+        # A full queue must not drop the one message the requester awaits.
+        self._outbound_queue.put(payload, priority=PRIORITY_REPLY)
+
+    def _deliver_event(self, payload: Dict[str, Any]) -> None:
+        """Writer-thread sink: socket clients plus the optional shm ring."""
+
+        reply_to = payload.pop("_reply_to", None)
+        if reply_to is not None:
+            self._command_server.reply(reply_to, payload)
             return
-        message = json.dumps(payload) + "\n"
+        if payload.get("type") == "gesture":
+            self._mark_startup("first_gesture", once=True)
+        trace = payload.pop("_trace", None)
+        if trace is not None:
+            trace["sent"] = time.monotonic()
+            self._latency_tracer.record(trace)
+            if self._latency_tracer.include_in_payload:
+                payload["trace"] = trace
+        with TRACER.span("send", "ipc"):
+            self._command_server.publish(payload)
+            if self._shm_event_publisher is not None:
+                self._shm_event_publisher.publish(payload)
+
+    def _open_shm_event_publisher(self) -> ShmEventPublisher | None:
+        if not SHM_RING_NAME:
+            return None
+        wakeup_fd = None
+        try:
+            if SHM_RING_WAKE_FD:
+                wakeup_fd = int(SHM_RING_WAKE_FD)
+        except ValueError:
+            pass
         try:
-            with self._send_lock:
-                self._client.sendall(message.encode("utf-8"))
-            self._send_fail_count = 0
-        except OSError:
-            self._send_fail_count += 1
-            if self._send_fail_count >= self._send_fail_max:
-                self._running = False
+            ring = ShmRing.attach(SHM_RING_NAME, wakeup_fd=wakeup_fd)
+        except FileNotFoundError:
+            ring = ShmRing.create(SHM_RING_NAME, wakeup_fd=wakeup_fd)
+        except (OSError, ValueError) as exc:
+            trace_startup(f"shared memory ring unavailable: {exc}")
+            return None
+        return ShmEventPublisher(ring)
 
     def _set_status(self, **fields: Any) -> None:
         with self._state_lock:
             self._status.update(fields)
-            payload = dict(self._status)
-        payload["labels"] = self._available_labels()
-        payload["mode"] = self._interaction_mode
-        self._send({"type": "status", **payload})
+            status = dict(self._status)
+        status["mode"] = self._interaction_mode
+        self._status_publisher.publish(status)
 
     def _build_gesture_payload(
         self,
@@ -659,6 +1146,29 @@ class MlService:
             }
         return payload
 
+    @staticmethod
+    def _frame_trace(
+        camera_frame: CameraFrame,
+        kind: str,
+        ingested_at: float | None,
+        inferred_at: float | None,
+    ) -> Dict[str, Any]:
+        """
+        Build the timing record attached to an outbound gesture event.
+
+        All stamps are `time.monotonic()` seconds, the same clock the camera
+        uses for `CameraFrame.timestamp`. For dynamic gestures the capture
+        stamp is the frame that closed the episode, or that committed it early.
+        """
+
+        return {
+            "frame_id": int(camera_frame.frame_id),
+            "kind": kind,
+            "capture": float(camera_frame.timestamp),
+            "ingested": ingested_at,
+            "inferred": inferred_at,
+        }
+
     def _reset_clutch_session(self) -> None:
         """
         Reset all state that belongs to one live clutch episode.
@@ -670,7 +1180,8 @@ class MlService:
 
         self._gesture_stabilizer.reset()
         self._gate_pipeline.reset()
-        self._sequence_buffer.clear()
+        if self._sequence_buffer is not None:
+            self._sequence_buffer.clear()
         self._clutch_active_prev = False
         self._clutch_last_activity_at = 0.0
         self._clutch_session_expires_at = 0.0
@@ -681,6 +1192,7 @@ class MlService:
         self._continuous_prev_index_y = None
         self._dynamic_capture_active = False
         self._dynamic_frames = []
+        self._dynamic_stream = None
         self._dynamic_last_motion_at = 0.0
         self._dynamic_motion_history.clear()
         self._dynamic_prev_wrist = None
@@ -779,6 +1291,9 @@ class MlService:
 
         if not clutch_session_active or not gate1_passed:
             return False
+        if self._sliding_recognizer is not None:
+            # Always-on windows replace episodes.
+            return False
         if normalized_hand is None or is_recording:
             return False
         if motion_score < self._dynamic_motion_threshold:
@@ -835,6 +1350,22 @@ class MlService:
             new_voice_phrase_cooldown_sec = max(0.1, min(5.0, value))
         except (TypeError, ValueError):
             pass
+        try:
+            if "static_batch_max_wait_ms" in payload:
+                value = float(payload.get("static_batch_max_wait_ms", 0.0))
+                self._static_batch_scheduler.set_max_wait_ms(max(0.0, min(10.0, value)))
+        except (TypeError, ValueError):
+            pass
+        if "latency_tracing" in payload:
+            self._latency_tracer.set_include_in_payload(bool(payload.get("latency_tracing")))
+        try:
+            if "status_max_rate_hz" in payload:
+                value = float(payload.get("status_max_rate_hz", 10.0))
+                self._status_publisher.set_max_rate_hz(max(0.5, min(60.0, value)))
+        except (TypeError, ValueError):
+            pass
+        if "log_level" in payload:
+            set_log_level(str(payload.get("log_level", "INFO")))
 
         camera_changed = new_camera_index != self._camera_index
         confidence_changed = (
@@ -848,33 +1379,31 @@ class MlService:
 
         # Only rebuild the piece that actually changed. A sensitivity tweak
         # should not tear down the camera and risk breaking the live preview.
+        # A camera switch keeps the same manager (and its buffer pool); the
+        # probe cache lets it reopen on the backend that worked last time.
         if camera_changed:
-            self._camera_manager.close()
-            self._camera_manager = CameraManager(
-                camera_index=self._camera_index,
-                width=640,
-                height=480,
-            )
-            self._camera_state = "closed"
+            self._camera_manager.set_camera_index(self._camera_index)
+            self._camera_state = "ready" if self._camera_manager.is_running() else "closed"
 
-        if confidence_changed:
-            self._hand_ingestion.close()
-            self._hand_ingestion = HandIngestion(
+        if confidence_changed and self._hand_ingestion is not None:
+            from ml.runtime.hand_ingestion import HandIngestion
+
+            # Warm the replacement before the pipeline sees it.
+            hand_ingestion = HandIngestion(
                 min_detection_confidence=self._hand_min_detection_confidence
             )
+            self._warm_up_stats["hand_tracking"] = hand_ingestion.warm_up()
+            previous, self._hand_ingestion = self._hand_ingestion, hand_ingestion
+            previous.close()
 
         if camera_changed or confidence_changed:
             self._reset_clutch_session()
 
-        self._send(
-            {
-                "type": "status",
-                "state": self._status.get("state", "ready"),
-                "message": "settings_applied",
-                "mode": self._interaction_mode,
-                "camera_index": self._camera_index,
-                "voice_input_index": self._voice_input_index,
-            }
+        self._set_status(
+            state=self._status.get("state", "ready"),
+            message="settings_applied",
+            camera_index=self._camera_index,
+            voice_input_index=self._voice_input_index,
         )
 
     # ---------------------------------------------------------------------
@@ -917,10 +1446,27 @@ class MlService:
         self._mic_state = "closed"
         self._set_status(state=self._status.get("state", "ready"), message="mic_closed")
 
+    def _record_flight_decision(self, flight: Any, decision: str, action: str | None = None) -> None:
+        """Close a flight recorder row with the frame's outcome."""
+
+        flight["decision"] = self._flight_recorder.intern(decision)
+        flight["action"] = self._flight_recorder.intern(action)
+        flight["decided_ts"] = time.monotonic()
+
+    def _release_held_camera_frame(self) -> None:
+        held = self._held_camera_frame
+        self._held_camera_frame = None
+        if held is not None:
+            owner, frame = held
+            owner.release_frame(frame)
+
     def _encode_preview_frame(self, frame: Any | None) -> None:
         if frame is None or cv2 is None:
             return
+        with TRACER.span("preview_encode", "preview"):
+            self._encode_preview_frame_jpeg(frame)
 
+    def _encode_preview_frame_jpeg(self, frame: Any) -> None:
         preview_width = 960
         h, w = frame.shape[:2]
         if w > preview_width:
@@ -1001,11 +1547,12 @@ class MlService:
         last_emit = time.time()
 
         while self._running:
-            with self._latest_frame_lock:
-                frame = self._latest_frame_jpeg
+            with TRACER.span("preview_frame", "preview"):
+                with self._latest_frame_lock:
+                    frame = self._latest_frame_jpeg
 
-            if frame is None:
-                frame = placeholder_frame()
+                if frame is None:
+                    frame = placeholder_frame()
 
             if frame is None:
                 time.sleep(0.1)
@@ -1022,7 +1569,9 @@ class MlService:
             last_emit = time.time()
 
     def _start_http_preview(self) -> None:
-        if Flask is None:
+        try:
+            from flask import Flask, Response
+        except ImportError:  # pragma: no cover - depends on local runtime
             trace_startup("preview disabled: flask unavailable")
             return
 
@@ -1067,10 +1616,10 @@ class MlService:
         if not self._recording_buffer:
             return 0
 
+        from ml.training.dynamic_sequences import append_sequences, chunk_lengths, split_sequences
+
         rows = [row[:126] for row in self._recording_buffer]
         self._recording_buffer.clear()
-        usable_count = (len(rows) // 30) * 30
-        rows = rows[:usable_count]
         if not rows:
             return 0
 
@@ -1078,12 +1627,10 @@ class MlService:
             ch if ch.isalnum() or ch in {"_", "-"} else "_"
             for ch in self._recording_label_name.strip()
         ) or "CustomDynamic"
-        CUSTOM_DYNAMIC_DATA_DIR.mkdir(parents=True, exist_ok=True)
         csv_path = CUSTOM_DYNAMIC_DATA_DIR / f"{safe_name}.csv"
-        mode = "a" if csv_path.exists() else "w"
-        with csv_path.open(mode, newline="", encoding="utf-8") as handle:
-            csv.writer(handle).writerows(rows)
-        return len(rows)
+        # 30-frame sequences plus a shorter final one; its length goes in the
+        # sidecar instead of the rows being dropped.
+        return append_sequences(csv_path, split_sequences(rows, chunk_lengths(len(rows))))
 
     def _stop_recording(self, reason: str = "recording_stopped") -> None:
         was_recording = self._recording_label_idx is not None
@@ -1262,6 +1809,9 @@ class MlService:
         """
 
         while self._running:
+            # Hand the previous iteration's frame back to the capture pool.
+            # Doing it here covers every `continue` path in the loop body.
+            self._release_held_camera_frame()
             now = time.monotonic()
             is_recording = self._recording_label_idx is not None
 
@@ -1275,9 +1825,11 @@ class MlService:
                 continue
 
             # --- PIPELINE STAGE 1: CAMERA ---
-            camera_frame = self._camera_manager.get_latest_frame()
-            if camera_frame is None:
-                camera_frame = self._camera_manager.read_frame()
+            camera_manager = self._camera_manager
+            with TRACER.span("acquire_frame"):
+                camera_frame = camera_manager.acquire_frame()
+            if camera_frame is not None:
+                self._held_camera_frame = (camera_manager, camera_frame)
             if camera_frame is None:
                 self._camera_read_fail_count += 1
                 self._tracking_fail_count += 1
@@ -1293,18 +1845,26 @@ class MlService:
                 time.sleep(0.02)
                 continue
             self._camera_read_fail_count = 0
+            self._mark_startup("first_frame", once=True)
+            flight = self._flight_recorder.begin(camera_frame.frame_id, camera_frame.timestamp)
 
             # --- PIPELINE STAGE 2: INGESTION ---
-            detection = self._hand_ingestion.process_frame(camera_frame)
+            stage_started = time.perf_counter()
+            with TRACER.span("process_frame"):
+                detection = self._hand_ingestion.process_frame(camera_frame)
             hand_count = self._hand_ingestion.get_last_hand_count()
             if hand_count > 0:
-                print(f"DEBUG: Found {hand_count} hands", flush=True)
+                _PIPELINE_LOG.debug("hands_detected count=%d", hand_count)
             else:
-                now = time.monotonic()
-                if now - self._last_no_hand_debug_print >= 2.0:
-                    self._last_no_hand_debug_print = now
-                    print("DEBUG: No hands detected", flush=True)
-            normalized_hand = self._hand_ingestion.normalize_hand(detection)
+                _PIPELINE_LOG.debug("no_hands_detected")
+            with TRACER.span("normalize_hand"):
+                normalized_hand = self._hand_ingestion.normalize_hand(detection)
+            ingested_at = time.monotonic()
+            flight["ingest_ms"] = (time.perf_counter() - stage_started) * 1000.0
+            flight["ingested_ts"] = ingested_at
+            flight["hand_count"] = min(255, int(detection.hand_count))
+            flight["tracking_confidence"] = float(detection.tracking_confidence)
+            flight["raw_hint"] = self._flight_recorder.intern(detection.raw_gesture_hint)
 
             if not detection.hand_present:
                 self._tracking_fail_count += 1
@@ -1339,7 +1899,12 @@ class MlService:
                 self._record_sample_if_due(normalized_hand.normalized_features)
 
             # --- PIPELINE STAGE 4: GATES ---
-            gate_decision = self._gate_pipeline.evaluate(normalized_hand)
+            stage_started = time.perf_counter()
+            with TRACER.span("gates"):
+                gate_decision = self._gate_pipeline.evaluate(normalized_hand)
+            flight["gates_ms"] = (time.perf_counter() - stage_started) * 1000.0
+            flight["gate1_passed"] = gate_decision.gate1_passed
+            flight["gate_reason"] = self._flight_recorder.intern(gate_decision.reason)
             if gate_decision.clutch_active and not self._is_clutch_session_active(now):
                 self._clutch_session_armed = True
                 self._clutch_session_expires_at = now + self._clutch_session_duration_sec
@@ -1355,9 +1920,12 @@ class MlService:
             preview_state.required_clutch_frames = gate_decision.required_clutch_frames
             self._clutch_active_prev = clutch_session_active
             motion_score = self._measure_motion(normalized_hand)
+            flight["clutch_active"] = clutch_session_active
+            flight["motion_score"] = motion_score
 
             # --- PIPELINE STAGE 5: STATIC INFERENCE ---
             inference_result: StaticInferenceResult | None = None
+            inferred_at: float | None = None
             if (
                 clutch_session_active
                 and gate_decision.gate1_passed
@@ -1365,8 +1933,13 @@ class MlService:
                 and not is_recording
                 and self._static_runner is not None
             ):
-                with self._model_lock:
-                    inference_result = self._static_runner.infer(normalized_hand)
+                stage_started = time.perf_counter()
+                with TRACER.span("static_inference"):
+                    inference_result = self._infer_static_shared([normalized_hand])[0]
+                inferred_at = time.monotonic()
+                flight["static_ms"] = (time.perf_counter() - stage_started) * 1000.0
+                flight["static_label"] = self._flight_recorder.intern(inference_result.label_name)
+                flight["static_confidence"] = inference_result.confidence
 
             preview_state = self._build_preview_state(
                 camera_ready=self._camera_manager.is_open(),
@@ -1384,12 +1957,15 @@ class MlService:
             )
 
             # --- PIPELINE STAGE 6: OVERLAY RENDERING ---
-            overlay_frame = self._preview_renderer.render(
-                camera_frame.frame_bgr,
-                preview_state,
-                hand_frame=normalized_hand,
-            )
+            stage_started = time.perf_counter()
+            with TRACER.span("overlay"):
+                overlay_frame = self._preview_renderer.render(
+                    camera_frame.frame_bgr,
+                    preview_state,
+                    hand_frame=normalized_hand,
+                )
             self._encode_preview_frame(overlay_frame)
+            flight["overlay_ms"] = (time.perf_counter() - stage_started) * 1000.0
 
             # --- PIPELINE STAGE 7: STABILIZER + COOLDOWN + IPC ---
             if not detection.hand_present:
@@ -1400,44 +1976,51 @@ class MlService:
                 elif not clutch_session_active and self._hand_present_prev:
                     self._reset_clutch_session()
                 self._hand_present_prev = False
+                if not self._end_sliding_windows(
+                    flight, overlay_frame, None, camera_frame, ingested_at, now
+                ):
+                    self._record_flight_decision(flight, "no_hand")
                 time.sleep(0.02)
                 continue
 
             self._hand_present_prev = True
 
             if is_recording:
+                if not self._end_sliding_windows(
+                    flight, overlay_frame, normalized_hand, camera_frame, ingested_at, now
+                ):
+                    self._record_flight_decision(flight, "recording")
                 time.sleep(0.01)
                 continue
 
             # --- Dual-Brain collision resolution ---
             # The default model always runs.  If a custom model is loaded and
             # produced a result, the PriorityRouter decides which one wins.
-            default_label = "UNKNOWN"
+            # Routed on integer label ids (the runners' class indices)
+            # against the router's precompiled tables.
+            default_id = UNKNOWN_LABEL_ID
             default_conf = 0.0
-            custom_label = None
+            custom_id = None
             custom_conf = None
 
             if inference_result is not None and not inference_result.is_unknown:
                 if inference_result.label_name == "OK_Sign" and inference_result.confidence < 0.92:
-                    default_label = "UNKNOWN"
+                    default_id = UNKNOWN_LABEL_ID
                     default_conf = 0.0
                 else:
-                    default_label = inference_result.label_name
+                    default_id = inference_result.label_idx
                     default_conf = inference_result.confidence
 
-            # TODO: when custom_static_runner is wired, populate custom_label
+            # TODO: when custom_static_runner is wired, populate custom_id
             # and custom_conf from its result here.
 
-            resolved_label, resolved_conf = self._router.resolve(
-                default_label, default_conf,
-                custom_label, custom_conf,
+            resolved_label, resolved_conf, resolved_action = self._router.route_id(
+                default_id, default_conf,
+                custom_id, custom_conf,
                 gesture_type="static",
             )
-            resolved_action = (
-                self._router.get_action(resolved_label, "static")
-                if resolved_label != "UNKNOWN"
-                else "Unknown"
-            )
+            flight["router_label"] = self._flight_recorder.intern(resolved_label)
+            flight["router_confidence"] = resolved_conf
 
             if resolved_label == "UNKNOWN":
                 stable_result = self._gesture_stabilizer(
@@ -1453,6 +2036,26 @@ class MlService:
 
             now = time.monotonic()
 
+            # Always-on mode: every tracked frame feeds the sliding windows,
+            # clutch or not. A frame runs at most one batched model call.
+            if self._sliding_recognizer is not None:
+                if gate_decision.gate1_passed and normalized_hand is not None:
+                    stage_started = time.perf_counter()
+                    with TRACER.span("dynamic_windows"):
+                        detections = self._sliding_recognizer.push(list(normalized_hand.normalized_features))
+                    if detections:
+                        flight["dynamic_ms"] = (time.perf_counter() - stage_started) * 1000.0
+                        self._emit_window_detections(
+                            detections, flight, overlay_frame, normalized_hand, camera_frame, ingested_at, now
+                        )
+                        time.sleep(0.02)
+                        continue
+                elif self._end_sliding_windows(
+                    flight, overlay_frame, normalized_hand, camera_frame, ingested_at, now
+                ):
+                    time.sleep(0.02)
+                    continue
+
             # Dynamic gestures are treated as bounded episodes: once the clutch
             # is open and motion clearly starts, the dynamic pipeline claims the
             # interaction immediately and static actions are suppressed until
@@ -1468,6 +2071,7 @@ class MlService:
                 if not self._dynamic_capture_active:
                     self._dynamic_capture_active = True
                     self._dynamic_frames = []
+                    self._dynamic_stream = self._open_dynamic_stream()
                 self._dynamic_last_motion_at = now
 
             if self._dynamic_capture_active and normalized_hand is not None:
@@ -1475,6 +2079,28 @@ class MlService:
                 if motion_score >= self._dynamic_motion_threshold:
                     self._dynamic_last_motion_at = now
 
+                # Early commit: emit as soon as the prefix is convincing. The
+                # episode keeps capturing (static stays suppressed) until it
+                # ends, but the stream commits at most once.
+                if self._dynamic_stream is not None:
+                    stage_started = time.perf_counter()
+                    early_result = self._push_dynamic_stream(self._dynamic_frames[-1])
+                    if early_result is not None:
+                        flight["dynamic_ms"] = (time.perf_counter() - stage_started) * 1000.0
+                        self._emit_dynamic_result(
+                            early_result,
+                            flight,
+                            overlay_frame,
+                            normalized_hand,
+                            camera_frame,
+                            ingested_at,
+                            now,
+                            "dynamic_early_emit",
+                        )
+                        self._dynamic_early_emits += 1
+                        time.sleep(0.02)
+                        continue
+
                 capture_complete = (
                     len(self._dynamic_frames) >= 30 or
                     (
@@ -1483,26 +2109,43 @@ class MlService:
                     )
                 )
                 if capture_complete:
-                    with self._model_lock:
-                        dynamic_result = self._dynamic_runner.infer_sequence(self._dynamic_frames)
-                    if not dynamic_result.is_unknown:
-                        overlay_frame = self._preview_renderer.render_dynamic(overlay_frame, dynamic_result)
-                        self._encode_preview_frame(overlay_frame)
-                        self._last_action_time = now
-                        predicted_label = dynamic_result.label_name
-                        print(f"DEBUG: predicted_label={predicted_label}", flush=True)
-                        payload = self._build_gesture_payload(
-                            predicted_label,
-                            dynamic_result.confidence,
-                            normalized_hand,
-                        )
-                        payload["action"] = self._router.get_action(predicted_label, "dynamic")
-                        payload["value"] = 0.0
-                        self._send(payload)
-                        self._last_action_label = predicted_label
+                    stream = self._dynamic_stream
+                    if stream is not None and stream.committed:
+                        # Already emitted early; this episode must not emit again.
+                        # The stream stopped at the commit, so the frames since
+                        # then are what waiting for this end would have cost.
+                        self._dynamic_early_saved_frames += max(0, len(self._dynamic_frames) - stream.frames)
+                        flight["dynamic_frames"] = min(0xFFFF, len(self._dynamic_frames))
+                        self._record_flight_decision(flight, "dynamic_episode_end")
+                    else:
+                        stage_started = time.perf_counter()
+                        if stream is not None and stream.frames == len(self._dynamic_frames) and stream.last_result:
+                            # The stream already classified exactly this sequence.
+                            dynamic_result = stream.last_result
+                        else:
+                            with TRACER.span("dynamic_inference", args={"frames": len(self._dynamic_frames)}):
+                                dynamic_result = self._infer_dynamic_shared(self._dynamic_frames)
+                        flight["dynamic_ms"] = (time.perf_counter() - stage_started) * 1000.0
+                        if not dynamic_result.is_unknown:
+                            self._emit_dynamic_result(
+                                dynamic_result,
+                                flight,
+                                overlay_frame,
+                                normalized_hand,
+                                camera_frame,
+                                ingested_at,
+                                now,
+                                "dynamic_emit",
+                            )
+                        else:
+                            flight["dynamic_label"] = self._flight_recorder.intern(dynamic_result.label_name)
+                            flight["dynamic_confidence"] = dynamic_result.confidence
+                            flight["dynamic_frames"] = min(0xFFFF, len(self._dynamic_frames))
+                            self._record_flight_decision(flight, "dynamic_unknown")
                     self._gesture_stabilizer.reset()
                     self._dynamic_capture_active = False
                     self._dynamic_frames = []
+                    self._dynamic_stream = None
                     time.sleep(0.02)
                     continue
 
@@ -1514,12 +2157,24 @@ class MlService:
                         normalized_hand,
                     )
                     if continuous_payload is not None:
-                        print(f"DEBUG: predicted_label={resolved_label}", flush=True)
-                        self._send(continuous_payload)
+                        _PIPELINE_LOG.debug("predicted kind=continuous label=%s", resolved_label)
+                        continuous_payload["_trace"] = self._frame_trace(
+                            camera_frame, "continuous", ingested_at, inferred_at
+                        )
+                        # One pending update per action; per-frame deltas
+                        # are summed if the writer falls behind.
+                        self._send(
+                            continuous_payload,
+                            coalesce_key=f"continuous:{resolved_action}",
+                            accumulate=("value",),
+                        )
                         self._last_action_label = resolved_label
                         self._active_continuous_label = resolved_label
                         self._continuous_seen_at = now
                         self._clutch_last_activity_at = now
+                        self._record_flight_decision(flight, "continuous_emit", resolved_action)
+                    else:
+                        self._record_flight_decision(flight, "continuous_hold", resolved_action)
                     time.sleep(0.02)
                     continue
 
@@ -1530,6 +2185,7 @@ class MlService:
                 self._active_continuous_label = None
                 self._continuous_smoothed_value = 0.0
                 self._continuous_prev_index_y = None
+                self._record_flight_decision(flight, "continuous_release")
                 time.sleep(0.02)
                 continue
 
@@ -1537,7 +2193,7 @@ class MlService:
                 if now - self._last_action_time >= self._action_cooldown_sec:
                     self._last_action_time = now
                     predicted_label = stable_result.label
-                    print(f"DEBUG: predicted_label={predicted_label}", flush=True)
+                    _PIPELINE_LOG.debug("predicted kind=static label=%s", predicted_label)
                     payload = {
                         "type": "gesture",
                         "label": predicted_label,
@@ -1556,12 +2212,24 @@ class MlService:
                             "x": float(normalized_hand.landmarks_xyz[4][0]),
                             "y": float(normalized_hand.landmarks_xyz[4][1]),
                         }
+                    payload["_trace"] = self._frame_trace(
+                        camera_frame, "static", ingested_at, inferred_at
+                    )
                     self._send(payload)
                     self._last_action_label = predicted_label
                     self._gesture_stabilizer.reset()
+                    self._record_flight_decision(flight, "static_emit", payload["action"])
+                else:
+                    self._record_flight_decision(flight, "cooldown", resolved_action)
+            elif self._dynamic_capture_active:
+                self._record_flight_decision(flight, "dynamic_capture")
+            else:
+                self._record_flight_decision(flight, "stabilizing" if resolved_label != "UNKNOWN" else "idle")
 
             time.sleep(0.02)
 
+        self._release_held_camera_frame()
+
     def _play_clutch_activation_sound(self) -> None:
         """
         Play a slightly louder two-note UX "twink" when the clutch activates.
@@ -1605,6 +2273,8 @@ class MlService:
         # Best-effort camera boot. If the camera is unavailable at startup, the
         # pipeline will continue retrying via `_ensure_camera_ready()`.
         self._camera_manager.start()
+        self._start_camera_enumeration()
+        self._config_watcher.start()
 
         self._pipeline_thread = threading.Thread(
             target=self.run_pipeline,
@@ -1614,10 +2284,174 @@ class MlService:
         self._pipeline_thread.start()
         trace_startup("pipeline thread started")
 
+    def _start_camera_enumeration(self) -> None:
+        """
+        Probe the other camera indices once, in the background.
+
+        The results land in the probe cache, so a later camera switch from the
+        dashboard opens on a known-good backend instead of walking the whole
+        backend list while the user waits.
+
+        Indices are claimed one at a time under the session lock, and any
+        index the primary camera, a running session or a parked START_SESSION
+        owns is skipped, so the probe never competes with them for a device.
+        """
+
+        if self._camera_enumeration_thread is not None:
+            return
+
+        def _enumerate() -> None:
+            results: dict[int, bool] = {}
+            try:
+                for camera_index in range(4):
+                    owned = self._parked_session_camera_indices()
+                    with self._camera_sessions_lock:
+                        owned.add(self._camera_manager.get_camera_index())
+                        owned.update(
+                            session.camera_index for session in self._camera_sessions.values()
+                        )
+                        if camera_index in owned:
+                            continue
+                        self._enumerating_camera_index = camera_index
+                    try:
+                        results.update(enumerate_cameras(self._camera_probe_cache, [camera_index]))
+                    finally:
+                        with self._camera_sessions_lock:
+                            self._enumerating_camera_index = None
+                            self._camera_enumeration_done.notify_all()
+                trace_startup(f"camera enumeration complete results={results}")
+            except Exception as exc:  # pragma: no cover - device/runtime path
+                trace_startup(f"camera enumeration failed error={exc}")
+
+        self._camera_enumeration_thread = threading.Thread(
+            target=_enumerate,
+            name="MlServiceCameraEnumeration",
+            daemon=True,
+        )
+        self._camera_enumeration_thread.start()
+
+    def _parked_session_camera_indices(self) -> set[int]:
+        """Camera indices of START_SESSION commands still waiting for the warm start."""
+
+        indices: set[int] = set()
+        with self._parked_lock:
+            payloads = [payload for _client_id, payload in self._parked_commands]
+        for payload in payloads:
+            if str(payload.get("command", "")).strip().upper() != "START_SESSION":
+                continue
+            try:
+                indices.add(int(payload.get("camera_index")))
+            except (TypeError, ValueError):
+                pass
+        return indices
+
+    # ---------------------------------------------------------------------
+    # Additional camera sessions
+    # ---------------------------------------------------------------------
+    def _start_camera_session(self, payload: Dict[str, Any]) -> None:
+        from ml.runtime.camera_session import CameraSession, SessionLimits
+
+        try:
+            camera_index = int(payload.get("camera_index"))
+        except (TypeError, ValueError):
+            self._reply({"type": "session", "status": "failed", "error": "camera_index required"})
+            return
+        session_id = str(payload.get("session_id", "")).strip() or f"camera{camera_index}"
+        limits = SessionLimits()
+        try:
+            limits.max_fps = max(1.0, min(60.0, float(payload.get("max_fps", limits.max_fps))))
+        except (TypeError, ValueError):
+            pass
+
+        with self._camera_sessions_lock:
+            # Enumeration opens and closes one device at a time; wait for it
+            # to let go of this one instead of racing it for the handle.
+            released = self._camera_enumeration_done.wait_for(
+                lambda: self._enumerating_camera_index != camera_index,
+                timeout=10.0,
+            )
+            error = ""
+            if not released:
+                error = "camera_index is still being probed"
+            elif camera_index == self._camera_index:
+                error = "camera_index is the primary camera"
+            elif session_id in self._camera_sessions:
+                error = "session_id already running"
+            elif any(
+                session.camera_index == camera_index
+                for session in self._camera_sessions.values()
+            ):
+                error = "camera_index already has a session"
+            elif len(self._camera_sessions) >= self._max_camera_sessions:
+                error = f"session limit reached ({self._max_camera_sessions})"
+            if error:
+                self._reply(
+                    {"type": "session", "status": "failed", "session_id": session_id, "error": error}
+                )
+                return
+
+            session = CameraSession(
+                session_id,
+                camera_index,
+                infer_static=self._infer_static_shared,
+                infer_dynamic=self._infer_dynamic_shared,
+                router=self._router,
+                emit=self._send,
+                mode_provider=lambda: self._interaction_mode,
+                limits=limits,
+                probe_cache=self._camera_probe_cache,
+                min_detection_confidence=self._hand_min_detection_confidence,
+                clutch_session_duration_sec=self._clutch_session_duration_sec,
+                action_cooldown_sec=self._action_cooldown_sec,
+                stabilizer_immediate_confidence=STABILIZER_IMMEDIATE_CONFIDENCE,
+            )
+            self._camera_sessions[session_id] = session
+            session.start()
+
+        self._send(
+            {
+                "type": "session",
+                "status": "started",
+                "session_id": session_id,
+                "camera_index": camera_index,
+            }
+        )
+
+    def _stop_camera_session(self, session_id: str) -> None:
+        with self._camera_sessions_lock:
+            session = self._camera_sessions.pop(session_id, None)
+        if session is None:
+            self._reply(
+                {"type": "session", "status": "failed", "session_id": session_id, "error": "unknown session"}
+            )
+            return
+        session.stop()
+        self._send({"type": "session", "status": "stopped", "session_id": session_id})
+
+    def _stop_all_camera_sessions(self) -> None:
+        with self._camera_sessions_lock:
+            sessions = list(self._camera_sessions.values())
+            self._camera_sessions.clear()
+        for session in sessions:
+            session.stop()
+
+    def _camera_session_metrics(self) -> list[Dict[str, Any]]:
+        with self._camera_sessions_lock:
+            sessions = list(self._camera_sessions.values())
+        primary = {
+            "session_id": "primary",
+            "camera_index": self._camera_index,
+            "running": self._camera_manager.is_running(),
+            "camera_open": self._camera_manager.is_open(),
+            "clutch_active": self._is_clutch_session_active(),
+        }
+        return [primary] + [session.metrics() for session in sessions]
+
     # ---------------------------------------------------------------------
     # Voice pipeline
     # ---------------------------------------------------------------------
     def _voice_loop(self) -> None:
+        KaldiRecognizer, VoskModel, sd, _ = _voice_backend()
         if not (KaldiRecognizer and VoskModel and sd):
             return
 
@@ -1686,23 +2520,24 @@ class MlService:
     # ---------------------------------------------------------------------
     def _train_async(self) -> None:
         self._set_status(state="training", message="training_started")
-        trace_startup("training stage=start")
+        _LOG.info("training stage=start type=%s", self._pending_train_type)
         try:
             def cb(progress: float) -> None:
-                trace_startup(f"training stage=progress progress={progress}")
+                _LOG.debug("training stage=progress progress=%s", progress)
                 self._send({"type": "training_progress", "progress": progress})
 
-            trace_startup("training stage=retrain_static_model")
-            if self._pending_train_type == "dynamic":
-                result = _retrain_custom_dynamic_model()
-            else:
-                result = _retrain_custom_static_model(progress_cb=cb)
-            trace_startup(f"training stage=retrain_complete result={result}")
-            with self._model_lock:
-                trace_startup("training stage=reload_runtime_model")
+            _LOG.info("training stage=retrain_model")
+            with TRACER.span(f"train_{self._pending_train_type}", "training"):
+                if self._pending_train_type == "dynamic":
+                    result = _retrain_custom_dynamic_model()
+                else:
+                    result = _retrain_custom_static_model(progress_cb=cb)
+            _LOG.info("training stage=retrain_complete result=%s", result)
+            with self._model_lock, TRACER.span("reload_runtime_model", "training"):
+                _LOG.info("training stage=reload_runtime_model")
                 self._load_runtime_model()
                 self._router.reload()
-            trace_startup("training stage=send_trained")
+            _LOG.info("training stage=send_trained")
             self._send(
                 {
                     "type": "training",
@@ -1715,7 +2550,7 @@ class MlService:
             self._set_status(state="ready", message="training_finished")
         except Exception as exc:  # pragma: no cover - defensive path
             tb = traceback.format_exc()
-            trace_startup(f"training stage=failed error={exc}\n{tb}")
+            _LOG.error("training stage=failed error=%s\n%s", exc, tb)
             self._send(
                 {
                     "type": "training",
@@ -1731,12 +2566,151 @@ class MlService:
                 traceback=tb,
             )
 
+    # ---------------------------------------------------------------------
+    # Profiling
+    # ---------------------------------------------------------------------
+    def _start_profile(self, payload: Dict[str, Any]) -> None:
+        """
+        Sample every thread's stack for `seconds` and reply when the file exists.
+
+        The command returns right away with `status: started`; the sampler
+        thread sends `status: done` with the output path afterwards, so the
+        command worker is never blocked for the profiling window.
+        `{"command": "PROFILE", "stop": true}` ends a running profile early.
+        """
+
+        profiler = self._profiler
+        if payload.get("stop"):
+            if profiler is not None and profiler.running:
+                profiler.stop()
+            else:
+                self._reply({"type": "profile", "status": "idle"})
+            return
+        if profiler is not None and profiler.running:
+            self._reply({"type": "profile", "status": "busy"})
+            return
+
+        output_format = str(payload.get("format", "speedscope")).strip().lower()
+        requester = self._command_server.requester()
+        try:
+            seconds = float(payload.get("seconds", 10.0))
+            interval_ms = float(payload.get("interval_ms", 5.0))
+            profiler = SamplingProfiler(
+                seconds,
+                interval_ms=interval_ms,
+                output_format=output_format,
+                path=_client_output_path(PROFILE_DIR, payload.get("path")),
+                on_done=lambda result: self._reply({"type": "profile", **result}, requester),
+            )
+        except (TypeError, ValueError) as exc:
+            self._reply(
+                {
+                    "type": "profile",
+                    "status": "failed",
+                    "error": str(exc),
+                    "formats": list(PROFILE_FORMATS),
+                }
+            )
+            return
+
+        self._profiler = profiler
+        self._reply(
+            {
+                "type": "profile",
+                "status": "started",
+                "seconds": seconds,
+                "interval_ms": interval_ms,
+                "format": output_format,
+            }
+        )
+        profiler.start()
+
+    # ---------------------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------------------
+    def _collect_metrics(self) -> Dict[str, Any]:
+        """Gather runtime counters from the components that expose them."""
+
+        return {
+            "sessions": self._camera_session_metrics(),
+            "camera": self._camera_manager.get_open_stats(),
+            "camera_probe_cache": self._camera_probe_cache.entries(),
+            "frame_pools": {
+                "camera": self._camera_manager.get_frame_pool_stats(),
+                "overlay": self._preview_renderer.get_frame_pool_stats(),
+            },
+            "static_batching": self._static_batch_scheduler.stats(),
+            "command_server": self._command_server.stats(),
+            "outbound_queue": self._outbound_queue.stats(),
+            "status_publisher": self._status_publisher.stats(),
+            "latency": self._latency_tracer.stats(),
+            "span_tracer": TRACER.stats(),
+            "flight_recorder": self._flight_recorder.stats(),
+            "logging": logging_stats(),
+            "config_store": CONFIG_STORE.stats(),
+            "config_watcher": {
+                **self._config_watcher.stats(),
+                "reloads": self._config_reloads,
+                "last_reload_ms": round(self._config_reload_ms, 3),
+                "pending_model_reload": list(self._config_pending_model_reload),
+            },
+            "warm_up": dict(self._warm_up_stats),
+            "dynamic_early_commit": {
+                "confidence": DYNAMIC_EARLY_CONFIDENCE,
+                "min_frames": DYNAMIC_EARLY_MIN_FRAMES,
+                "emits": self._dynamic_early_emits,
+                "saved_frames": self._dynamic_early_saved_frames,
+            },
+            "sliding_window": (
+                self._sliding_recognizer.stats() if self._sliding_recognizer is not None else None
+            ),
+            "startup": {
+                "components": dict(self._startup_components),
+                "timeline_ms": {
+                    name: round(seconds * 1000.0, 1)
+                    for name, seconds in self._startup_timeline.items()
+                },
+            },
+            "shm_ring": (
+                self._shm_event_publisher.ring.stats()
+                if self._shm_event_publisher is not None
+                else None
+            ),
+        }
+
     # ---------------------------------------------------------------------
     # Command handling
     # ---------------------------------------------------------------------
     def handle_command(self, payload: Dict[str, Any]) -> None:
         command = str(payload.get("command", "")).strip().upper()
+        if command not in _COMMANDS_BEFORE_WARM_START:
+            with self._parked_lock:
+                # Until the replay has run, later commands queue behind the
+                # parked ones so the order clients sent them in is kept.
+                if not self._warm_started.is_set() or self._parked_commands:
+                    self._parked_commands.append((self._command_server.requester(), payload))
+                    return
+        self._run_command(command, payload)
+
+    def _replay_parked_commands(self) -> None:
+        """Command worker: run the commands parked during the warm start."""
+
+        while True:
+            with self._parked_lock:
+                if not self._parked_commands:
+                    return
+                client_id, payload = self._parked_commands[0]
+            command = str(payload.get("command", "")).strip().upper()
+            try:
+                with self._command_server.acting_for(client_id):
+                    self._run_command(command, payload)
+            except Exception as exc:  # pragma: no cover - handler bug
+                _LOG.error("parked command=%s failed error=%s", command, exc)
+            finally:
+                with self._parked_lock:
+                    self._parked_commands.popleft()
 
+    def _run_command(self, command: str, payload: Dict[str, Any]) -> None:
         if command == "START_RECORDING":
             label_name = str(payload.get("label", "UNNAMED"))
             action_name = str(payload.get("action", "Click"))
@@ -1774,7 +2748,11 @@ class MlService:
             if self._training_thread and self._training_thread.is_alive():
                 self._send({"type": "training", "status": "busy"})
                 return
-            self._training_thread = threading.Thread(target=self._train_async, daemon=True)
+            self._training_thread = threading.Thread(
+                target=self._train_async,
+                name="MlServiceTraining",
+                daemon=True,
+            )
             self._training_thread.start()
             return
 
@@ -1815,103 +2793,281 @@ class MlService:
             return
 
         if command == "LIST_LABELS":
-            self._send({"type": "labels", "labels": self._available_labels()})
+            self._reply({"type": "labels", "labels": self._available_labels()})
+            return
+
+        if command == "TRACE_START":
+            capacity = payload.get("capacity")
+            try:
+                TRACER.start(capacity=int(capacity) if capacity else None)
+            except (TypeError, ValueError):
+                TRACER.start()
+            self._reply({"type": "trace", "status": "started", **TRACER.stats()})
+            return
+
+        if command == "TRACE_STOP":
+            TRACER.stop()
+            self._reply({"type": "trace", "status": "stopped", **TRACER.stats()})
+            return
+
+        if command == "TRACE_DUMP":
+            try:
+                path = TRACER.dump(_client_output_path(TRACE_DIR, payload.get("path")))
+                self._reply({"type": "trace", "status": "dumped", "path": str(path), **TRACER.stats()})
+            except (OSError, ValueError) as exc:
+                self._reply({"type": "trace", "status": "failed", "error": str(exc)})
+            return
+
+        if command == "PROFILE":
+            self._start_profile(payload)
+            return
+
+        if command == "DUMP_FLIGHT_RECORDER":
+            try:
+                path = self._flight_recorder.dump(_client_output_path(RECORDING_DIR, payload.get("path")))
+                self._reply(
+                    {
+                        "type": "flight_recorder",
+                        "status": "dumped",
+                        "path": str(path),
+                        **self._flight_recorder.stats(),
+                    }
+                )
+            except (OSError, ValueError) as exc:
+                self._reply({"type": "flight_recorder", "status": "failed", "error": str(exc)})
+            return
+
+        if command == "GET_STATUS":
+            self._reply(dict(self._status_publisher.snapshot()))
+            return
+
+        if command == "GET_METRICS":
+            self._reply({"type": "metrics", **self._collect_metrics()})
+            return
+
+        if command == "START_SESSION":
+            self._start_camera_session(payload)
+            return
+
+        if command == "STOP_SESSION":
+            self._stop_camera_session(str(payload.get("session_id", "")).strip())
+            return
+
+        if command == "LIST_SESSIONS":
+            self._reply({"type": "sessions", "sessions": self._camera_session_metrics()})
             return
 
         if command == "SHUTDOWN":
+            self._stop_all_camera_sessions()
+            self._static_batch_scheduler.stop()
+            self._config_watcher.stop()
             self._close_camera()
             self._close_voice_stream()
-            self._hand_ingestion.close()
+            if self._hand_ingestion is not None:
+                self._hand_ingestion.close()
             self._running = False
+            self._command_server.stop()
             return
 
     # ---------------------------------------------------------------------
     # Main server lifecycle
     # ---------------------------------------------------------------------
-    def serve(self) -> None:
-        trace_startup("serve start")
+    def _on_client_connected(self) -> list[Dict[str, Any]]:
+        """
+        Return the snapshot a newly connected client receives first.
 
-        # Start the background camera/inference runtime before the preview app
-        # begins serving requests. This ensures `/video_feed` can produce frames
-        # immediately after Flask boots instead of waiting for a TCP client
-        # connection to trigger the ML loop.
-        self._start_background_runtime()
+        Only the new client gets it; clients that were already connected have
+        seen every status change as it happened. During the warm start that
+        snapshot is the `starting` status with per-component progress; the
+        switch to `ready` reaches every client when the warm start finishes.
+        """
 
-        if Flask is not None:
-            self._preview_thread = threading.Thread(
-                target=self._start_http_preview,
+        trace_startup("client accepted")
+        self._mark_startup("first_client", once=True)
+        if self._voice_thread is None or not self._voice_thread.is_alive():
+            self._voice_thread = threading.Thread(
+                target=self._voice_loop,
+                name="MlServiceVoice",
                 daemon=True,
             )
-            self._preview_thread.start()
-            trace_startup("preview thread started")
-
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
-            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            trace_startup("binding command socket")
-            server.bind((HOST, PORT))
-            server.listen(1)
-            trace_startup("command socket listening")
-
-            while self._running:
-                trace_startup("waiting for client")
-                try:
-                    self._client, _ = server.accept()
-                except OSError:
-                    break
-                trace_startup("client accepted")
+            self._voice_thread.start()
+        if not self._warm_started.is_set() or not self._warm_start_ok:
+            # Still starting, or the `error` status of a failed warm start.
+            return [self._status_publisher.snapshot()]
 
-                self._send_fail_count = 0
+        with self._state_lock:
+            self._status.update(state="ready", message="service_ready", **self._runtime_status_fields())
+            status = dict(self._status)
+        status["mode"] = self._interaction_mode
+        # Existing clients see the transition as a delta; the new client
+        # starts from a complete snapshot.
+        self._status_publisher.publish(status)
+        return [self._status_publisher.snapshot()]
+
+    def _on_last_client_disconnected(self) -> None:
+        """Drop per-session state once nobody is listening any more."""
+
+        trace_startup("last client disconnected, cleaning up")
+        if self._recording_label_idx is not None:
+            self._stop_recording(reason="recording_stopped_disconnect")
+        self._close_voice_stream()
+        self._reset_clutch_session()
 
-                runtime = describe_runtime()
+    def _mark_startup(self, name: str, *, once: bool = False) -> None:
+        if once and name in self._startup_timeline:
+            return
+        self._startup_timeline[name] = time.monotonic() - _MODULE_LOADED_AT
+
+    def _on_command_socket_listening(self) -> None:
+        """
+        Runs on the server loop right after bind; everything slow goes to threads.
+
+        The preview app starts immediately (it serves frames once the pipeline
+        produces them) and the warm start loads the rest in the background.
+        """
+
+        trace_startup("command socket listening")
+        self._mark_startup("listening")
+        self._set_status(
+            state="starting",
+            message="warm_start",
+            startup=dict(self._startup_components),
+        )
+        self._preview_thread = threading.Thread(
+            target=self._start_http_preview,
+            name="MlServicePreview",
+            daemon=True,
+        )
+        self._preview_thread.start()
+        self._warm_start_thread = threading.Thread(
+            target=self._warm_start,
+            name="MlServiceWarmStart",
+            daemon=True,
+        )
+        self._warm_start_thread.start()
+
+    def _warm_start(self) -> None:
+        """
+        Open the camera, build the MediaPipe graph and load the models in parallel.
+
+        The three are independent and each is dominated by I/O or native
+        initialization (device probing, graph construction, importing torch
+        and reading checkpoints), so running them side by side makes the
+        cold start roughly as long as the slowest one instead of the sum.
+        Every finished component is published as `starting` status progress.
+        """
+
+        def _open_camera() -> str:
+            # A missing camera is not fatal: the pipeline keeps retrying
+            # through `_ensure_camera_ready()`.
+            return "ready" if self._camera_manager.start() else "unavailable"
+
+        def _create_hand_tracking() -> str:
+            from ml.runtime.hand_ingestion import HandIngestion
+
+            hand_ingestion = HandIngestion(
+                min_detection_confidence=self._hand_min_detection_confidence
+            )
+            self._warm_up_stats["hand_tracking"] = hand_ingestion.warm_up()
+            self._hand_ingestion = hand_ingestion
+            return "ready"
+
+        def _load_models() -> str:
+            with self._model_lock:
+                self._load_runtime_model()
+            return "ready"
+
+        steps = {
+            "camera": _open_camera,
+            "hand_tracking": _create_hand_tracking,
+            "models": _load_models,
+        }
+        errors: Dict[str, str] = {}
+
+        def _run(name: str) -> None:
+            try:
+                with TRACER.span(f"warm_{name}", "startup"):
+                    outcome = steps[name]()
+            except Exception as exc:  # pragma: no cover - device/runtime path
+                errors[name] = str(exc)
+                outcome = "failed"
+                _LOG.error("warm start component=%s failed error=%s", name, exc)
+            self._startup_components[name] = outcome
+            self._mark_startup(f"{name}_{outcome}")
+            self._set_status(
+                state="starting",
+                message=f"warm_start:{name}_{outcome}",
+                startup=dict(self._startup_components),
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="MlServiceWarm") as pool:
+                list(pool.map(_run, steps))
+
+            if self._hand_ingestion is None or self._dynamic_runner is None:
                 self._set_status(
-                    state="ready",
-                    message="service_ready",
-                    python=runtime["python"],
-                    cv2=runtime["cv2"],
-                    mediapipe=runtime["mediapipe"],
-                    vosk=runtime["vosk"],
-                    error=(
-                        f"cv2_error={runtime.get('cv2_error', '')} "
-                        f"mediapipe_error={runtime.get('mediapipe_error', '')} "
-                        f"vosk_error={runtime.get('vosk_error', '')}"
-                    ),
+                    state="error",
+                    message="warm_start_failed",
+                    error="; ".join(f"{name}: {error}" for name, error in errors.items()),
+                    startup=dict(self._startup_components),
                 )
-                self._voice_thread = threading.Thread(target=self._voice_loop, daemon=True)
-                self._voice_thread.start()
-
-                with self._client:
-                    buffer = ""
-                    while self._running:
-                        try:
-                            chunk = self._client.recv(4096)
-                        except ConnectionResetError:
-                            break
-                        if not chunk:
-                            break
-                        buffer += chunk.decode("utf-8")
-                        while "\n" in buffer:
-                            line, buffer = buffer.split("\n", 1)
-                            if not line.strip():
-                                continue
-                            self.handle_command(json.loads(line))
-
-                trace_startup("client disconnected, cleaning up")
-                if self._recording_label_idx is not None:
-                    self._stop_recording(reason="recording_stopped_disconnect")
-                self._close_voice_stream()
-                self._reset_clutch_session()
-                self._client = None
+                return
 
-        self._hand_ingestion.close()
+            self._start_background_runtime()
+            self._warm_start_ok = True
+        finally:
+            self._warm_started.set()
+            self._command_server.submit(self._replay_parked_commands)
+
+        self._mark_startup("ready")
+        trace_startup("warm start complete")
+        self._set_status(
+            state="ready",
+            message="service_ready",
+            startup=dict(self._startup_components),
+            **self._runtime_status_fields(),
+        )
+
+    @staticmethod
+    def _runtime_status_fields() -> Dict[str, Any]:
+        runtime = describe_runtime()
+        return {
+            "python": runtime["python"],
+            "cv2": runtime["cv2"],
+            "mediapipe": runtime["mediapipe"],
+            "vosk": runtime["vosk"],
+            "error": (
+                f"cv2_error={runtime.get('cv2_error', '')} "
+                f"mediapipe_error={runtime.get('mediapipe_error', '')} "
+                f"vosk_error={runtime.get('vosk_error', '')}"
+            ),
+        }
+
+    def serve(self) -> None:
+        trace_startup("serve start")
+
+        # Bind first: the socket answers (with `starting` progress) within a
+        # fraction of a second, and the camera, MediaPipe and models warm up
+        # in parallel from `_on_command_socket_listening`.
+        self._outbound_queue.start()
+        trace_startup("binding command socket")
+        self._command_server.serve_forever(on_listening=self._on_command_socket_listening)
+        self._outbound_queue.stop()
+        if self._shm_event_publisher is not None:
+            self._shm_event_publisher.close()
+
+        if self._hand_ingestion is not None:
+            self._hand_ingestion.close()
 
 
 if __name__ == "__main__":
     try:
-        report = diagnose_environment()
-        with open(STARTUP_TRACE, "a", encoding="utf-8") as handle:
-            handle.write(
-                f"\nEnvironment Diagnostic Report:\n{json.dumps(report, indent=2)}\n"
-            )
+        configure_logging()
+        # The diagnostic imports every optional dependency, which is exactly
+        # what the lazy startup avoids, so it only runs when asked for.
+        if "--diagnose" in sys.argv[1:] or os.environ.get("SPIDER_ML_DIAGNOSE") == "1":
+            report = diagnose_environment()
+            _STARTUP_LOG.info("environment report=%s", json.dumps(report))
 
         MlService().serve()
     except Exception:  # pragma: no cover - startup/runtime crash logging
@@ -13,6 +13,7 @@ import cv2
 import mediapipe as mp
 
 from ml.feature_extraction import extract_features
+from ml.training.dynamic_sequences import append_sequences, chunk_lengths, lengths_path, split_sequences
 
 
 TargetName = Literal["default", "custom"]
@@ -242,15 +243,14 @@ def collect_dynamic_frames(gesture: str, target: TargetName, sequences: int = 30
         cv2.destroyAllWindows()
         hands.close()
 
-    if completed_sequences <= 0:
+    if not rows:
         return 0
 
+    # A sequence cut short with Esc is kept; the lengths sidecar marks it.
     output_path = ensure_data_folder("dynamic", target) / f"{sanitize_filename(gesture)}.csv"
-    with output_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerows(rows)
-
-    return completed_sequences * sequence_length
+    output_path.unlink(missing_ok=True)
+    lengths_path(output_path).unlink(missing_ok=True)
+    return append_sequences(output_path, split_sequences(rows, chunk_lengths(len(rows), sequence_length)))
 
 
 def main() -> None:
@@ -271,7 +271,7 @@ def main() -> None:
             print(f"Recorded {captured} frames for gesture '{gesture}'.")
         else:
             captured = collect_dynamic_frames(gesture, args.target, sequences=30, sequence_length=30)
-            print(f"Recorded {captured} frames ({captured // 30} sequences) for gesture '{gesture}'.")
+            print(f"Recorded {captured} frames ({len(chunk_lengths(captured))} sequences) for gesture '{gesture}'.")
 
     print("Collection complete.")
 
@@ -0,0 +1,99 @@
+"""
+On-disk layout of recorded dynamic gesture sequences.
+
+Each gesture is one CSV of 126-value feature rows, the frames of all its
+sequences back to back. Sequence boundaries used to be implicit (every 30
+rows), which forced recordings to be cut to multiples of 30 and threw the
+remainder away. A sidecar `<name>.lengths.json` now lists each sequence's
+frame count, so sequences may be any length. CSVs without a sidecar are read
+the old way, in 30-row chunks, with a shorter final chunk kept as its own
+sequence.
+
+No torch here: the service writes recordings through this module without
+loading the training stack.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from pathlib import Path
+
+SEQUENCE_LENGTH = 30
+# Matches the service's shortest dynamic episode; shorter sequences are kept
+# on disk but not trained on.
+MIN_SEQUENCE_LENGTH = 8
+
+
+def lengths_path(csv_path: Path) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}.lengths.json")
+
+
+def chunk_lengths(row_count: int, sequence_length: int = SEQUENCE_LENGTH) -> list[int]:
+    """Full `sequence_length` chunks plus the remainder, if any."""
+
+    lengths = [sequence_length] * (row_count // sequence_length)
+    if row_count % sequence_length:
+        lengths.append(row_count % sequence_length)
+    return lengths
+
+
+def read_sequence_lengths(csv_path: Path, row_count: int) -> list[int]:
+    """Sequence lengths for `csv_path`, from its sidecar or the 30-row chunks."""
+
+    sidecar = lengths_path(csv_path)
+    if not sidecar.exists():
+        return chunk_lengths(row_count)
+    try:
+        lengths = json.loads(sidecar.read_text(encoding="utf-8")).get("sequence_lengths", [])
+    except (OSError, ValueError, AttributeError) as exc:
+        raise ValueError(f"Invalid sequence lengths file {sidecar}: {exc}") from exc
+    if not all(isinstance(length, int) and length > 0 for length in lengths) or sum(lengths) != row_count:
+        raise ValueError(
+            f"Sequence lengths in {sidecar} do not add up to the {row_count} rows of {csv_path.name}"
+        )
+    return list(lengths)
+
+
+def split_sequences(rows: list[list[float]], lengths: list[int]) -> list[list[list[float]]]:
+    sequences: list[list[list[float]]] = []
+    start = 0
+    for length in lengths:
+        sequences.append(rows[start : start + length])
+        start += length
+    return sequences
+
+
+def _count_rows(csv_path: Path) -> int:
+    with csv_path.open("r", encoding="utf-8") as handle:
+        return sum(1 for line in handle if line.strip())
+
+
+def append_sequences(csv_path: Path, sequences: list[list[list[float]]]) -> int:
+    """
+    Append sequences to a gesture CSV and record their lengths.
+
+    An existing CSV without a sidecar gets one describing its rows as they
+    were read before. Returns the number of rows written.
+    """
+
+    sequences = [sequence for sequence in sequences if sequence]
+    if not sequences:
+        return 0
+
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    lengths: list[int] = []
+    if csv_path.exists():
+        lengths = read_sequence_lengths(csv_path, _count_rows(csv_path))
+
+    rows = [row for sequence in sequences for row in sequence]
+    with csv_path.open("a", newline="", encoding="utf-8") as handle:
+        csv.writer(handle).writerows(rows)
+
+    lengths.extend(len(sequence) for sequence in sequences)
+    sidecar = lengths_path(csv_path)
+    temp_path = sidecar.with_name(f"{sidecar.name}.tmp")
+    temp_path.write_text(json.dumps({"sequence_lengths": lengths}), encoding="utf-8")
+    os.replace(temp_path, sidecar)
+    return len(rows)
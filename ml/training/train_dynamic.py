@@ -2,14 +2,27 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
 from pathlib import Path
 from typing import Any
 
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data import ConcatDataset, DataLoader, TensorDataset
+
+from ml.runtime.config_store import CONFIG_STORE
+from ml.runtime.dynamic_inference_runner import (
+    DYNAMIC_MODEL_TYPES,
+    build_dynamic_model,
+    load_dynamic_checkpoint,
+    save_dynamic_checkpoint,
+)
+from ml.training.dynamic_sequences import (
+    MIN_SEQUENCE_LENGTH,
+    SEQUENCE_LENGTH,
+    read_sequence_lengths,
+    split_sequences,
+)
 
 
 TargetName = str
@@ -19,33 +32,9 @@ MODEL_DIR = ROOT_DIR / "models" / "dynamic"
 CONFIG_DIR = ROOT_DIR / "config"
 DEFAULT_MAPPING_PATH = CONFIG_DIR / "default_mapping.json"
 USER_MAPPING_PATH = CONFIG_DIR / "user_mapping.json"
-SEQUENCE_LENGTH = 30
-
-
-class DynamicGestureModel(nn.Module):
-    def __init__(
-        self,
-        input_size: int = 126,
-        hidden_size: int = 64,
-        num_layers: int = 2,
-        num_classes: int = 2,
-    ) -> None:
-        super().__init__()
-        self.lstm = nn.LSTM(
-            input_size=input_size,
-            hidden_size=hidden_size,
-            num_layers=num_layers,
-            batch_first=True,
-            dropout=0.2,
-        )
-        self.fc1 = nn.Linear(hidden_size, 32)
-        self.relu = nn.ReLU()
-        self.fc2 = nn.Linear(32, num_classes)
-
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        outputs, (hidden, _) = self.lstm(x)
-        final_hidden = hidden[-1]
-        return self.fc2(self.relu(self.fc1(final_hidden)))
+# Training copies of each sequence resampled to these frame counts, so the
+# model sees the same gesture performed faster, as short live episodes are.
+SPEED_VARIANT_LENGTHS = (12, 18, 24)
 
 
 def resolve_model_path(target: str) -> Path:
@@ -54,10 +43,8 @@ def resolve_model_path(target: str) -> Path:
 
 
 def _load_json_file(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        return {}
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    # Shared with the service when training runs in-process; read-only here.
+    data = CONFIG_STORE.get(path, default={}, copy=False)
     return data if isinstance(data, dict) else {}
 
 
@@ -79,7 +66,13 @@ def _label_mapping(section_name: str, path: Path) -> dict[int, str]:
 def _load_dynamic_folder_dataset(
     data_dir: Path,
     label_mapping: dict[int, str],
-) -> tuple[list[list[list[float]]], list[int], set[int]]:
+) -> tuple[list[list[list[float]]], list[int], set[int], int]:
+    """
+    Read every gesture CSV in `data_dir` as sequences of up to 30 frames.
+
+    Also returns how many sequences were too short to train on.
+    """
+
     if not data_dir.exists() or not data_dir.is_dir():
         raise FileNotFoundError(f"Dynamic data folder not found: {data_dir}")
 
@@ -95,6 +88,7 @@ def _load_dynamic_folder_dataset(
     sequences: list[list[list[float]]] = []
     labels: list[int] = []
     seen_label_ids: set[int] = set()
+    too_short = 0
 
     for csv_path in file_paths:
         normalized_stem = _normalize_name(csv_path.stem)
@@ -120,46 +114,85 @@ def _load_dynamic_folder_dataset(
                     ) from exc
                 rows.append(values)
 
-        if len(rows) % SEQUENCE_LENGTH != 0:
-            raise ValueError(
-                f"Dynamic CSV {csv_path} must contain a multiple of {SEQUENCE_LENGTH} rows, got {len(rows)}"
-            )
-
-        for seq_index in range(len(rows) // SEQUENCE_LENGTH):
-            sequence = rows[seq_index * SEQUENCE_LENGTH : (seq_index + 1) * SEQUENCE_LENGTH]
-            sequences.append(sequence)
+        for sequence in split_sequences(rows, read_sequence_lengths(csv_path, len(rows))):
+            if len(sequence) < MIN_SEQUENCE_LENGTH:
+                too_short += 1
+                continue
+            sequences.append(sequence[-SEQUENCE_LENGTH:])
             labels.append(label_index)
 
-    return sequences, labels, seen_label_ids
+    return sequences, labels, seen_label_ids, too_short
+
+
+def _pad_sequences(sequences: list[list[list[float]]]) -> tuple[torch.Tensor, torch.Tensor]:
+    """Zero-pad to one tensor; the lengths tell the packed LSTM where each ends."""
+
+    lengths = torch.tensor([len(sequence) for sequence in sequences], dtype=torch.long)
+    padded = torch.zeros(len(sequences), SEQUENCE_LENGTH, 126, dtype=torch.float32)
+    for index, sequence in enumerate(sequences):
+        padded[index, : len(sequence)] = torch.tensor(sequence, dtype=torch.float32)
+    return padded, lengths
+
 
+def _resample(sequence: torch.Tensor, length: int) -> torch.Tensor:
+    positions = torch.linspace(0, sequence.size(0) - 1, steps=length).round().long()
+    return sequence[positions]
 
-def load_dynamic_dataset(target: str) -> tuple[torch.Tensor, torch.Tensor, list[str], list[str]]:
+
+def _speed_variants(
+    X: torch.Tensor,
+    lengths: torch.Tensor,
+    y: torch.Tensor,
+    indices: list[int],
+    target_lengths: tuple[int, ...],
+) -> TensorDataset | None:
+    """Copies of the given sequences resampled to each shorter target length."""
+
+    sequences: list[list[list[float]]] = []
+    labels: list[int] = []
+    for index in indices:
+        length = int(lengths[index])
+        for target_length in target_lengths:
+            if MIN_SEQUENCE_LENGTH <= target_length < length:
+                sequences.append(_resample(X[index, :length], target_length).tolist())
+                labels.append(int(y[index]))
+    if not sequences:
+        return None
+    padded, variant_lengths = _pad_sequences(sequences)
+    return TensorDataset(padded, variant_lengths, torch.tensor(labels, dtype=torch.long))
+
+
+def load_dynamic_dataset(target: str) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, list[str], list[str]]:
+    """Return zero-padded sequences, their lengths, labels, label names and warnings."""
     warnings: list[str] = []
     default_mapping = _label_mapping("dynamic", DEFAULT_MAPPING_PATH)
     sequences: list[list[list[float]]] = []
     labels: list[int] = []
     seen_label_ids: set[int] = set()
+    too_short = 0
 
-    default_sequences, default_labels, default_seen = _load_dynamic_folder_dataset(
+    default_sequences, default_labels, default_seen, default_short = _load_dynamic_folder_dataset(
         DYNAMIC_DATA_DIR / "default",
         default_mapping,
     )
     sequences.extend(default_sequences)
     labels.extend(default_labels)
     seen_label_ids.update(default_seen)
+    too_short += default_short
 
     if target == "custom":
         user_mapping = _label_mapping("dynamic", USER_MAPPING_PATH)
         custom_dir = DYNAMIC_DATA_DIR / "custom"
         custom_files = sorted([p for p in custom_dir.glob("*.csv") if p.is_file()]) if custom_dir.exists() else []
         if custom_files:
-            custom_sequences, custom_labels, custom_seen = _load_dynamic_folder_dataset(
+            custom_sequences, custom_labels, custom_seen, custom_short = _load_dynamic_folder_dataset(
                 custom_dir,
                 user_mapping,
             )
             sequences.extend(custom_sequences)
             labels.extend(custom_labels)
             seen_label_ids.update(custom_seen)
+            too_short += custom_short
         else:
             warnings.append("custom_dynamic_dataset_empty_using_defaults_only")
     elif target != "default":
@@ -167,14 +200,18 @@ def load_dynamic_dataset(target: str) -> tuple[torch.Tensor, torch.Tensor, list[
 
     if not sequences:
         raise ValueError("No dynamic sequences were loaded.")
+    if too_short:
+        warnings.append(f"skipped_short_sequences:{too_short}")
 
     merged_mapping = dict(default_mapping)
     if target == "custom":
         merged_mapping.update(_label_mapping("dynamic", USER_MAPPING_PATH))
 
     label_names = [merged_mapping[label_id] for label_id in sorted(seen_label_ids)]
+    padded, lengths = _pad_sequences(sequences)
     return (
-        torch.tensor(sequences, dtype=torch.float32),
+        padded,
+        lengths,
         torch.tensor(labels, dtype=torch.long),
         label_names,
         warnings,
@@ -182,7 +219,8 @@ def load_dynamic_dataset(target: str) -> tuple[torch.Tensor, torch.Tensor, list[
 
 
 def _load_transfer_weights(
-    model: DynamicGestureModel,
+    model: nn.Module,
+    model_type: str,
     checkpoint_path: Path,
     *,
     skip_keys: set[str] | None = None,
@@ -190,7 +228,9 @@ def _load_transfer_weights(
     if not checkpoint_path.exists():
         return [f"transfer_checkpoint_missing:{checkpoint_path.name}"]
 
-    state = torch.load(checkpoint_path, map_location="cpu")
+    state, header = load_dynamic_checkpoint(checkpoint_path)
+    if header.get("model_type") != model_type:
+        return [f"transfer_checkpoint_model_type_mismatch:{checkpoint_path.name}:{header.get('model_type')}"]
     model_state = model.state_dict()
     applied = 0
     skipped: list[str] = []
@@ -219,16 +259,28 @@ def train_dynamic_model(
     epochs: int = 40,
     lr: float = 0.001,
     batch_size: int = 16,
+    speed_lengths: tuple[int, ...] = SPEED_VARIANT_LENGTHS,
+    model_type: str = "lstm",
+    model_path: Path | None = None,
 ) -> dict[str, Any]:
-    X, y, label_names, warnings = load_dynamic_dataset(target)
+    """
+    Train and save a dynamic model of `model_type` (see `DYNAMIC_MODEL_TYPES`).
+
+    `model_path` defaults to the target's model file; the checkpoint header
+    records the type so `DynamicInferenceRunner` rebuilds the same network.
+    """
+
+    if model_type not in DYNAMIC_MODEL_TYPES:
+        raise ValueError(f"Unsupported dynamic model type: {model_type}")
+    X, lengths, y, label_names, warnings = load_dynamic_dataset(target)
     num_classes = max(int(value) for value in y.tolist()) + 1
 
     print(
-        f"Training dynamic model for target={target} classes={label_names} sequences={len(y)}",
+        f"Training dynamic {model_type} model for target={target} classes={label_names} sequences={len(y)}",
         flush=True,
     )
 
-    dataset = TensorDataset(X, y)
+    dataset = TensorDataset(X, lengths, y)
     val_count = max(1, int(0.2 * len(dataset)))
     train_count = len(dataset) - val_count
     train_dataset, val_dataset = torch.utils.data.random_split(
@@ -236,15 +288,22 @@ def train_dynamic_model(
         [train_count, val_count],
         generator=torch.Generator().manual_seed(42),
     )
+    # Speed variants come from training sequences only, so validation never
+    # sees a resampled copy of a sequence it is scored on.
+    speed_variants = _speed_variants(X, lengths, y, list(train_dataset.indices), tuple(speed_lengths))
+    speed_variant_count = 0 if speed_variants is None else len(speed_variants)
+    if speed_variants is not None:
+        train_dataset = ConcatDataset([train_dataset, speed_variants])
 
     train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
     val_loader = DataLoader(val_dataset, batch_size=batch_size)
 
-    model = DynamicGestureModel(input_size=126, hidden_size=64, num_layers=2, num_classes=num_classes)
+    model = build_dynamic_model(model_type, input_size=126, num_classes=num_classes)
     if target == "custom":
         warnings.extend(
             _load_transfer_weights(
                 model,
+                model_type,
                 MODEL_DIR / "default_model.pth",
                 skip_keys={"fc2.weight", "fc2.bias"},
             )
@@ -255,9 +314,9 @@ def train_dynamic_model(
     for epoch in range(1, epochs + 1):
         model.train()
         epoch_loss = 0.0
-        for batch_x, batch_y in train_loader:
+        for batch_x, batch_lengths, batch_y in train_loader:
             optimizer.zero_grad()
-            outputs = model(batch_x)
+            outputs = model(batch_x, batch_lengths)
             loss = criterion(outputs, batch_y)
             loss.backward()
             optimizer.step()
@@ -269,8 +328,8 @@ def train_dynamic_model(
         correct = 0
         total = 0
         with torch.no_grad():
-            for val_x, val_y in val_loader:
-                logits = model(val_x)
+            for val_x, val_lengths, val_y in val_loader:
+                logits = model(val_x, val_lengths)
                 _, predictions = torch.max(logits, 1)
                 correct += (predictions == val_y).sum().item()
                 total += val_y.size(0)
@@ -281,16 +340,24 @@ def train_dynamic_model(
             flush=True,
         )
 
-    model_path = resolve_model_path(target)
-    torch.save(model.state_dict(), model_path)
+    model_path = Path(model_path) if model_path is not None else resolve_model_path(target)
+    save_dynamic_checkpoint(
+        model_path,
+        model.state_dict(),
+        model_type=model_type,
+        variable_length=True,
+        sequence_length=SEQUENCE_LENGTH,
+    )
     print(f"Saved dynamic model to {model_path}", flush=True)
 
     return {
         "model_path": str(model_path),
         "target": target,
+        "model_type": model_type,
         "num_classes": num_classes,
         "labels": label_names,
         "train_sequences": train_count,
+        "speed_variant_sequences": speed_variant_count,
         "validation_sequences": val_count,
         "val_accuracy": val_accuracy,
         "warnings": warnings,
@@ -303,6 +370,10 @@ def main() -> None:
     parser.add_argument("--epochs", type=int, default=75)
     parser.add_argument("--lr", type=float, default=0.001)
     parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--speed-lengths", type=int, nargs="*", default=list(SPEED_VARIANT_LENGTHS),
+                        help="frame counts to resample training sequences to (none to disable)")
+    parser.add_argument("--model-type", choices=list(DYNAMIC_MODEL_TYPES), default="lstm")
+    parser.add_argument("--model-path", type=Path, default=None)
     args = parser.parse_args()
 
     result = train_dynamic_model(
@@ -310,6 +381,9 @@ def main() -> None:
         epochs=args.epochs,
         lr=args.lr,
         batch_size=args.batch_size,
+        speed_lengths=tuple(args.speed_lengths),
+        model_type=args.model_type,
+        model_path=args.model_path,
     )
     print(result)
 
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
 from pathlib import Path
 from typing import Any, Callable
 
@@ -11,6 +10,7 @@ import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader, TensorDataset
 
+from ml.runtime.config_store import CONFIG_STORE
 from ml.runtime.static_inference_runner import StaticGestureModel
 
 
@@ -65,10 +65,8 @@ def _load_aggregated_csv(
 
 
 def _load_json_file(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        return {}
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    # Shared with the service when training runs in-process; read-only here.
+    data = CONFIG_STORE.get(path, default={}, copy=False)
     return data if isinstance(data, dict) else {}
 
 